@@ -0,0 +1,153 @@
+"""add canonical skills and cv_skills inverted index
+
+Revision ID: b7c1d2e3f4a5
+Revises: a1b2c3d4e5f6
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7c1d2e3f4a5'
+down_revision: Union[str, None] = 'a1b2c3d4e5f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Frozen copy of the skill normalisation in backend.utils.skills, so later
+# changes to the app code never change what this migration writes.
+_SKILL_PUNCT_RE = re.compile(r"[^\w+#. ]+")
+_SPACE_RE = re.compile(r"\s+")
+
+# Folded alias -> folded canonical name, as of this revision
+_SKILL_ALIASES = {
+    "js": "javascript",
+    "java script": "javascript",
+    "ecmascript": "javascript",
+    "es6": "javascript",
+    "ts": "typescript",
+    "py": "python",
+    "python3": "python",
+    "python 3": "python",
+    "golang": "go",
+    "k8s": "kubernetes",
+    "postgres": "postgresql",
+    "postgre sql": "postgresql",
+    "psql": "postgresql",
+    "mongo": "mongodb",
+    "mssql": "sql server",
+    "ms sql": "sql server",
+    "microsoft sql server": "sql server",
+    "node": "node.js",
+    "nodejs": "node.js",
+    "node js": "node.js",
+    "react.js": "react",
+    "reactjs": "react",
+    "react js": "react",
+    "vue.js": "vue",
+    "vuejs": "vue",
+    "angularjs": "angular",
+    "angular.js": "angular",
+    "next.js": "nextjs",
+    "next js": "nextjs",
+    "express.js": "express",
+    "expressjs": "express",
+    "c sharp": "c#",
+    "csharp": "c#",
+    "cpp": "c++",
+    "dotnet": ".net",
+    ".net core": ".net",
+    "net core": ".net",
+    "amazon web services": "aws",
+    "google cloud": "gcp",
+    "google cloud platform": "gcp",
+    "microsoft azure": "azure",
+    "ml": "machine learning",
+    "dl": "deep learning",
+    "ai": "artificial intelligence",
+    "nlp": "natural language processing",
+    "tf": "tensorflow",
+    "sklearn": "scikit learn",
+    "cicd": "ci cd",
+    "gh actions": "github actions",
+    "rest api": "rest",
+    "restful": "rest",
+    "restful api": "rest",
+    "restful apis": "rest",
+    "rest apis": "rest",
+    "html5": "html",
+    "css3": "css",
+    "tailwindcss": "tailwind",
+    "tailwind css": "tailwind",
+}
+
+
+def _canonical_skills(values) -> dict[str, str]:
+    """Map canonical key -> first original spelling."""
+    result = {}
+    for value in values or []:
+        if not isinstance(value, str) or not value.strip():
+            continue
+        folded = _SPACE_RE.sub(" ", _SKILL_PUNCT_RE.sub(" ", value.lower())).strip(" .")
+        key = _SKILL_ALIASES.get(folded, folded)
+        if key:
+            result.setdefault(key, value.strip())
+    return result
+
+
+def upgrade() -> None:
+    op.create_table('skills',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('display_name', sa.String(length=255), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name')
+    )
+    op.create_table('cv_skills',
+    sa.Column('skill_id', sa.Integer(), nullable=False),
+    sa.Column('cv_file_id', sa.UUID(), nullable=False),
+    sa.ForeignKeyConstraint(['cv_file_id'], ['cv_files.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['skill_id'], ['skills.id'], ),
+    sa.PrimaryKeyConstraint('skill_id', 'cv_file_id')
+    )
+    op.create_index(op.f('ix_cv_skills_cv_file_id'), 'cv_skills', ['cv_file_id'], unique=False)
+    _backfill()
+
+
+def _backfill() -> None:
+    bind = op.get_bind()
+    rows = bind.execute(sa.text("SELECT cv_file_id, skills, tools, projects FROM parsed_cvs"))
+    skill_ids: dict[str, int] = {}
+    pairs = set()
+    for cv_file_id, skills, tools, projects in rows:
+        values = list(skills or []) + list(tools or [])
+        for project in projects or []:
+            if isinstance(project, dict):
+                values += project.get("technologies") or []
+        for key, display in _canonical_skills(values).items():
+            if len(key) > 255:
+                continue
+            if key not in skill_ids:
+                skill_ids[key] = bind.execute(
+                    sa.text(
+                        "INSERT INTO skills (name, display_name) VALUES (:name, :display) "
+                        "RETURNING id"
+                    ),
+                    {"name": key, "display": display[:255]},
+                ).scalar_one()
+            pairs.add((skill_ids[key], cv_file_id))
+    if pairs:
+        bind.execute(
+            sa.text("INSERT INTO cv_skills (skill_id, cv_file_id) VALUES (:skill_id, :cv_file_id)"),
+            [{"skill_id": s, "cv_file_id": c} for s, c in pairs],
+        )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_cv_skills_cv_file_id'), table_name='cv_skills')
+    op.drop_table('cv_skills')
+    op.drop_table('skills')
@@ -0,0 +1,27 @@
+"""add parse key to parsed_cvs
+
+Revision ID: e5f6a7b8c9d0
+Revises: d4e5f6a7b8c9
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5f6a7b8c9d0'
+down_revision: Union[str, None] = 'd4e5f6a7b8c9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('parsed_cvs', sa.Column('parse_key', sa.String(length=64), nullable=True))
+    op.create_index(op.f('ix_parsed_cvs_parse_key'), 'parsed_cvs', ['parse_key'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_parsed_cvs_parse_key'), table_name='parsed_cvs')
+    op.drop_column('parsed_cvs', 'parse_key')
@@ -0,0 +1,27 @@
+"""add stat signature to cv_files
+
+Revision ID: f6a7b8c9d0e1
+Revises: e5f6a7b8c9d0
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6a7b8c9d0e1'
+down_revision: Union[str, None] = 'e5f6a7b8c9d0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('cv_files', sa.Column('file_mtime_ns', sa.BigInteger(), nullable=True))
+    op.add_column('cv_files', sa.Column('file_inode', sa.BigInteger(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('cv_files', 'file_inode')
+    op.drop_column('cv_files', 'file_mtime_ns')
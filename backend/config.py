@@ -18,11 +18,54 @@ class Settings(BaseSettings):
     GROQ_API_KEY: str = ""
     GROQ_MODEL: str = "llama-3.3-70b-versatile"
     GROQ_FAST_MODEL: str = "llama-3.1-8b-instant"
+    LLM_TEMPERATURE: float = 0.1
+    DATA_DIR: str = "data"  # local state of this deployment, e.g. the LLM cache
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_PATH: str = ""  # "" = llm_cache.sqlite3 in DATA_DIR
+    LLM_CACHE_MAX_ENTRIES: int = 50000
+    LLM_CACHE_TTL_SECONDS: int = 30 * 24 * 3600
+    LLM_REQUESTS_PER_MINUTE: int = 30
+    LLM_TOKENS_PER_MINUTE: int = 12000
+    LLM_MODEL_RATE_LIMITS: dict[str, dict[str, int]] = {
+        "llama-3.3-70b-versatile": {"rpm": 30, "tpm": 12000},
+        "llama-3.1-8b-instant": {"rpm": 30, "tpm": 6000},
+    }
+    LLM_COMPLETION_TOKEN_ESTIMATE: int = 600
+    LLM_ASYNC_BATCHES: bool = True
+    LLM_ASYNC_CONCURRENCY: int = 64
+    LLM_MAX_CONNECTIONS: int = 100
+    MATCH_BATCH_MODE: bool = True
+    MATCH_BATCH_MAX_SIZE: int = 10
+    MATCH_BATCH_TOKEN_BUDGET: int = 6000
+    MATCH_BATCH_COMPLETION_TOKENS_PER_CV: int = 250
+    MATCH_WRITE_CHUNK_SIZE: int = 500
+    CV_PARSE_TOKEN_BUDGET: int = 3500
+    PARSE_EXTRACT_WORKERS: int = 0  # 0 = one per CPU core
+    PARSE_PIPELINE_QUEUE_SIZE: int = 32
+    SHORTLIST_DEFAULT_TOP_K: int = 50
+    ROLE_MATCH_DEFAULT_TOP_K: int = 10
+    LEADERBOARD_CACHE_MAX_JDS: int = 64
+    LEADERBOARD_BATCH_REFRESH_SECONDS: float = 10.0
     DEFAULT_SKILL_WEIGHT: float = 0.4
     DEFAULT_EXPERIENCE_WEIGHT: float = 0.3
     DEFAULT_PROJECT_WEIGHT: float = 0.2
     DEFAULT_KEYWORD_WEIGHT: float = 0.1
     ALLOWED_EXTENSIONS: list[str] = [".pdf", ".docx"]
+    UPLOAD_KEEP_FILES: bool = True  # only used when UPLOAD_STREAMING is off
+    UPLOAD_STREAMING: bool = True
+    UPLOAD_MAX_FILE_BYTES: int = 20 * 1024 * 1024  # 0 = no limit
+    UPLOAD_MAX_REQUEST_BYTES: int = 1024 * 1024 * 1024  # 0 = no limit
+    ARCHIVE_MAX_BYTES: int = 1024 * 1024 * 1024  # the uploaded archive itself
+    ARCHIVE_MAX_MEMBERS: int = 10000
+    ARCHIVE_MAX_TOTAL_BYTES: int = 4 * 1024 * 1024 * 1024  # uncompressed
+    ARCHIVE_MAX_RATIO: int = 100
+    SCAN_HASH_WORKERS: int = 8
+    SCAN_BATCH_SIZE: int = 200
+    PDF_ENGINES: list[str] = ["pypdf2", "pdfplumber"]
+    PDF_MAX_PAGES: int = 0  # 0 = no cap
+    PDF_PAGE_WORKERS: int = 1
+    PDF_PARALLEL_MIN_PAGES: int = 20
+    DOCX_ENGINES: list[str] = ["stream", "python-docx"]
 
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
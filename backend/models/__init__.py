@@ -5,6 +5,7 @@ from backend.models.cv_file import CVFile
 from backend.models.parsed_cv import ParsedCV
 from backend.models.match_result import MatchResult
 from backend.models.processing_log import ProcessingLog
+from backend.models.skill import CVSkill, Skill
 
 __all__ = [
     "User",
@@ -14,4 +15,6 @@ __all__ = [
     "ParsedCV",
     "MatchResult",
     "ProcessingLog",
+    "Skill",
+    "CVSkill",
 ]
@@ -21,6 +21,9 @@ class CVFile(Base):
     file_path: Mapped[str] = mapped_column(String(1024), nullable=False)
     file_hash: Mapped[str] = mapped_column(String(64), nullable=False, index=True)
     file_size_bytes: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    # Stat signature from the last folder scan; unchanged signatures skip rehashing
+    file_mtime_ns: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    file_inode: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
     status: Mapped[str] = mapped_column(String(20), nullable=False, default="new")
     error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
     detected_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
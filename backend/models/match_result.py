@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, Float, String, Text, UniqueConstraint, func
+from sqlalchemy import DateTime, Float, Index, String, Text, UniqueConstraint, func, text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy import ForeignKey
@@ -11,7 +11,11 @@ from backend.database import Base
 
 class MatchResult(Base):
     __tablename__ = "match_results"
-    __table_args__ = (UniqueConstraint("cv_file_id", "jd_id", name="uq_cv_jd_match"),)
+    __table_args__ = (
+        UniqueConstraint("cv_file_id", "jd_id", name="uq_cv_jd_match"),
+        # Leaderboard keyset pagination: ORDER BY overall_score DESC, id within a JD
+        Index("ix_match_results_jd_score", "jd_id", text("overall_score DESC"), "id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     cv_file_id: Mapped[uuid.UUID] = mapped_column(
@@ -33,6 +37,7 @@ class MatchResult(Base):
     explanation: Mapped[str | None] = mapped_column(Text, nullable=True)
     weights_used: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
     match_model: Mapped[str | None] = mapped_column(String(50), nullable=True)
+    input_fingerprint: Mapped[str | None] = mapped_column(String(64), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
 
     cv_file = relationship("CVFile", back_populates="match_results")
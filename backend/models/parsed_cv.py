@@ -29,6 +29,8 @@ class ParsedCV(Base):
     summary: Mapped[str | None] = mapped_column(Text, nullable=True)
     raw_text: Mapped[str | None] = mapped_column(Text, nullable=True)
     parse_model: Mapped[str | None] = mapped_column(String(50), nullable=True)
+    # Content address of the parse (file hash + parser version); see cv_parser.parse_key
+    parse_key: Mapped[str | None] = mapped_column(String(64), nullable=True, index=True)
     parsed_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
 
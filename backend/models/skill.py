@@ -0,0 +1,34 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, String, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import ForeignKey
+
+from backend.database import Base
+
+
+class Skill(Base):
+    __tablename__ = "skills"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    name: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
+    display_name: Mapped[str] = mapped_column(String(255), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+
+
+class CVSkill(Base):
+    """Inverted index row: skill_id -> cv_file_id."""
+
+    __tablename__ = "cv_skills"
+
+    skill_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("skills.id"), primary_key=True
+    )
+    cv_file_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("cv_files.id", ondelete="CASCADE"),
+        primary_key=True,
+        index=True,
+    )
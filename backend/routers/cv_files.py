@@ -9,6 +9,7 @@ from backend.models.monitored_folder import MonitoredFolder
 from backend.models.user import User
 from backend.schemas.cv_file import CVFileResponse
 from backend.schemas.parsed_cv import CVDetailResponse
+from backend.services.skill_index import cvs_with_all_skills
 
 router = APIRouter(prefix="/api/v1/cvs", tags=["cv_files"])
 
@@ -17,6 +18,7 @@ router = APIRouter(prefix="/api/v1/cvs", tags=["cv_files"])
 def list_cvs(
     folder_id: UUID | None = Query(None),
     status_filter: str | None = Query(None, alias="status"),
+    skills: list[str] | None = Query(None),
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
@@ -29,6 +31,11 @@ def list_cvs(
         query = query.filter(CVFile.folder_id == folder_id)
     if status_filter:
         query = query.filter(CVFile.status == status_filter)
+    if skills:
+        matching = cvs_with_all_skills(db, skills)
+        if matching is None:
+            return []
+        query = query.filter(CVFile.id.in_(matching))
     return query.order_by(CVFile.created_at.desc()).all()
 
 
@@ -1,12 +1,16 @@
+import shutil
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
 
+from backend.config import settings
 from backend.dependencies import get_current_user, get_db
 from backend.models.user import User
 from backend.schemas.folder import FolderCreate, FolderResponse, FolderStatusResponse, ScanResultResponse
 from backend.services.folder_service import (
+    UPLOAD_DIR,
+    add_spooled_files,
     add_uploaded_files,
     delete_folder,
     get_folder,
@@ -15,10 +19,31 @@ from backend.services.folder_service import (
     register_folder,
     scan_folder,
 )
+from backend.services.upload_stream import UploadTooLarge, spool_multipart
 
 router = APIRouter(prefix="/api/v1/folders", tags=["folders"])
 
 
+def _multipart_body(field: str, many: bool = False) -> dict:
+    """OpenAPI request body for routes that parse a raw multipart ``Request``."""
+    binary = {"type": "string", "format": "binary"}
+    schema = {"type": "array", "items": binary} if many else binary
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {
+                "multipart/form-data": {
+                    "schema": {
+                        "type": "object",
+                        "properties": {field: schema},
+                        "required": [field],
+                    }
+                }
+            },
+        }
+    }
+
+
 @router.post("/", response_model=FolderResponse, status_code=status.HTTP_201_CREATED)
 def create_folder(
     body: FolderCreate,
@@ -37,30 +62,123 @@ def list_folders(db: Session = Depends(get_db), user: User = Depends(get_current
     return get_user_folders(db, user.id)
 
 
-@router.post("/{folder_id}/upload")
+@router.post("/{folder_id}/upload", openapi_extra=_multipart_body("files", many=True))
 async def upload_cvs(
     folder_id: UUID,
-    files: list[UploadFile] = File(...),
+    request: Request,
+    auto_process: bool = True,
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    """Upload CVs as multipart ``files`` parts.
+
+    With ``UPLOAD_STREAMING`` the body is streamed straight to UPLOAD_DIR (see
+    ``backend.services.upload_stream``) instead of being read into memory.
+    """
+    folder = get_folder(db, folder_id, user.id)
+    if not folder:
+        raise HTTPException(status_code=404, detail="Folder not found")
+
+    if not settings.UPLOAD_STREAMING:
+        return await _upload_in_memory(request, db, folder, auto_process)
+
+    content_length = request.headers.get("content-length")
+    try:
+        spooler = await spool_multipart(
+            request.stream(),
+            request.headers.get("content-type", ""),
+            int(content_length) if content_length else None,
+            UPLOAD_DIR,
+            set(settings.ALLOWED_EXTENSIONS),
+            max_file_bytes=settings.UPLOAD_MAX_FILE_BYTES,
+            max_request_bytes=settings.UPLOAD_MAX_REQUEST_BYTES,
+        )
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        result = add_spooled_files(db, folder, spooler.uploads, spooler.parts)
+    except Exception:
+        spooler.discard()
+        raise
+    spooler.store()
+
+    task_id = None
+    if auto_process and result["new_cv_ids"]:
+        from backend.task_manager import submit_parse_batch
+
+        task_id = submit_parse_batch(result["new_cv_ids"])
+
+    return {**result, "task_id": task_id}
+
+
+@router.post("/{folder_id}/upload-archive", openapi_extra=_multipart_body("file"))
+async def upload_archive(
+    folder_id: UUID,
+    request: Request,
     auto_process: bool = True,
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
+    """Upload one ZIP or TAR of CVs as a multipart ``file`` part.
+
+    The archive is streamed to disk, then a background task reads its members,
+    registers them in batches and starts parsing each batch; the response only
+    carries that task's ``task_id``.
+    """
     folder = get_folder(db, folder_id, user.id)
     if not folder:
         raise HTTPException(status_code=404, detail="Folder not found")
 
+    from backend.services.archive_ingest import ARCHIVE_SUFFIXES, new_archive_spool_dir
+
+    spool_dir = new_archive_spool_dir()
+    content_length = request.headers.get("content-length")
+    try:
+        spooler = await spool_multipart(
+            request.stream(),
+            request.headers.get("content-type", ""),
+            int(content_length) if content_length else None,
+            spool_dir,
+            ARCHIVE_SUFFIXES,
+            max_file_bytes=settings.ARCHIVE_MAX_BYTES,
+            max_request_bytes=settings.ARCHIVE_MAX_BYTES,
+        )
+        if len(spooler.uploads) != 1:
+            raise ValueError("Expected exactly one .zip or .tar archive")
+        spooler.store()
+    except UploadTooLarge as e:
+        shutil.rmtree(spool_dir, ignore_errors=True)
+        raise HTTPException(status_code=413, detail=str(e))
+    except ValueError as e:
+        shutil.rmtree(spool_dir, ignore_errors=True)
+        raise HTTPException(status_code=400, detail=str(e))
+
+    from backend.task_manager import submit_archive_ingest
+
+    task_id = submit_archive_ingest(
+        str(folder.id), str(user.id), spooler.uploads[0].file_path, auto_process
+    )
+    return {"task_id": task_id}
+
+
+async def _upload_in_memory(request: Request, db: Session, folder, auto_process: bool) -> dict:
+    form = await request.form()
     file_data = []
-    for f in files:
+    for f in form.getlist("files"):
         content = await f.read()
         file_data.append((f.filename, content))
 
-    result = add_uploaded_files(db, folder, file_data)
+    contents: dict[str, bytes] = {}
+    result = add_uploaded_files(db, folder, file_data, contents=contents)
 
     task_id = None
     if auto_process and result["new_cv_ids"]:
         from backend.task_manager import submit_parse_batch
 
-        task_id = submit_parse_batch(result["new_cv_ids"])
+        task_id = submit_parse_batch(result["new_cv_ids"], contents=contents)
 
     return {**result, "task_id": task_id}
 
@@ -69,12 +187,22 @@ async def upload_cvs(
 def trigger_scan(
     folder_id: UUID,
     auto_process: bool = True,
+    background: bool = False,
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
+    """Scan the folder tree for new/modified CVs.
+
+    With ``background=true`` the scan runs as a task: the response only carries
+    its ``task_id``, and parsing starts batch by batch while the walk continues.
+    """
     folder = get_folder(db, folder_id, user.id)
     if not folder:
         raise HTTPException(status_code=404, detail="Folder not found")
+    if background:
+        from backend.task_manager import submit_folder_scan
+
+        return {"task_id": submit_folder_scan(str(folder.id), str(user.id), auto_process)}
     try:
         result = scan_folder(db, folder)
     except ValueError as e:
@@ -1,14 +1,31 @@
+from typing import Literal
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 
+from backend.config import settings
 from backend.dependencies import get_current_user, get_db
 from backend.models.cv_file import CVFile
 from backend.models.monitored_folder import MonitoredFolder
 from backend.models.user import User
-from backend.schemas.match_result import LeaderboardEntry, MatchRequest, MatchResponse
-from backend.services.matcher import get_leaderboard
+from backend.schemas.job_description import JDUpdateWeights
+from backend.schemas.match_result import (
+    BestRoleEntry,
+    LeaderboardEntry,
+    LeaderboardPage,
+    MatchRequest,
+    MatchResponse,
+    RankedCandidate,
+    RoleMatchRequest,
+    RoleMatchResponse,
+)
+from backend.services.candidate_matrix import get_candidate_matrix
+from backend.services.jd_service import get_jd
+from backend.services.leaderboard_cache import get_cached_leaderboard, leaderboard_etag
+from backend.services.matcher import get_leaderboard, get_leaderboard_page
+from backend.services.prescorer import rank_candidates, select_shortlist
+from backend.services.role_matcher import get_best_roles, rank_roles
 
 router = APIRouter(prefix="/api/v1/matching", tags=["matching"])
 
@@ -36,16 +53,141 @@ def trigger_matching(
     if not cv_ids:
         raise HTTPException(status_code=400, detail="No processed CVs available for matching")
 
+    prescores = []
+    if body.mode == "shortlist":
+        jd = get_jd(db, body.jd_id, user.id)
+        if not jd:
+            raise HTTPException(status_code=404, detail="Job description not found")
+        prescores = rank_candidates(db, jd, cv_ids)
+        top_k = body.top_k
+        if top_k is None and body.min_prescore is None:
+            top_k = settings.SHORTLIST_DEFAULT_TOP_K
+        cv_ids = select_shortlist(prescores, top_k, body.min_prescore)
+        escalated = set(cv_ids)
+        for entry in prescores:
+            entry["escalated"] = entry["cv_file_id"] in escalated
+
     from backend.task_manager import submit_match_batch
 
-    task_id = submit_match_batch(cv_ids, str(body.jd_id))
-    return MatchResponse(task_id=task_id, total_cvs=len(cv_ids))
+    task_id = submit_match_batch(cv_ids, str(body.jd_id), body.force) if cv_ids else None
+    return MatchResponse(task_id=task_id, total_cvs=len(cv_ids), prescores=prescores)
 
 
 @router.get("/leaderboard/{jd_id}", response_model=list[LeaderboardEntry])
 def leaderboard(
     jd_id: UUID,
+    response: Response,
+    if_none_match: str | None = Header(None),
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    """Cached leaderboard; send the returned ETag as If-None-Match to skip unchanged bodies."""
+    etag = leaderboard_etag(jd_id)
+    if etag is not None and if_none_match == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    entries, etag = get_cached_leaderboard(db, jd_id)
+    if if_none_match == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return entries
+
+
+@router.get("/leaderboard/{jd_id}/page", response_model=LeaderboardPage)
+def leaderboard_page(
+    jd_id: UUID,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: str | None = Query(None),
+    fit_status: Literal["green", "yellow", "red"] | None = Query(None),
+    min_score: float | None = Query(None, ge=0, le=100),
+    skills: list[str] | None = Query(None),
+    detail: bool = Query(False),
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    """Keyset-paginated leaderboard; pass back ``next_cursor`` to get the following page."""
+    if not get_jd(db, jd_id, user.id):
+        raise HTTPException(status_code=404, detail="Job description not found")
+    try:
+        return get_leaderboard_page(
+            db, jd_id, limit, cursor, fit_status, min_score, skills, detail
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/leaderboard/{jd_id}/what-if", response_model=list[LeaderboardEntry])
+def leaderboard_what_if(
+    jd_id: UUID,
+    body: JDUpdateWeights,
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    """Leaderboard re-ranked with proposed weights, without saving them."""
+    if not get_jd(db, jd_id, user.id):
+        raise HTTPException(status_code=404, detail="Job description not found")
+    return get_leaderboard(db, jd_id, weights=body.model_dump())
+
+
+@router.get("/rank/{jd_id}", response_model=list[RankedCandidate])
+def rank_all_candidates(
+    jd_id: UUID,
+    limit: int = Query(100, ge=1, le=10000),
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    jd = get_jd(db, jd_id, user.id)
+    if not jd:
+        raise HTTPException(status_code=404, detail="Job description not found")
+    return get_candidate_matrix(db, user.id).score(jd, limit)
+
+
+def _get_user_cv(db: Session, cv_file_id: UUID, user: User) -> CVFile:
+    cv = (
+        db.query(CVFile)
+        .join(MonitoredFolder)
+        .filter(CVFile.id == cv_file_id, MonitoredFolder.user_id == user.id)
+        .first()
+    )
+    if not cv:
+        raise HTTPException(status_code=404, detail="CV not found")
+    return cv
+
+
+@router.post("/roles", response_model=RoleMatchResponse)
+def trigger_role_matching(
+    body: RoleMatchRequest,
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    """Match one CV against the user's active roles, LLM-scoring only the best prescored ones."""
+    _get_user_cv(db, body.cv_file_id, user)
+    try:
+        prescores = rank_roles(db, body.cv_file_id, user.id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not prescores:
+        raise HTTPException(status_code=400, detail="No active job descriptions to match against")
+
+    top_k = body.top_k
+    if top_k is None and body.min_prescore is None:
+        top_k = settings.ROLE_MATCH_DEFAULT_TOP_K
+    jd_ids = select_shortlist(prescores, top_k, body.min_prescore, key="jd_id")
+    escalated = set(jd_ids)
+    for entry in prescores:
+        entry["escalated"] = entry["jd_id"] in escalated
+
+    from backend.task_manager import submit_role_match
+
+    task_id = submit_role_match(str(body.cv_file_id), jd_ids, body.force) if jd_ids else None
+    return RoleMatchResponse(task_id=task_id, total_jds=len(jd_ids), prescores=prescores)
+
+
+@router.get("/roles/{cv_file_id}", response_model=list[BestRoleEntry])
+def best_roles(
+    cv_file_id: UUID,
+    limit: int | None = Query(None, ge=1),
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
-    return get_leaderboard(db, jd_id)
+    _get_user_cv(db, cv_file_id, user)
+    return get_best_roles(db, cv_file_id, user.id, limit)
@@ -35,4 +35,7 @@ class ScanResultResponse(BaseModel):
     new: int
     modified: int
     skipped: int
+    hashed: int = 0
+    stat_skipped: int = 0
+    errors: int = 0
     new_cv_ids: list[str]
@@ -1,17 +1,35 @@
+from typing import Literal
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class MatchRequest(BaseModel):
     jd_id: UUID
     cv_file_ids: list[UUID] | None = None
     weights: dict | None = None
+    mode: Literal["full", "shortlist"] = "full"
+    top_k: int | None = Field(None, ge=1)
+    min_prescore: float | None = Field(None, ge=0, le=100)
+    force: bool = False
+
+
+class PrescoreEntry(BaseModel):
+    cv_file_id: str
+    candidate_name: str
+    prescore: float
+    skills_score: float
+    experience_score: float
+    keywords_score: float
+    matched_skills: list
+    missing_skills: list
+    escalated: bool
 
 
 class MatchResponse(BaseModel):
-    task_id: str
+    task_id: str | None
     total_cvs: int
+    prescores: list[PrescoreEntry] = []
 
 
 class LeaderboardEntry(BaseModel):
@@ -27,6 +45,64 @@ class LeaderboardEntry(BaseModel):
     fit_status: str
     matched_skills: list
     missing_skills: list
-    strengths: list
-    gaps: list
+    strengths: list | None = None
+    gaps: list | None = None
+    explanation: str | None = None
+
+
+class LeaderboardPage(BaseModel):
+    entries: list[LeaderboardEntry]
+    next_cursor: str | None = None
+
+
+class RankedCandidate(BaseModel):
+    rank: int
+    cv_file_id: str
+    candidate_name: str
+    score: float
+    coverage: float
+    weighted_overlap: float
+    experience_gap: float
+    skills_score: float
+    experience_score: float
+    keywords_score: float
+
+
+class RoleMatchRequest(BaseModel):
+    cv_file_id: UUID
+    top_k: int | None = Field(None, ge=1)
+    min_prescore: float | None = Field(None, ge=0, le=100)
+    force: bool = False
+
+
+class RolePrescoreEntry(BaseModel):
+    jd_id: str
+    title: str
+    prescore: float
+    skills_score: float
+    experience_score: float
+    keywords_score: float
+    matched_skills: list
+    missing_skills: list
+    escalated: bool
+
+
+class RoleMatchResponse(BaseModel):
+    task_id: str | None
+    total_jds: int
+    prescores: list[RolePrescoreEntry] = []
+
+
+class BestRoleEntry(BaseModel):
+    rank: int
+    jd_id: str
+    title: str
+    overall_score: float
+    skills_score: float
+    experience_score: float
+    projects_score: float
+    keywords_score: float
+    fit_status: str
+    matched_skills: list
+    missing_skills: list
     explanation: str | None
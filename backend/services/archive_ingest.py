@@ -0,0 +1,217 @@
+"""Register the CVs inside a ZIP or TAR archive without unpacking it.
+
+The archive is read member by member: every PDF/DOCX member is streamed in
+chunks through an ``UploadSpooler`` into UPLOAD_DIR, so it is hashed as it is
+read and nothing bigger than a chunk is held in memory; it moves to its content
+address once its batch is registered. Members are registered every ``SCAN_BATCH_SIZE`` files with
+``add_spooled_files`` (set-based dedup, one bulk INSERT), and ``on_batch``
+receives each batch's new CV ids so parsing starts while the rest of the
+archive is still being read.
+
+Zip-bomb limits: at most ``ARCHIVE_MAX_MEMBERS`` files, at most
+``ARCHIVE_MAX_TOTAL_BYTES`` uncompressed and no extracted ZIP member compressed
+more than ``ARCHIVE_MAX_RATIO`` times; exceeding any of them aborts the ingest.
+The total counts every member, since a streamed TAR decompresses the ones it
+skips too. Members over ``UPLOAD_MAX_FILE_BYTES`` are skipped.
+"""
+
+import os
+import shutil
+import tarfile
+import tempfile
+import zipfile
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import BinaryIO
+
+from sqlalchemy.orm import Session
+
+from backend.config import settings
+from backend.models.monitored_folder import MonitoredFolder
+from backend.services.folder_service import UPLOAD_DIR, add_spooled_files
+from backend.services.upload_stream import UploadSpooler, UploadTooLarge
+from backend.utils.hashing import CHUNK_SIZE
+
+ARCHIVE_SPOOL_DIR = os.path.join(tempfile.gettempdir(), "cv_archives")
+# Upload suffixes accepted as archives (Path.suffix of "cvs.tar.gz" is ".gz")
+ARCHIVE_SUFFIXES = {".zip", ".tar", ".tgz", ".gz", ".bz2", ".xz"}
+
+
+class ArchiveLimitExceeded(ValueError):
+    pass
+
+
+@dataclass
+class ArchiveStats:
+    members: int = 0
+    ignored: int = 0
+    too_large: int = 0
+    new: int = 0
+    skipped: int = 0
+    uncompressed_bytes: int = 0
+    new_cv_ids: list[str] = field(default_factory=list)
+
+    def as_result(self) -> dict:
+        return dict(self.__dict__, new_cv_ids=list(self.new_cv_ids))
+
+
+def new_archive_spool_dir() -> str:
+    """A private directory to stream one uploaded archive into; remove it when done."""
+    os.makedirs(ARCHIVE_SPOOL_DIR, exist_ok=True)
+    return tempfile.mkdtemp(dir=ARCHIVE_SPOOL_DIR)
+
+
+ArchiveMember = tuple[str, int, int | None, Callable[[], BinaryIO]]
+
+
+def iter_archive_members(path: str) -> Iterator[ArchiveMember]:
+    """Yield (name, size, compressed size, open) for every regular file in a ZIP or TAR.
+
+    TARs (plain or compressed) are read as a stream, so each member must be
+    consumed before the next one is yielded; their members have no compressed
+    size of their own.
+    """
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for info in archive.infolist():
+                if not info.is_dir():
+                    yield (
+                        info.filename,
+                        info.file_size,
+                        info.compress_size,
+                        lambda info=info: archive.open(info),
+                    )
+        return
+    try:
+        archive = tarfile.open(path, mode="r|*")
+    except tarfile.TarError as e:
+        raise ValueError(f"Not a ZIP or TAR archive: {e}") from e
+    with archive:
+        for member in archive:
+            if member.isfile():
+                yield (
+                    member.name,
+                    member.size,
+                    None,
+                    lambda member=member: archive.extractfile(member),
+                )
+
+
+class ArchiveIngest:
+    """Register the CVs of one archive in ``folder``; ``run()`` returns ``ArchiveStats``.
+
+    ``on_batch(cv_ids)`` is called with the new CV ids of every committed batch
+    and ``on_progress(stats)`` after every batch.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        folder: MonitoredFolder,
+        archive_path: str,
+        on_batch=None,
+        on_progress=None,
+        batch_size: int | None = None,
+    ):
+        self.db = db
+        self.folder = folder
+        self.archive_path = archive_path
+        self.on_batch = on_batch
+        self.on_progress = on_progress
+        self.batch_size = batch_size or settings.SCAN_BATCH_SIZE
+        self.stats = ArchiveStats()
+        self.spooler = UploadSpooler(
+            UPLOAD_DIR, set(settings.ALLOWED_EXTENSIONS), settings.UPLOAD_MAX_FILE_BYTES
+        )
+
+    def run(self) -> ArchiveStats:
+        try:
+            for name, size, compressed_size, open_member in iter_archive_members(
+                self.archive_path
+            ):
+                self._add_member(name, size, compressed_size, open_member)
+                if len(self.spooler.uploads) >= self.batch_size:
+                    self._flush()
+        except Exception:
+            # Registered batches stay; only the unregistered temp files are removed
+            self.spooler.discard()
+            raise
+        self._flush()
+        return self.stats
+
+    def _add_member(
+        self,
+        name: str,
+        size: int,
+        compressed_size: int | None,
+        open_member: Callable[[], BinaryIO],
+    ):
+        self.stats.members += 1
+        if self.stats.members > settings.ARCHIVE_MAX_MEMBERS:
+            raise ArchiveLimitExceeded(
+                f"Archive has more than {settings.ARCHIVE_MAX_MEMBERS} files"
+            )
+        # Counted before any member is skipped: a streamed TAR decompresses those too.
+        # Members never yield more than their size, so this bounds what is read.
+        self.stats.uncompressed_bytes += size
+        if self.stats.uncompressed_bytes > settings.ARCHIVE_MAX_TOTAL_BYTES:
+            raise ArchiveLimitExceeded(
+                f"Archive expands to more than {settings.ARCHIVE_MAX_TOTAL_BYTES} bytes"
+            )
+        filename = Path(name).name
+        if Path(filename).suffix.lower() not in self.spooler.allowed_exts:
+            self.stats.ignored += 1
+            return
+        max_file_bytes = settings.UPLOAD_MAX_FILE_BYTES
+        if max_file_bytes and size > max_file_bytes:
+            self.stats.too_large += 1
+            return
+        if compressed_size is not None and size > settings.ARCHIVE_MAX_RATIO * max(
+            compressed_size, 1
+        ):
+            raise ArchiveLimitExceeded(
+                f"{name} is compressed more than {settings.ARCHIVE_MAX_RATIO}x"
+            )
+
+        self.spooler.start(filename)
+        try:
+            with open_member() as src:
+                for chunk in iter(lambda: src.read(CHUNK_SIZE), b""):
+                    self.spooler.write(chunk)
+        except UploadTooLarge:
+            self.spooler.abort()
+            self.stats.too_large += 1
+            return
+        self.spooler.finish()
+
+    def _flush(self):
+        uploads = self.spooler.uploads
+        if uploads:
+            result = add_spooled_files(self.db, self.folder, uploads, len(uploads))
+            self.spooler.store()
+            self.spooler.uploads = []
+            self.stats.new += result["new"]
+            self.stats.skipped += result["skipped"]
+            self.stats.new_cv_ids.extend(result["new_cv_ids"])
+            if result["new_cv_ids"] and self.on_batch:
+                self.on_batch(result["new_cv_ids"])
+        if self.on_progress:
+            self.on_progress(self.stats)
+
+
+def remove_archive_spool(archive_path: str):
+    """Remove the spool directory of an uploaded archive; other paths are left alone."""
+    spool_dir = os.path.dirname(archive_path)
+    if os.path.dirname(spool_dir) == ARCHIVE_SPOOL_DIR:
+        shutil.rmtree(spool_dir, ignore_errors=True)
+
+
+def ingest_archive(
+    db: Session, folder: MonitoredFolder, archive_path: str, on_batch=None, on_progress=None
+) -> dict:
+    """Register the CVs in an archive; the caller removes an uploaded one afterwards."""
+    stats = ArchiveIngest(
+        db, folder, archive_path, on_batch=on_batch, on_progress=on_progress
+    ).run()
+    return stats.as_result()
@@ -0,0 +1,332 @@
+"""In-memory CV x skill matrix for scoring a JD against a whole candidate pool.
+
+Each user's parsed CVs are held as a sparse incidence matrix (one row per CV,
+one column per normalised skill) plus an experience-years column. Scoring a JD
+is then a handful of sparse mat-vec products instead of a Python loop, and
+yields the same sub-scores as ``prescorer.prescore``.
+
+Matrices are built lazily per user and updated incrementally: new or re-parsed
+CVs are appended (the previous row is tombstoned) and deleted CVs are
+tombstoned; tombstones are compacted away once they make up a quarter of rows.
+"""
+
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from uuid import UUID
+
+import numpy as np
+from scipy import sparse
+from sqlalchemy.orm import Session, load_only
+
+from backend.models.cv_file import CVFile
+from backend.models.job_description import JobDescription
+from backend.models.monitored_folder import MonitoredFolder
+from backend.models.parsed_cv import ParsedCV
+from backend.services.matcher import get_weights
+from backend.services.prescorer import cv_skill_set, skill_set
+
+_COMPACT_MIN_ROWS = 1000
+
+
+class CandidateMatrix:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.skill_index: dict[str, int] = {}
+        self.row_index: dict[str, int] = {}
+        self._cv_ids: list[str] = []
+        self._names: list[str] = []
+        self._years = np.full(16, np.nan)
+        self._alive = np.zeros(16, dtype=bool)
+        self._rows = 0
+        self._base = sparse.csr_matrix((0, 0), dtype=np.float32)
+        self._pending: list[list[int]] = []
+
+    def __len__(self) -> int:
+        return len(self.row_index)
+
+    def _ensure_capacity(self, rows: int):
+        if rows <= len(self._alive):
+            return
+        capacity = max(rows, len(self._alive) * 2)
+        self._years = np.concatenate([self._years, np.full(capacity - len(self._years), np.nan)])
+        self._alive = np.concatenate(
+            [self._alive, np.zeros(capacity - len(self._alive), dtype=bool)]
+        )
+
+    def _columns(self, skills: set[str]) -> list[int]:
+        cols = []
+        for skill in skills:
+            col = self.skill_index.get(skill)
+            if col is None:
+                col = len(self.skill_index)
+                self.skill_index[skill] = col
+            cols.append(col)
+        return sorted(cols)
+
+    def upsert(self, cv_file_id: str, candidate_name: str | None, skills: set[str], years):
+        with self._lock:
+            old = self.row_index.get(cv_file_id)
+            if old is not None:
+                self._alive[old] = False
+            row = self._rows
+            self._ensure_capacity(row + 1)
+            self._pending.append(self._columns(skills))
+            self._cv_ids.append(cv_file_id)
+            self._names.append(candidate_name or "Unknown")
+            self._years[row] = np.nan if years is None else float(years)
+            self._alive[row] = True
+            self.row_index[cv_file_id] = row
+            self._rows += 1
+
+    def upsert_parsed(self, parsed_cv: ParsedCV):
+        self.upsert(
+            str(parsed_cv.cv_file_id),
+            parsed_cv.candidate_name,
+            cv_skill_set(parsed_cv),
+            parsed_cv.total_experience_years,
+        )
+
+    def remove(self, cv_file_ids: list[str]):
+        with self._lock:
+            for cv_file_id in cv_file_ids:
+                row = self.row_index.pop(cv_file_id, None)
+                if row is not None:
+                    self._alive[row] = False
+
+    def _matrix(self) -> sparse.csr_matrix:
+        """Fold pending rows into the CSR matrix and compact tombstones. Caller holds the lock."""
+        n_cols = len(self.skill_index)
+        base = sparse.csr_matrix(
+            (self._base.data, self._base.indices, self._base.indptr),
+            shape=(self._base.shape[0], n_cols),
+        )
+        if self._pending:
+            indptr = np.zeros(len(self._pending) + 1, dtype=np.int64)
+            indptr[1:] = np.cumsum([len(cols) for cols in self._pending])
+            indices = np.fromiter(
+                (c for cols in self._pending for c in cols), dtype=np.int64, count=indptr[-1]
+            )
+            new_rows = sparse.csr_matrix(
+                (np.ones(len(indices), dtype=np.float32), indices, indptr),
+                shape=(len(self._pending), n_cols),
+            )
+            base = sparse.vstack([base, new_rows], format="csr")
+            self._pending = []
+
+        dead = self._rows - len(self.row_index)
+        if self._rows >= _COMPACT_MIN_ROWS and dead * 4 >= self._rows:
+            keep = np.flatnonzero(self._alive[: self._rows])
+            base = base[keep]
+            self._cv_ids = [self._cv_ids[i] for i in keep]
+            self._names = [self._names[i] for i in keep]
+            years = self._years[keep]
+            self._rows = len(keep)
+            self._years = np.full(max(16, self._rows), np.nan)
+            self._years[: self._rows] = years
+            self._alive = np.zeros(len(self._years), dtype=bool)
+            self._alive[: self._rows] = True
+            self.row_index = {cv_id: i for i, cv_id in enumerate(self._cv_ids)}
+
+        self._base = base
+        return base
+
+    def _vector(self, weights: dict[str, float]) -> np.ndarray:
+        vec = np.zeros(len(self.skill_index), dtype=np.float32)
+        for skill, weight in weights.items():
+            col = self.skill_index.get(skill)
+            if col is not None:
+                vec[col] = weight
+        return vec
+
+    def score(self, jd: JobDescription, limit: int | None = None) -> list[dict]:
+        """Score every live candidate against the JD and return the best ``limit``, ranked."""
+        weights = get_weights(jd)
+        required = skill_set(jd.required_skills)
+        preferred = skill_set(jd.preferred_skills) - required
+        keywords = skill_set(jd.keywords)
+        # Overlap credits each wanted skill once, at its most important role
+        overlap_weights = {s: 0.25 for s in keywords}
+        overlap_weights.update({s: 0.5 for s in preferred})
+        overlap_weights.update({s: 1.0 for s in required})
+
+        with self._lock:
+            matrix = self._matrix()
+            n = self._rows
+            years = self._years[:n].copy()
+            alive = self._alive[:n].copy()
+            req_vec = self._vector(dict.fromkeys(required, 1.0))
+            pref_vec = self._vector(dict.fromkeys(preferred, 1.0))
+            kw_vec = self._vector(dict.fromkeys(keywords, 1.0))
+            overlap_vec = self._vector(overlap_weights)
+            cv_ids = self._cv_ids
+            names = self._names
+        if n == 0:
+            return []
+
+        req_hits = matrix @ req_vec
+        pref_hits = matrix @ pref_vec
+        kw_hits = matrix @ kw_vec
+
+        ones = np.ones(n)
+        req_cov = req_hits / len(required) if required else None
+        pref_cov = pref_hits / len(preferred) if preferred else None
+        if req_cov is None and pref_cov is None:
+            skills_score = ones * 100
+        elif pref_cov is None:
+            skills_score = req_cov * 100
+        elif req_cov is None:
+            skills_score = pref_cov * 100
+        else:
+            skills_score = (0.8 * req_cov + 0.2 * pref_cov) * 100
+
+        min_years = jd.min_experience_years
+        if not min_years:
+            experience_score = ones * 100
+            experience_gap = np.zeros(n)
+        else:
+            known = np.nan_to_num(years, nan=0.0)
+            experience_score = np.minimum(known / min_years, 1.0) * 100
+            experience_gap = np.maximum(min_years - known, 0.0)
+
+        keywords_score = kw_hits / len(keywords) * 100 if keywords else ones * 100
+
+        overlap_total = sum(overlap_weights.values())
+        weighted_overlap = (matrix @ overlap_vec) / overlap_total if overlap_total else ones
+
+        w_skills = weights.get("skills", 0.4)
+        w_exp = weights.get("experience", 0.3)
+        w_kw = weights.get("keywords", 0.1)
+        total_weight = (w_skills + w_exp + w_kw) or 1.0
+        score = (
+            skills_score * w_skills + experience_score * w_exp + keywords_score * w_kw
+        ) / total_weight
+        score = np.where(alive, score, -np.inf)
+
+        live = int(alive.sum())
+        k = live if limit is None else min(limit, live)
+        if k == 0:
+            return []
+        top = np.argpartition(-score, k - 1)[:k] if k < n else np.arange(n)
+        top = top[np.isfinite(score[top])]
+        top = top[np.lexsort((top, -score[top]))]
+
+        return [
+            {
+                "rank": rank,
+                "cv_file_id": cv_ids[i],
+                "candidate_name": names[i],
+                "score": round(float(score[i]), 2),
+                "coverage": round(float(req_cov[i]) if req_cov is not None else 1.0, 4),
+                "weighted_overlap": round(float(weighted_overlap[i]), 4),
+                "experience_gap": round(float(experience_gap[i]), 2),
+                "skills_score": round(float(skills_score[i]), 2),
+                "experience_score": round(float(experience_score[i]), 2),
+                "keywords_score": round(float(keywords_score[i]), 2),
+            }
+            for rank, i in enumerate(top, 1)
+        ]
+
+
+@dataclass
+class _MatrixLoad:
+    """A matrix being loaded; changes made meanwhile are replayed once it is built."""
+
+    changes: list[Callable[[CandidateMatrix], None]] = field(default_factory=list)
+    done: threading.Event = field(default_factory=threading.Event)
+
+
+_matrices: dict[UUID, CandidateMatrix] = {}
+_loading: dict[UUID, _MatrixLoad] = {}
+_matrices_lock = threading.Lock()
+
+
+def _load_matrix(db: Session, user_id: UUID, matrix: CandidateMatrix):
+    parsed_cvs = (
+        db.query(ParsedCV)
+        .options(
+            load_only(
+                ParsedCV.cv_file_id,
+                ParsedCV.candidate_name,
+                ParsedCV.total_experience_years,
+                ParsedCV.skills,
+                ParsedCV.tools,
+                ParsedCV.projects,
+            )
+        )
+        .join(CVFile, CVFile.id == ParsedCV.cv_file_id)
+        .join(MonitoredFolder, MonitoredFolder.id == CVFile.folder_id)
+        .filter(MonitoredFolder.user_id == user_id)
+        .yield_per(2000)
+    )
+    for parsed_cv in parsed_cvs:
+        matrix.upsert_parsed(parsed_cv)
+
+
+def get_candidate_matrix(db: Session, user_id: UUID) -> CandidateMatrix:
+    """Return the user's candidate matrix, loading it from the database on first use.
+
+    The matrix is registered before it is loaded, so CVs parsed or deleted
+    during the load are recorded and replayed on top of it; concurrent callers
+    wait for the load instead of starting their own.
+    """
+    while True:
+        with _matrices_lock:
+            matrix = _matrices.get(user_id)
+            load = _loading.get(user_id)
+            if matrix is None:
+                matrix = _matrices[user_id] = CandidateMatrix()
+                load = _loading[user_id] = _MatrixLoad()
+                break
+        if load is None:
+            return matrix
+        load.done.wait()
+
+    try:
+        _load_matrix(db, user_id, matrix)
+    except Exception:
+        with _matrices_lock:
+            del _matrices[user_id]
+            del _loading[user_id]
+        load.done.set()
+        raise
+
+    # Replay under the lock so no later change can be applied before an earlier one
+    with _matrices_lock:
+        for change in load.changes:
+            change(matrix)
+        del _loading[user_id]
+    load.done.set()
+    return matrix
+
+
+def _apply_change(user_id: UUID, change: Callable[[CandidateMatrix], None]):
+    with _matrices_lock:
+        matrix = _matrices.get(user_id)
+        load = _loading.get(user_id)
+        if load is not None:
+            load.changes.append(change)
+            return
+    if matrix is not None:
+        change(matrix)
+
+
+def on_cv_parsed(db: Session, cv: CVFile, parsed_cv: ParsedCV):
+    """Keep a loaded matrix in sync after a CV is (re)parsed."""
+    if not _matrices:
+        return
+    user_id = (
+        db.query(MonitoredFolder.user_id).filter(MonitoredFolder.id == cv.folder_id).scalar()
+    )
+    # Read the row now: a replayed change may run after this session is closed
+    row = (
+        str(parsed_cv.cv_file_id),
+        parsed_cv.candidate_name,
+        cv_skill_set(parsed_cv),
+        parsed_cv.total_experience_years,
+    )
+    _apply_change(user_id, lambda matrix: matrix.upsert(*row))
+
+
+def on_cvs_deleted(user_id: UUID, cv_file_ids: list[str]):
+    _apply_change(user_id, lambda matrix: matrix.remove(cv_file_ids))
@@ -1,3 +1,5 @@
+import hashlib
+import re
 from datetime import datetime, timezone
 
 from sqlalchemy.orm import Session
@@ -5,16 +7,24 @@ from sqlalchemy.orm import Session
 from backend.config import settings
 from backend.models.cv_file import CVFile
 from backend.models.parsed_cv import ParsedCV
+from backend.services.candidate_matrix import on_cv_parsed
 from backend.services.file_parser import extract_text
-from backend.utils.llm_client import call_llm, is_llm_available
+from backend.services.folder_service import UNRETAINED_UPLOAD_PREFIX
+from backend.services.leaderboard_cache import invalidate_all_leaderboards
+from backend.services.skill_index import index_cv_skills
+from backend.utils.cv_sections import PAGE_BREAK, compact_cv_text
+from backend.utils.llm_client import acall_llm, call_llm, is_llm_available
+from backend.utils.skills import canonical_skills, find_known_skills
+
+# Bump whenever the parse prompt or text preparation changes in a way that should
+# stop stored parses from being reused for new uploads of the same file
+PARSE_PROMPT_VERSION = "4"
 
 CV_PARSE_SYSTEM_PROMPT = """You are a professional resume/CV parser. Extract structured information from the given CV text.
 
 Return a JSON object with these fields:
 {
   "candidate_name": "Full name of the candidate",
-  "email": "email@example.com or null",
-  "phone": "phone number or null",
   "total_experience_years": 5.0,
   "skills": ["Python", "SQL", "Machine Learning"],
   "experience": [
@@ -51,25 +61,118 @@ Rules:
 - If a field cannot be determined, use null for scalars or [] for lists.
 - Extract ALL skills mentioned anywhere in the CV.
 - Tools should include specific software, platforms, and technologies distinct from general skills.
+- The CV text may be preceded by a list of skills and tools that were already extracted. Do not repeat them; list only other skills and tools.
 """
 
 
-MAX_CV_CHARS = 15000  # ~4K tokens
+PARSED_FIELDS = (
+    "candidate_name",
+    "email",
+    "phone",
+    "total_experience_years",
+    "skills",
+    "experience",
+    "education",
+    "projects",
+    "tools",
+    "certifications",
+    "summary",
+)
+
+
+def parse_key(file_hash: str, model: str | None = None) -> str:
+    """Content address of a parse: the file plus everything its parse is derived from."""
+    parts = [
+        file_hash,
+        model or settings.GROQ_FAST_MODEL,
+        PARSE_PROMPT_VERSION,
+        str(settings.CV_PARSE_TOKEN_BUDGET),
+    ]
+    return hashlib.sha256(":".join(parts).encode()).hexdigest()
+
+
+_EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)*\.[a-zA-Z]{2,}")
+_PHONE_RE = re.compile(r"(?<![\w+])\+?\(?\d[\d\s().-]{6,18}\d(?!\w)")
+_YEAR_RANGE_RE = re.compile(r"^(?:19|20)\d\d\s*[-.]\s*(?:19|20)\d\d$")
+
+
+def _find_phone(text: str) -> str | None:
+    for match in _PHONE_RE.finditer(text):
+        candidate = match.group().strip()
+        digits = sum(ch.isdigit() for ch in candidate)
+        if 9 <= digits <= 15 and not _YEAR_RANGE_RE.match(candidate):
+            return candidate
+    return None
+
+
+def extract_local_fields(raw_text: str) -> dict:
+    """Fields found without the LLM: contact details and dictionary-matched skills/tools."""
+    email = _EMAIL_RE.search(raw_text)
+    return {
+        "email": email.group() if email else None,
+        "phone": _find_phone(raw_text),
+        **find_known_skills(raw_text),
+    }
+
+
+def _parse_prompt(raw_text: str, local: dict) -> str:
+    compacted = compact_cv_text(raw_text, settings.CV_PARSE_TOKEN_BUDGET)
+    known = local["skills"] + local["tools"]
+    if not known:
+        return compacted
+    return f"Already extracted skills and tools: {', '.join(known)}\n\nCV text:\n{compacted}"
+
+
+def _merge_skill_lists(local: list[str], extra) -> list[str]:
+    if not isinstance(extra, list):
+        return local
+    return list(canonical_skills(local + extra).values())
+
+
+def merge_parsed_fields(local: dict, parsed: dict) -> dict:
+    """Combine local fields with the LLM's, which only lists skills/tools not found locally."""
+    merged = dict(parsed) if isinstance(parsed, dict) else {}
+    merged["email"] = local["email"]
+    merged["phone"] = local["phone"]
+    merged["skills"] = _merge_skill_lists(local["skills"], merged.get("skills"))
+    merged["tools"] = _merge_skill_lists(local["tools"], merged.get("tools"))
+    return merged
+
 
+def _offline_parse(local: dict) -> dict:
+    summary = "LLM not configured - partial local parse only"
+    return {**local, "candidate_name": None, "summary": summary}
 
-def parse_cv_text(raw_text: str) -> dict:
+
+def parse_cv_text(raw_text: str, use_cache: bool = True) -> dict:
+    local = extract_local_fields(raw_text)
     if not is_llm_available():
-        return {"candidate_name": None, "summary": "LLM not configured - raw text stored only"}
-    truncated = raw_text[:MAX_CV_CHARS] if len(raw_text) > MAX_CV_CHARS else raw_text
-    return call_llm(
+        return _offline_parse(local)
+    parsed = call_llm(
         system_prompt=CV_PARSE_SYSTEM_PROMPT,
-        user_prompt=truncated,
+        user_prompt=_parse_prompt(raw_text, local),
         response_json=True,
         model=settings.GROQ_FAST_MODEL,
+        use_cache=use_cache,
     )
+    return merge_parsed_fields(local, parsed)
 
 
-def process_single_cv(db: Session, cv_file_id: str) -> ParsedCV:
+async def aparse_cv_text(raw_text: str, use_cache: bool = True) -> dict:
+    local = extract_local_fields(raw_text)
+    if not is_llm_available():
+        return _offline_parse(local)
+    parsed = await acall_llm(
+        system_prompt=CV_PARSE_SYSTEM_PROMPT,
+        user_prompt=_parse_prompt(raw_text, local),
+        response_json=True,
+        model=settings.GROQ_FAST_MODEL,
+        use_cache=use_cache,
+    )
+    return merge_parsed_fields(local, parsed)
+
+
+def start_cv_processing(db: Session, cv_file_id: str) -> CVFile:
     from uuid import UUID
 
     cv = db.query(CVFile).filter(CVFile.id == UUID(cv_file_id)).first()
@@ -78,48 +181,101 @@ def process_single_cv(db: Session, cv_file_id: str) -> ParsedCV:
 
     cv.status = "processing"
     db.commit()
+    return cv
 
-    try:
-        raw_text = extract_text(cv.file_path)
-        parsed_data = parse_cv_text(raw_text)
-
-        existing = db.query(ParsedCV).filter(ParsedCV.cv_file_id == cv.id).first()
-        if existing:
-            for key, value in parsed_data.items():
-                if hasattr(existing, key):
-                    setattr(existing, key, value)
-            existing.raw_text = raw_text
-            existing.parse_model = settings.GROQ_MODEL
-            existing.parsed_at = datetime.now(timezone.utc)
-            parsed_cv = existing
-        else:
-            parsed_cv = ParsedCV(
-                cv_file_id=cv.id,
-                candidate_name=parsed_data.get("candidate_name"),
-                email=parsed_data.get("email"),
-                phone=parsed_data.get("phone"),
-                total_experience_years=parsed_data.get("total_experience_years"),
-                skills=parsed_data.get("skills"),
-                experience=parsed_data.get("experience"),
-                education=parsed_data.get("education"),
-                projects=parsed_data.get("projects"),
-                tools=parsed_data.get("tools"),
-                certifications=parsed_data.get("certifications"),
-                summary=parsed_data.get("summary"),
-                raw_text=raw_text,
-                parse_model=settings.GROQ_MODEL,
-                parsed_at=datetime.now(timezone.utc),
-            )
-            db.add(parsed_cv)
-
-        cv.status = "processed"
-        cv.processed_at = datetime.now(timezone.utc)
-        db.commit()
-        db.refresh(parsed_cv)
-        return parsed_cv
 
+def find_reusable_parse(db: Session, cv: CVFile) -> ParsedCV | None:
+    """Any stored parse of the same file content, by any user, under the current parser."""
+    return (
+        db.query(ParsedCV)
+        .filter(ParsedCV.parse_key == parse_key(cv.file_hash), ParsedCV.cv_file_id != cv.id)
+        .first()
+    )
+
+
+def parse_store_key(cv: CVFile) -> str | None:
+    # Placeholder results from an unconfigured LLM must never be handed to other uploads
+    return parse_key(cv.file_hash) if is_llm_available() else None
+
+
+def save_parsed_cv(
+    db: Session, cv: CVFile, raw_text: str, parsed_data: dict, key: str | None = None
+) -> ParsedCV:
+    # Page breaks only matter for compacting the parse prompt
+    raw_text = raw_text.replace(PAGE_BREAK, "\n")
+    existing = db.query(ParsedCV).filter(ParsedCV.cv_file_id == cv.id).first()
+    if existing:
+        for field, value in parsed_data.items():
+            if hasattr(existing, field):
+                setattr(existing, field, value)
+        existing.raw_text = raw_text
+        existing.parse_model = settings.GROQ_MODEL
+        existing.parsed_at = datetime.now(timezone.utc)
+        existing.parse_key = key
+        parsed_cv = existing
+    else:
+        parsed_cv = ParsedCV(
+            cv_file_id=cv.id,
+            candidate_name=parsed_data.get("candidate_name"),
+            email=parsed_data.get("email"),
+            phone=parsed_data.get("phone"),
+            total_experience_years=parsed_data.get("total_experience_years"),
+            skills=parsed_data.get("skills"),
+            experience=parsed_data.get("experience"),
+            education=parsed_data.get("education"),
+            projects=parsed_data.get("projects"),
+            tools=parsed_data.get("tools"),
+            certifications=parsed_data.get("certifications"),
+            summary=parsed_data.get("summary"),
+            raw_text=raw_text,
+            parse_model=settings.GROQ_MODEL,
+            parse_key=key,
+            parsed_at=datetime.now(timezone.utc),
+        )
+        db.add(parsed_cv)
+        db.flush()
+
+    index_cv_skills(db, parsed_cv)
+    cv.status = "processed"
+    cv.processed_at = datetime.now(timezone.utc)
+    db.commit()
+    db.refresh(parsed_cv)
+    on_cv_parsed(db, cv, parsed_cv)
+    if existing:
+        # A re-parse can change the candidate name shown on existing leaderboards
+        invalidate_all_leaderboards()
+    return parsed_cv
+
+
+def reuse_parsed_cv(db: Session, cv: CVFile, source: ParsedCV) -> ParsedCV:
+    """Copy a stored parse of the same content onto ``cv`` without extraction or an LLM call."""
+    parsed_data = {field: getattr(source, field) for field in PARSED_FIELDS}
+    return save_parsed_cv(db, cv, source.raw_text, parsed_data, source.parse_key)
+
+
+def fail_cv_processing(db: Session, cv: CVFile, error: Exception):
+    db.rollback()
+    cv.status = "error"
+    cv.error_message = str(error)[:500]
+    db.commit()
+
+
+def stored_cv_path(file_path: str) -> str:
+    """The file to extract a CV from; uploads whose bytes were not kept have none."""
+    if file_path.startswith(UNRETAINED_UPLOAD_PREFIX):
+        raise ValueError("Original upload not retained; upload the CV again to re-parse it")
+    return file_path
+
+
+def process_single_cv(db: Session, cv_file_id: str, use_cache: bool = True) -> ParsedCV:
+    cv = start_cv_processing(db, cv_file_id)
+    try:
+        source = find_reusable_parse(db, cv) if use_cache else None
+        if source is not None:
+            return reuse_parsed_cv(db, cv, source)
+        raw_text = extract_text(stored_cv_path(cv.file_path), page_separator=PAGE_BREAK)
+        parsed_data = parse_cv_text(raw_text, use_cache=use_cache)
+        return save_parsed_cv(db, cv, raw_text, parsed_data, parse_store_key(cv))
     except Exception as e:
-        cv.status = "error"
-        cv.error_message = str(e)[:500]
-        db.commit()
+        fail_cv_processing(db, cv, e)
         raise
@@ -10,11 +10,11 @@ from reportlab.lib.units import inch
 from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
 from sqlalchemy.orm import Session
 
-from backend.services.matcher import get_leaderboard
+from backend.services.leaderboard_cache import get_cached_leaderboard
 
 
 def export_leaderboard_csv(db: Session, jd_id: UUID) -> bytes:
-    entries = get_leaderboard(db, jd_id)
+    entries, _ = get_cached_leaderboard(db, jd_id)
     output = io.StringIO()
     writer = csv.writer(output)
     writer.writerow([
@@ -42,7 +42,7 @@ def export_leaderboard_csv(db: Session, jd_id: UUID) -> bytes:
 
 
 def export_leaderboard_xlsx(db: Session, jd_id: UUID) -> bytes:
-    entries = get_leaderboard(db, jd_id)
+    entries, _ = get_cached_leaderboard(db, jd_id)
     wb = Workbook()
     ws = wb.active
     ws.title = "Leaderboard"
@@ -86,7 +86,7 @@ def export_leaderboard_xlsx(db: Session, jd_id: UUID) -> bytes:
 
 
 def export_leaderboard_pdf(db: Session, jd_id: UUID) -> bytes:
-    entries = get_leaderboard(db, jd_id)
+    entries, _ = get_cached_leaderboard(db, jd_id)
     output = io.BytesIO()
     doc = SimpleDocTemplate(output, pagesize=landscape(A4), topMargin=0.5 * inch)
 
@@ -1,22 +1,241 @@
+"""Text extraction from uploaded CV and JD files.
+
+PDFs and DOCX files each go through a registry of extraction engines, tried in
+``PDF_ENGINES`` / ``DOCX_ENGINES`` order.
+
+For PDFs the fast PyPDF2 engine is tried first, and its output is accepted only
+if it passes ``pdf_text_quality_ok``. Otherwise the next engine (pdfplumber,
+which computes full layout and is several times slower) gets a go. The last
+engine's output is returned as is. For DOCX the streaming engine reads
+``word/document.xml`` straight from the zip; python-docx is only used if it
+fails.
+
+Every entry point takes a file path or the file's content (bytes, memoryview
+or a binary file object), so uploads can be parsed without a temp-file round
+trip. PDF pages are joined with ``page_separator``: "\n" by default, while CV
+parsing asks for form feeds so page headers/footers can be told apart.
+"""
+
+import io
+import logging
 import os
+import unicodedata
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import BinaryIO, Callable
+from xml.etree.ElementTree import iterparse
 
 import pdfplumber
 from docx import Document
+from PyPDF2 import PdfReader
+
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+# A file path, or the file's content
+FileSource = str | os.PathLike | bytes | bytearray | memoryview | BinaryIO
+# What engines receive: a path, or the content as bytes (see _normalize_source)
+Source = str | bytes
+
+# Engine name -> fn(source, start, stop) returning the text of pages [start, stop)
+PdfEngine = Callable[[Source, int, int], list[str]]
+PDF_ENGINES: dict[str, PdfEngine] = {}
+
+# Quality heuristic: CVs with less text than this per page are likely scanned or
+# badly extracted, and so is text with many replacement/control/private-use chars
+# or hardly any spaces (words run together)
+MIN_CHARS_PER_PAGE = 100
+MAX_GARBAGE_RATIO = 0.05
+MIN_SPACE_RATIO = 0.05
+
+
+def _normalize_source(source: FileSource) -> Source:
+    if isinstance(source, (str, os.PathLike)):
+        return os.fspath(source)
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return bytes(source)
+    if source.seekable():
+        source.seek(0)
+    return source.read()
+
+
+def _open_source(source: Source):
+    """What the parsing libraries open: the path, or a fresh stream per engine."""
+    return source if isinstance(source, str) else io.BytesIO(source)
+
+
+def _describe(source: Source) -> str:
+    return source if isinstance(source, str) else f"<{len(source)} bytes>"
+
+
+def register_pdf_engine(name: str):
+    def decorator(fn: PdfEngine) -> PdfEngine:
+        PDF_ENGINES[name] = fn
+        return fn
+
+    return decorator
+
+
+@register_pdf_engine("pypdf2")
+def _pypdf2_pages(source: Source, start: int, stop: int) -> list[str]:
+    reader = PdfReader(_open_source(source))
+    return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+@register_pdf_engine("pdfplumber")
+def _pdfplumber_pages(source: Source, start: int, stop: int) -> list[str]:
+    with pdfplumber.open(_open_source(source)) as pdf:
+        return [pdf.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+def _is_garbage(ch: str) -> bool:
+    return ch == "\ufffd" or (not ch.isspace() and unicodedata.category(ch) in ("Cc", "Co", "Cs"))
 
 
-def extract_text_from_pdf(file_path: str) -> str:
-    text_parts = []
-    with pdfplumber.open(file_path) as pdf:
-        for page in pdf.pages:
-            page_text = page.extract_text()
-            if page_text:
-                text_parts.append(page_text)
-    return "\n".join(text_parts)
+def pdf_text_quality_ok(pages: list[str]) -> bool:
+    text = "".join(pages)
+    if not pages or len(text) < MIN_CHARS_PER_PAGE * len(pages):
+        return False
+    garbage = sum(1 for ch in text if _is_garbage(ch))
+    spaces = sum(1 for ch in text if ch.isspace())
+    return garbage / len(text) <= MAX_GARBAGE_RATIO and spaces / len(text) >= MIN_SPACE_RATIO
 
 
-def extract_text_from_docx(file_path: str) -> str:
-    doc = Document(file_path)
+def _pdf_page_count(source: Source) -> int:
+    try:
+        return len(PdfReader(_open_source(source)).pages)
+    except Exception as e:
+        # pdfplumber recovers files PyPDF2 rejects (truncated, junk before the header)
+        logger.warning(f"PyPDF2 could not count pages of {_describe(source)}: {e}")
+    with pdfplumber.open(_open_source(source)) as pdf:
+        return len(pdf.pages)
+
+
+def _run_pdf_engine(engine: str, source: Source, page_count: int) -> list[str]:
+    """Run one engine over the first ``page_count`` pages, in chunks across
+    processes when the document is long and ``PDF_PAGE_WORKERS`` allows it."""
+    extract = PDF_ENGINES[engine]
+    workers = settings.PDF_PAGE_WORKERS
+    if workers <= 1 or page_count < settings.PDF_PARALLEL_MIN_PAGES:
+        return extract(source, 0, page_count)
+    chunk = -(-page_count // workers)
+    bounds = [(start, min(start + chunk, page_count)) for start in range(0, page_count, chunk)]
+    with ProcessPoolExecutor(max_workers=len(bounds)) as pool:
+        parts = pool.map(extract, *zip(*[(source, a, b) for a, b in bounds]))
+        return [page for part in parts for page in part]
+
+
+def extract_text_from_pdf(
+    source: FileSource, engines: list[str] | None = None, page_separator: str = "\n"
+) -> str:
+    source = _normalize_source(source)
+    page_count = _pdf_page_count(source)
+    if settings.PDF_MAX_PAGES and page_count > settings.PDF_MAX_PAGES:
+        logger.warning(
+            f"Only extracting the first {settings.PDF_MAX_PAGES} of {page_count} pages"
+            f" of {_describe(source)}"
+        )
+        page_count = settings.PDF_MAX_PAGES
+    engines = engines or settings.PDF_ENGINES
+    best, error = None, None
+    for i, engine in enumerate(engines):
+        try:
+            pages = _run_pdf_engine(engine, source, page_count)
+        except Exception as e:
+            logger.warning(f"PDF engine {engine} failed on {_describe(source)}: {e}")
+            error = e
+            continue
+        if i == len(engines) - 1 or pdf_text_quality_ok(pages):
+            best = pages
+            break
+        best = best or pages
+    if best is None:
+        raise error
+    return page_separator.join(page for page in best if page)
+
+
+# Engine name -> fn(source) returning the document text
+DOCX_ENGINES: dict[str, Callable[[Source], str]] = {}
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+
+def register_docx_engine(name: str):
+    def decorator(fn: Callable[[Source], str]) -> Callable[[Source], str]:
+        DOCX_ENGINES[name] = fn
+        return fn
+
+    return decorator
+
+
+def iter_docx_lines(source: FileSource):
+    """Yield paragraph and table-row text from ``word/document.xml`` in document order.
+
+    The XML is parsed incrementally and every paragraph and row is cleared once
+    emitted, so memory stays bounded by the largest paragraph or table row.
+    Table rows come out as ``cell | cell``, like the python-docx engine.
+    """
+    # Stacks, since text boxes nest paragraphs and cells can hold tables
+    paragraphs: list[list[str]] = []
+    cells: list[list[str]] = []
+    rows: list[list[str]] = []
+    # Text only comes from runs: w:tab also defines tab stops under w:pPr
+    in_run = 0
+    archive = zipfile.ZipFile(_open_source(_normalize_source(source)))
+    with archive, archive.open("word/document.xml") as xml:
+        for event, elem in iterparse(xml, events=("start", "end")):
+            tag = elem.tag
+            if event == "start":
+                if tag == f"{_W}p":
+                    paragraphs.append([])
+                elif tag == f"{_W}r":
+                    in_run += 1
+                elif tag == f"{_W}tc":
+                    cells.append([])
+                elif tag == f"{_W}tr":
+                    rows.append([])
+                continue
+            if tag == f"{_W}r":
+                in_run -= 1
+            elif tag == f"{_W}t":
+                if in_run and paragraphs:
+                    paragraphs[-1].append(elem.text or "")
+            elif tag == f"{_W}tab":
+                if in_run and paragraphs:
+                    paragraphs[-1].append("\t")
+            elif tag in (f"{_W}br", f"{_W}cr"):
+                if in_run and paragraphs:
+                    paragraphs[-1].append("\n")
+            elif tag == f"{_W}p":
+                text = "".join(paragraphs.pop())
+                if cells:
+                    cells[-1].append(text)
+                elif text.strip():
+                    yield text
+                elem.clear()
+            elif tag == f"{_W}tc":
+                text = "\n".join(cells.pop()).strip()
+                if text and rows:
+                    rows[-1].append(text)
+            elif tag == f"{_W}tr":
+                row = rows.pop()
+                if row and cells:
+                    cells[-1].append(" | ".join(row))
+                elif row:
+                    yield " | ".join(row)
+                elem.clear()
+
+
+@register_docx_engine("stream")
+def _streaming_docx_text(source: Source) -> str:
+    return "\n".join(iter_docx_lines(source))
+
+
+@register_docx_engine("python-docx")
+def _python_docx_text(source: Source) -> str:
+    doc = Document(_open_source(source))
     parts = []
     for para in doc.paragraphs:
         if para.text.strip():
@@ -29,24 +248,36 @@ def extract_text_from_docx(file_path: str) -> str:
     return "\n".join(parts)
 
 
-def extract_text(file_path: str) -> str:
-    ext = Path(file_path).suffix.lower()
+def extract_text_from_docx(source: FileSource, engines: list[str] | None = None) -> str:
+    source = _normalize_source(source)
+    error = None
+    for engine in engines or settings.DOCX_ENGINES:
+        try:
+            return DOCX_ENGINES[engine](source)
+        except Exception as e:
+            logger.warning(f"DOCX engine {engine} failed on {_describe(source)}: {e}")
+            error = e
+    raise error
+
+
+def extract_text(
+    source: FileSource, filename: str | None = None, page_separator: str = "\n"
+) -> str:
+    """Extract text from a file path or in-memory content.
+
+    The type is taken from ``filename``, or from the path when none is given;
+    content passed without a filename has no type and is rejected.
+    ``page_separator`` joins PDF pages.
+    """
+    name = filename or (os.fspath(source) if isinstance(source, (str, os.PathLike)) else "")
+    ext = Path(name).suffix.lower()
     if ext == ".pdf":
-        return extract_text_from_pdf(file_path)
+        return extract_text_from_pdf(source, page_separator=page_separator)
     elif ext == ".docx":
-        return extract_text_from_docx(file_path)
+        return extract_text_from_docx(source)
     else:
         raise ValueError(f"Unsupported file type: {ext}")
 
 
 def extract_text_from_bytes(content: bytes, filename: str) -> str:
-    import tempfile
-
-    ext = Path(filename).suffix.lower()
-    with tempfile.NamedTemporaryFile(suffix=ext, delete=False) as tmp:
-        tmp.write(content)
-        tmp_path = tmp.name
-    try:
-        return extract_text(tmp_path)
-    finally:
-        os.unlink(tmp_path)
+    return extract_text(content, filename)
@@ -0,0 +1,209 @@
+"""Recursive, parallel folder scanner that streams its results to the DB.
+
+The walk is a generator over ``os.scandir`` entries of the folder and all its
+subdirectories, so the tree is never held in memory. Files whose stat signature
+matches the stored row are skipped without being read (see ``scan_folder``);
+the rest are hashed on a bounded thread pool while the walk continues. New and
+modified CVs are written in batches of ``SCAN_BATCH_SIZE`` with bulk
+INSERT/UPDATE statements, and ``on_batch`` receives each batch's CV ids as soon
+as it is committed, so parsing can start before the walk finishes. A file that
+cannot be read (removed or renamed mid-scan, no permission) is logged and
+counted in ``errors``; the scan carries on.
+"""
+
+import logging
+import os
+import uuid
+from collections.abc import Iterator
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from sqlalchemy import insert, update
+from sqlalchemy.orm import Session
+
+from backend.config import settings
+from backend.models.cv_file import CVFile
+from backend.models.monitored_folder import MonitoredFolder
+from backend.utils.hashing import compute_file_hash
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ScanStats:
+    total_on_disk: int = 0
+    new: int = 0
+    modified: int = 0
+    skipped: int = 0
+    hashed: int = 0
+    stat_skipped: int = 0
+    errors: int = 0
+    new_cv_ids: list[str] = field(default_factory=list)
+
+    def as_result(self) -> dict:
+        return dict(self.__dict__, new_cv_ids=list(self.new_cv_ids))
+
+
+def iter_cv_entries(root: str, allowed_exts: set[str]) -> Iterator[os.DirEntry]:
+    """Yield allowed files under ``root``, depth first; symlinked dirs are not followed."""
+    stack = [root]
+    while stack:
+        path = stack.pop()
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file() and Path(entry.name).suffix.lower() in allowed_exts:
+                        yield entry
+        except OSError as e:
+            logger.warning(f"Skipping unreadable directory {path}: {e}")
+
+
+def stat_fields(entry: os.DirEntry) -> dict:
+    stat = entry.stat()
+    return {
+        "file_size_bytes": stat.st_size,
+        "file_mtime_ns": stat.st_mtime_ns,
+        "file_inode": entry.inode(),
+    }
+
+
+def stat_unchanged(row, fields: dict) -> bool:
+    return (row.file_size_bytes, row.file_mtime_ns, row.file_inode) == (
+        fields["file_size_bytes"],
+        fields["file_mtime_ns"],
+        fields["file_inode"],
+    )
+
+
+class FolderScanner:
+    """Scan one local folder; ``run()`` returns the final ``ScanStats``.
+
+    ``on_batch(cv_ids)`` is called with the ids of new/modified CVs after every
+    committed batch. ``on_progress(stats)`` is called after every batch and
+    every ``batch_size`` files walked.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        folder: MonitoredFolder,
+        on_batch=None,
+        on_progress=None,
+        batch_size: int | None = None,
+        workers: int | None = None,
+    ):
+        self.db = db
+        self.folder = folder
+        self.on_batch = on_batch
+        self.on_progress = on_progress
+        self.batch_size = batch_size or settings.SCAN_BATCH_SIZE
+        self.workers = workers or settings.SCAN_HASH_WORKERS
+        self.stats = ScanStats()
+        self._inserts: list[dict] = []
+        self._updates: list[dict] = []
+        self._changed_ids: list[str] = []
+
+    def run(self) -> ScanStats:
+        existing = {
+            row.file_path: row
+            for row in self.db.query(
+                CVFile.id,
+                CVFile.file_path,
+                CVFile.file_hash,
+                CVFile.file_size_bytes,
+                CVFile.file_mtime_ns,
+                CVFile.file_inode,
+            ).filter(CVFile.folder_id == self.folder.id)
+        }
+        allowed_exts = set(settings.ALLOWED_EXTENSIONS)
+        # Bound in-flight hashes so a huge tree is never queued up in memory
+        max_in_flight = self.workers * 4
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            in_flight = {}
+            for entry in iter_cv_entries(self.folder.folder_path, allowed_exts):
+                self.stats.total_on_disk += 1
+                if self.on_progress and self.stats.total_on_disk % self.batch_size == 0:
+                    self.on_progress(self.stats)
+                try:
+                    fields = stat_fields(entry)
+                except OSError as e:
+                    self._skip_unreadable(entry.path, e)
+                    continue
+                row = existing.get(entry.path)
+                if row is not None and stat_unchanged(row, fields):
+                    self.stats.skipped += 1
+                    self.stats.stat_skipped += 1
+                    continue
+                future = pool.submit(compute_file_hash, entry.path)
+                in_flight[future] = (entry.path, fields, row)
+                if len(in_flight) >= max_in_flight:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        self._collect(future, *in_flight.pop(future))
+            for future in list(in_flight):
+                self._collect(future, *in_flight.pop(future))
+
+        self._flush()
+        return self.stats
+
+    def _skip_unreadable(self, file_path: str, error: OSError):
+        logger.warning(f"Skipping unreadable file {file_path}: {error}")
+        self.stats.errors += 1
+
+    def _collect(self, future, file_path: str, fields: dict, row):
+        try:
+            file_hash = future.result()
+        except OSError as e:
+            self._skip_unreadable(file_path, e)
+            return
+        self._record(file_hash, file_path, fields, row)
+
+    def _record(self, file_hash: str, file_path: str, fields: dict, row):
+        self.stats.hashed += 1
+        if row is None:
+            cv_id = uuid.uuid4()
+            self._inserts.append({
+                "id": cv_id,
+                "folder_id": self.folder.id,
+                "file_name": Path(file_path).name,
+                "file_path": file_path,
+                "file_hash": file_hash,
+                "status": "new",
+                **fields,
+            })
+            self._changed_ids.append(str(cv_id))
+            self.stats.new += 1
+        elif row.file_hash == file_hash:
+            # Same content with a new stat signature: only the signature is updated
+            self._updates.append({"id": row.id, **fields})
+            self.stats.skipped += 1
+        else:
+            self._updates.append({
+                "id": row.id,
+                "file_hash": file_hash,
+                "status": "modified",
+                "error_message": None,
+                **fields,
+            })
+            self._changed_ids.append(str(row.id))
+            self.stats.modified += 1
+        if len(self._inserts) + len(self._updates) >= self.batch_size:
+            self._flush()
+
+    def _flush(self):
+        if self._inserts:
+            self.db.execute(insert(CVFile), self._inserts)
+        if self._updates:
+            self.db.execute(update(CVFile), self._updates)
+        self.db.commit()
+        changed, self._changed_ids = self._changed_ids, []
+        self._inserts, self._updates = [], []
+        self.stats.new_cv_ids.extend(changed)
+        if changed and self.on_batch:
+            self.on_batch(changed)
+        if self.on_progress:
+            self.on_progress(self.stats)
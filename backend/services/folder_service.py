@@ -1,19 +1,28 @@
 import os
 import tempfile
+import uuid
 from datetime import datetime, timezone
 from pathlib import Path
 from uuid import UUID
 
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session
 
 from backend.config import settings
 from backend.models.cv_file import CVFile
 from backend.models.monitored_folder import MonitoredFolder
-from backend.utils.hashing import compute_file_hash, compute_hash_from_bytes
+from backend.services.candidate_matrix import on_cvs_deleted
+from backend.services.folder_scanner import FolderScanner, ScanStats
+from backend.services.leaderboard_cache import invalidate_all_leaderboards
+from backend.services.upload_stream import SpooledUpload
+from backend.utils.hashing import compute_hash_from_bytes
 
 
 UPLOAD_DIR = os.path.join(tempfile.gettempdir(), "cv_uploads")
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+# file_path prefix of uploads whose bytes were not kept (UPLOAD_KEEP_FILES off)
+UNRETAINED_UPLOAD_PREFIX = "upload://"
+# Hashes per IN (...) lookup, well under the drivers' bind-parameter limits
+HASH_LOOKUP_CHUNK = 1000
 
 
 def register_folder(
@@ -43,138 +52,156 @@ def register_folder(
 
 
 def add_uploaded_files(
-    db: Session, folder: MonitoredFolder, files: list[tuple[str, bytes]]
+    db: Session,
+    folder: MonitoredFolder,
+    files: list[tuple[str, bytes]],
+    contents: dict[str, bytes] | None = None,
 ) -> dict:
     """Add uploaded CV files to a folder collection.
 
     Args:
         files: list of (filename, file_bytes) tuples
+        contents: if given, filled with cv_file_id -> bytes for every new CV, so
+            the caller can hand the bytes straight to parsing
+
+    All files are hashed up front; duplicates within the upload and hashes
+    already in the folder are found with one ``IN (...)`` query, and the new
+    rows go in with a single bulk INSERT.
+
+    Files are copied to UPLOAD_DIR only when ``UPLOAD_KEEP_FILES`` is set;
+    otherwise a CV's file_path is a virtual ``upload://`` path, its content
+    must be passed to parsing and it cannot be re-parsed later.
     """
     allowed_exts = set(settings.ALLOWED_EXTENSIONS)
-    new_count = 0
-    skipped_count = 0
-    new_cv_ids = []
 
+    # Hash first, dropping duplicates within this upload
+    by_hash: dict[str, tuple[str, bytes]] = {}
+    skipped_count = 0
     for filename, content in files:
-        ext = Path(filename).suffix.lower()
-        if ext not in allowed_exts:
+        if Path(filename).suffix.lower() not in allowed_exts:
             continue
-
         file_hash = compute_hash_from_bytes(content)
-
-        # Check for duplicate by hash within this folder
-        existing = (
-            db.query(CVFile)
-            .filter(CVFile.folder_id == folder.id, CVFile.file_hash == file_hash)
-            .first()
-        )
-        if existing:
+        if file_hash in by_hash:
             skipped_count += 1
+        else:
+            by_hash[file_hash] = (filename, content)
+
+    existing = _existing_hashes(db, folder, list(by_hash))
+    skipped_count += len(existing)
+
+    rows = []
+    for file_hash, (filename, content) in by_hash.items():
+        if file_hash in existing:
             continue
+        ext = Path(filename).suffix.lower()
+        if settings.UPLOAD_KEEP_FILES:
+            # Keep a copy so the CV can be re-parsed later
+            os.makedirs(UPLOAD_DIR, exist_ok=True)
+            upload_path = os.path.join(UPLOAD_DIR, f"{file_hash}{ext}")
+            with open(upload_path, "wb") as f:
+                f.write(content)
+        else:
+            upload_path = f"{UNRETAINED_UPLOAD_PREFIX}{file_hash}{ext}"
+
+        row = _upload_row(folder, filename, upload_path, file_hash, len(content))
+        rows.append(row)
+        if contents is not None:
+            contents[str(row["id"])] = content
+
+    return _insert_uploads(db, folder, rows, len(files), skipped_count)
+
 
-        # Save file to temp upload dir for processing
-        upload_path = os.path.join(UPLOAD_DIR, f"{file_hash}{ext}")
-        with open(upload_path, "wb") as f:
-            f.write(content)
-
-        cv = CVFile(
-            folder_id=folder.id,
-            file_name=filename,
-            file_path=upload_path,
-            file_hash=file_hash,
-            file_size_bytes=len(content),
-            status="new",
+def add_spooled_files(
+    db: Session, folder: MonitoredFolder, uploads: list[SpooledUpload], total_uploaded: int
+) -> dict:
+    """Add CVs already streamed to UPLOAD_DIR by ``spool_multipart``.
+
+    Same dedup and result as ``add_uploaded_files``; ``total_uploaded`` counts
+    every file part, including those with a disallowed extension.
+    """
+    by_hash: dict[str, SpooledUpload] = {}
+    skipped_count = 0
+    for upload in uploads:
+        if upload.file_hash in by_hash:
+            skipped_count += 1
+        else:
+            by_hash[upload.file_hash] = upload
+
+    existing = _existing_hashes(db, folder, list(by_hash))
+    skipped_count += len(existing)
+    rows = [
+        _upload_row(folder, u.filename, u.file_path, u.file_hash, u.size)
+        for file_hash, u in by_hash.items()
+        if file_hash not in existing
+    ]
+    return _insert_uploads(db, folder, rows, total_uploaded, skipped_count)
+
+
+def _existing_hashes(db: Session, folder: MonitoredFolder, hashes: list[str]) -> set[str]:
+    """The subset of ``hashes`` already in the folder, in one IN (...) query per chunk."""
+    existing = set()
+    for i in range(0, len(hashes), HASH_LOOKUP_CHUNK):
+        existing.update(
+            db.scalars(
+                select(CVFile.file_hash).where(
+                    CVFile.folder_id == folder.id,
+                    CVFile.file_hash.in_(hashes[i : i + HASH_LOOKUP_CHUNK]),
+                )
+            )
         )
-        db.add(cv)
-        db.flush()
-        new_count += 1
-        new_cv_ids.append(cv.id)
+    return existing
+
 
+def _upload_row(
+    folder: MonitoredFolder, filename: str, file_path: str, file_hash: str, size: int
+) -> dict:
+    return {
+        "id": uuid.uuid4(),
+        "folder_id": folder.id,
+        "file_name": filename,
+        "file_path": file_path,
+        "file_hash": file_hash,
+        "file_size_bytes": size,
+        "status": "new",
+    }
+
+
+def _insert_uploads(
+    db: Session, folder: MonitoredFolder, rows: list[dict], total_uploaded: int, skipped: int
+) -> dict:
+    if rows:
+        db.execute(insert(CVFile), rows)
     folder.last_scanned_at = datetime.now(timezone.utc)
     db.commit()
 
     return {
-        "total_uploaded": len(files),
-        "new": new_count,
-        "skipped": skipped_count,
-        "new_cv_ids": [str(cid) for cid in new_cv_ids],
+        "total_uploaded": total_uploaded,
+        "new": len(rows),
+        "skipped": skipped,
+        "new_cv_ids": [str(row["id"]) for row in rows],
     }
 
 
-def scan_folder(db: Session, folder: MonitoredFolder) -> dict:
-    """Scan a local folder for CV files. Only works for local folder paths."""
+def scan_folder(db: Session, folder: MonitoredFolder, on_batch=None, on_progress=None) -> dict:
+    """Scan a local folder and its subfolders for CV files. Only works for local folder paths.
+
+    Files whose (size, mtime_ns, inode) match the last scan are skipped without
+    being read; only the rest are hashed. ``on_batch`` and ``on_progress`` are
+    passed to ``FolderScanner`` to stream results while the walk runs.
+    """
     folder_path = folder.folder_path
 
     # Cloud/virtual folders can't be scanned
     if folder_path.startswith("cloud://"):
-        return {
-            "total_on_disk": 0,
-            "new": 0,
-            "modified": 0,
-            "skipped": 0,
-            "new_cv_ids": [],
-        }
+        return ScanStats().as_result()
 
     if not os.path.isdir(folder_path):
         raise ValueError(f"Folder no longer exists: {folder_path}")
 
-    allowed_exts = set(settings.ALLOWED_EXTENSIONS)
-    disk_files = {}
-    for entry in os.scandir(folder_path):
-        if entry.is_file():
-            ext = Path(entry.name).suffix.lower()
-            if ext in allowed_exts:
-                disk_files[entry.path] = entry
-
-    existing_cvs = {
-        cv.file_path: cv
-        for cv in db.query(CVFile).filter(CVFile.folder_id == folder.id).all()
-    }
-
-    new_count = 0
-    modified_count = 0
-    skipped_count = 0
-    new_cv_ids = []
-
-    for file_path, entry in disk_files.items():
-        file_hash = compute_file_hash(file_path)
-        file_size = entry.stat().st_size
-
-        if file_path in existing_cvs:
-            cv = existing_cvs[file_path]
-            if cv.file_hash == file_hash:
-                skipped_count += 1
-            else:
-                cv.file_hash = file_hash
-                cv.file_size_bytes = file_size
-                cv.status = "modified"
-                cv.error_message = None
-                modified_count += 1
-                new_cv_ids.append(cv.id)
-        else:
-            cv = CVFile(
-                folder_id=folder.id,
-                file_name=Path(file_path).name,
-                file_path=file_path,
-                file_hash=file_hash,
-                file_size_bytes=file_size,
-                status="new",
-            )
-            db.add(cv)
-            db.flush()
-            new_count += 1
-            new_cv_ids.append(cv.id)
-
+    stats = FolderScanner(db, folder, on_batch=on_batch, on_progress=on_progress).run()
     folder.last_scanned_at = datetime.now(timezone.utc)
     db.commit()
-
-    return {
-        "total_on_disk": len(disk_files),
-        "new": new_count,
-        "modified": modified_count,
-        "skipped": skipped_count,
-        "new_cv_ids": [str(cid) for cid in new_cv_ids],
-    }
+    return stats.as_result()
 
 
 def get_folder_status(db: Session, folder: MonitoredFolder) -> dict:
@@ -215,6 +242,9 @@ def delete_folder(db: Session, folder_id: UUID, user_id: UUID) -> bool:
     folder = get_folder(db, folder_id, user_id)
     if not folder:
         return False
+    cv_ids = [str(cv_id) for (cv_id,) in db.query(CVFile.id).filter(CVFile.folder_id == folder.id)]
     db.delete(folder)
     db.commit()
+    on_cvs_deleted(user_id, cv_ids)
+    invalidate_all_leaderboards()
     return True
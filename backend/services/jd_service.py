@@ -4,6 +4,9 @@ from sqlalchemy.orm import Session
 
 from backend.models.job_description import JobDescription
 from backend.services.file_parser import extract_text_from_bytes
+from backend.services.leaderboard_cache import invalidate_leaderboard
+from backend.services.matcher import rescore_matches
+from backend.services.skill_index import index_jd_skills
 from backend.utils.llm_client import call_llm, is_llm_available
 
 JD_PARSE_SYSTEM_PROMPT = """You are a job description parser. Extract structured information from the given job description text.
@@ -24,13 +27,14 @@ For min_experience_years, extract the minimum years mentioned. If a range is giv
 """
 
 
-def parse_jd_with_llm(raw_text: str) -> dict:
+def parse_jd_with_llm(raw_text: str, use_cache: bool = True) -> dict:
     if not is_llm_available():
         return {}
     return call_llm(
         system_prompt=JD_PARSE_SYSTEM_PROMPT,
         user_prompt=raw_text,
         response_json=True,
+        use_cache=use_cache,
     )
 
 
@@ -52,6 +56,7 @@ def create_jd_from_text(
         scoring_weights=scoring_weights,
     )
     db.add(jd)
+    index_jd_skills(db, jd)
     db.commit()
     db.refresh(jd)
     return jd
@@ -96,7 +101,9 @@ def update_jd_weights(
     if abs(total - 1.0) > 0.01:
         raise ValueError(f"Weights must sum to 1.0, got {total}")
     jd.scoring_weights = weights
+    rescore_matches(db, jd.id, weights)
     db.commit()
+    invalidate_leaderboard(jd.id)
     db.refresh(jd)
     return jd
 
@@ -107,4 +114,5 @@ def delete_jd(db: Session, jd_id: UUID, user_id: UUID) -> bool:
         return False
     jd.is_active = False
     db.commit()
+    invalidate_leaderboard(jd.id)
     return True
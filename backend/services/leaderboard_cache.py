@@ -0,0 +1,123 @@
+"""Versioned, in-process leaderboard snapshots per JD.
+
+Every write that can change a JD's leaderboard (match upserts, weight changes,
+CV deletions) bumps that JD's version. Readers get the cached snapshot while
+its version is current and rebuild it from the join otherwise. The version
+doubles as an ETag, so an unchanged leaderboard costs one dict lookup.
+
+While a match batch for a JD is running, writes keep bumping the version but
+readers keep getting the last snapshot, rebuilt at most every
+``LEADERBOARD_BATCH_REFRESH_SECONDS``, instead of re-running the join on every
+poll.
+"""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from backend.config import settings
+
+# Distinguishes ETags across restarts, since versions live in memory
+_EPOCH = uuid.uuid4().hex[:8]
+
+
+@dataclass
+class _Snapshot:
+    version: int
+    entries: list[dict]
+    built_at: float
+
+
+_lock = threading.Lock()
+_versions: dict[UUID, int] = {}
+_snapshots: "OrderedDict[UUID, _Snapshot]" = OrderedDict()
+_running_batches: dict[UUID, int] = {}
+
+
+def _etag(jd_id: UUID, version: int) -> str:
+    return f'"{_EPOCH}-{jd_id.hex}-{version}"'
+
+
+def invalidate_leaderboard(*jd_ids: UUID):
+    with _lock:
+        for jd_id in jd_ids:
+            _versions[jd_id] = _versions.get(jd_id, 0) + 1
+
+
+def invalidate_all_leaderboards():
+    with _lock:
+        # Every JD that has been served has an entry here (see get_cached_leaderboard)
+        for jd_id in _versions:
+            _versions[jd_id] += 1
+
+
+@contextmanager
+def leaderboard_batch(jd_ids):
+    """Serve snapshots for these JDs while a batch writes to them; invalidate at the end."""
+    jd_ids = list(jd_ids)
+    with _lock:
+        for jd_id in jd_ids:
+            _running_batches[jd_id] = _running_batches.get(jd_id, 0) + 1
+    try:
+        yield
+    finally:
+        with _lock:
+            for jd_id in jd_ids:
+                remaining = _running_batches.get(jd_id, 0) - 1
+                if remaining > 0:
+                    _running_batches[jd_id] = remaining
+                else:
+                    _running_batches.pop(jd_id, None)
+                _versions[jd_id] = _versions.get(jd_id, 0) + 1
+
+
+def leaderboard_etag(jd_id: UUID) -> str | None:
+    """ETag of the snapshot a reader would be served right now, if it is cached."""
+    with _lock:
+        snapshot = _snapshots.get(jd_id)
+        if snapshot is None or not _is_servable(jd_id, snapshot):
+            return None
+        return _etag(jd_id, snapshot.version)
+
+
+def _is_servable(jd_id: UUID, snapshot: _Snapshot) -> bool:
+    if snapshot.version == _versions.get(jd_id, 0):
+        return True
+    if jd_id in _running_batches:
+        age = time.monotonic() - snapshot.built_at
+        return age < settings.LEADERBOARD_BATCH_REFRESH_SECONDS
+    return False
+
+
+def get_cached_leaderboard(db: Session, jd_id: UUID) -> tuple[list[dict], str]:
+    """Return (entries, etag) for the JD's leaderboard, rebuilding the snapshot if stale.
+
+    The entries are shared between readers and must not be mutated.
+    """
+    with _lock:
+        snapshot = _snapshots.get(jd_id)
+        if snapshot is not None and _is_servable(jd_id, snapshot):
+            _snapshots.move_to_end(jd_id)
+            return snapshot.entries, _etag(jd_id, snapshot.version)
+        version = _versions.get(jd_id, 0)
+
+    from backend.services.matcher import get_leaderboard
+
+    entries = get_leaderboard(db, jd_id)
+    snapshot = _Snapshot(version=version, entries=entries, built_at=time.monotonic())
+    with _lock:
+        _versions.setdefault(jd_id, version)
+        current = _snapshots.get(jd_id)
+        # A concurrent reader may have stored a newer build already
+        if current is None or current.version <= version:
+            _snapshots[jd_id] = snapshot
+            _snapshots.move_to_end(jd_id)
+            while len(_snapshots) > settings.LEADERBOARD_CACHE_MAX_JDS:
+                _snapshots.popitem(last=False)
+    return entries, _etag(jd_id, version)
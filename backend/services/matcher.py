@@ -1,6 +1,14 @@
-from datetime import datetime, timezone
+import base64
+import hashlib
+import json
+import logging
+import uuid
+from dataclasses import dataclass, field
+from typing import ClassVar
 from uuid import UUID
 
+from sqlalchemy import Float, Numeric, and_, case, cast, func, or_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
 from backend.config import settings
@@ -8,7 +16,14 @@ from backend.models.cv_file import CVFile
 from backend.models.job_description import JobDescription
 from backend.models.match_result import MatchResult
 from backend.models.parsed_cv import ParsedCV
-from backend.utils.llm_client import call_llm, is_llm_available
+from backend.services.leaderboard_cache import invalidate_leaderboard
+from backend.utils.llm_client import acall_llm, call_llm, is_llm_available
+from backend.utils.rate_limiter import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the match prompts change in a way that should invalidate stored results
+MATCH_PROMPT_VERSION = "1"
 
 MATCH_SYSTEM_PROMPT = """You are an ATS (Applicant Tracking System) matching engine. Compare a candidate's CV against a Job Description and evaluate fit.
 
@@ -43,6 +58,40 @@ Be fair and objective. Provide actionable, specific feedback in strengths and ga
 """
 
 
+MATCH_BATCH_SYSTEM_PROMPT = """You are an ATS (Applicant Tracking System) matching engine. Compare several candidates' CVs against one Job Description and evaluate each candidate's fit independently.
+
+You will receive a JSON with two keys: "job_description" and "candidates". Each candidate has a "cv_file_id".
+
+Return a JSON object with a single key "results": a list with exactly one entry per candidate, in the same order:
+{
+  "results": [
+    {
+      "cv_file_id": "the candidate's cv_file_id, copied exactly",
+      "skills_score": 75,
+      "experience_score": 60,
+      "projects_score": 50,
+      "keywords_score": 80,
+      "matched_skills": ["Python", "SQL"],
+      "missing_skills": ["Kubernetes"],
+      "strengths": ["Strong Python experience with 5+ years"],
+      "gaps": ["Missing required DevOps skills (Kubernetes)"],
+      "explanation": "One or two sentences summarising the fit."
+    }
+  ]
+}
+
+Scoring guidelines (each score is 0-100):
+- skills_score: % of required skills the candidate has. Include partial matches for related skills.
+- experience_score: How well the candidate's years and type of experience match. 100 if meets/exceeds requirements.
+- projects_score: How relevant the candidate's projects are to the role's responsibilities.
+- keywords_score: Overlap of technical tools, technologies, and domain keywords.
+
+Score every candidate on their own merits; do not rank them against each other. Keep strengths and gaps to at most 3 short items each.
+"""
+
+SCORE_FIELDS = ("skills_score", "experience_score", "projects_score", "keywords_score")
+
+
 def get_weights(jd: JobDescription) -> dict:
     if jd.scoring_weights:
         return jd.scoring_weights
@@ -54,28 +103,54 @@ def get_weights(jd: JobDescription) -> dict:
     }
 
 
+FIT_GREEN_MIN = 70
+FIT_YELLOW_MIN = 45
+
+
 def compute_fit_status(score: float) -> str:
-    if score >= 70:
+    if score >= FIT_GREEN_MIN:
         return "green"
-    elif score >= 45:
+    elif score >= FIT_YELLOW_MIN:
         return "yellow"
     return "red"
 
 
-def match_cv_to_jd(db: Session, cv_file_id: UUID, jd_id: UUID) -> MatchResult:
-    cv = db.query(CVFile).filter(CVFile.id == cv_file_id).first()
-    if not cv:
-        raise ValueError(f"CV file not found: {cv_file_id}")
+def overall_score_expr(weights: dict):
+    """SQL twin of the overall score computed in save_match_result."""
+    weighted = (
+        MatchResult.skills_score * weights.get("skills", 0.4)
+        + MatchResult.experience_score * weights.get("experience", 0.3)
+        + MatchResult.projects_score * weights.get("projects", 0.2)
+        + MatchResult.keywords_score * weights.get("keywords", 0.1)
+    )
+    return cast(func.round(cast(weighted, Numeric), 2), Float)
 
-    parsed_cv = db.query(ParsedCV).filter(ParsedCV.cv_file_id == cv_file_id).first()
-    if not parsed_cv:
-        raise ValueError(f"CV not parsed yet: {cv_file_id}")
 
-    jd = db.query(JobDescription).filter(JobDescription.id == jd_id).first()
-    if not jd:
-        raise ValueError(f"Job description not found: {jd_id}")
+def fit_status_expr(score):
+    return case(
+        (score >= FIT_GREEN_MIN, "green"),
+        (score >= FIT_YELLOW_MIN, "yellow"),
+        else_="red",
+    )
 
-    jd_data = {
+
+def rescore_matches(db: Session, jd_id: UUID, weights: dict) -> int:
+    """Recompute overall_score/fit_status for every match of a JD from the stored sub-scores.
+
+    One UPDATE, no LLM calls. The caller commits. Returns the number of rows updated.
+    """
+    score = overall_score_expr(weights)
+    result = db.execute(
+        update(MatchResult)
+        .where(MatchResult.jd_id == jd_id)
+        .values(overall_score=score, fit_status=fit_status_expr(score), weights_used=weights)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+def build_jd_payload(jd: JobDescription) -> dict:
+    return {
         "title": jd.title,
         "required_skills": jd.required_skills or [],
         "preferred_skills": jd.preferred_skills or [],
@@ -84,7 +159,10 @@ def match_cv_to_jd(db: Session, cv_file_id: UUID, jd_id: UUID) -> MatchResult:
         "key_responsibilities": jd.key_responsibilities or [],
         "keywords": jd.keywords or [],
     }
-    cv_data = {
+
+
+def build_cv_payload(parsed_cv: ParsedCV) -> dict:
+    return {
         "candidate_name": parsed_cv.candidate_name,
         "total_experience_years": parsed_cv.total_experience_years,
         "skills": parsed_cv.skills or [],
@@ -96,29 +174,102 @@ def match_cv_to_jd(db: Session, cv_file_id: UUID, jd_id: UUID) -> MatchResult:
         "summary": parsed_cv.summary,
     }
 
-    import json
 
-    if not is_llm_available():
-        result = {
-            "skills_score": 0,
-            "experience_score": 0,
-            "projects_score": 0,
-            "keywords_score": 0,
-            "matched_skills": [],
-            "missing_skills": [],
-            "strengths": [],
-            "gaps": ["LLM not configured - unable to perform AI matching"],
-            "explanation": "Groq API not configured. Set GROQ_API_KEY in .env to enable AI matching.",
-        }
-    else:
-        match_input = json.dumps({"job_description": jd_data, "candidate_cv": cv_data})
-        result = call_llm(
-            system_prompt=MATCH_SYSTEM_PROMPT,
-            user_prompt=match_input,
-            response_json=True,
+def compact_cv_payload(parsed_cv: ParsedCV) -> dict:
+    """Condensed CV payload for multi-candidate prompts: lists of short strings only."""
+    experience = [
+        " ".join(
+            part
+            for part in (
+                e.get("title") or "",
+                f"@ {e['company']}" if e.get("company") else "",
+                f"({e['duration']})" if e.get("duration") else "",
+            )
+            if part
         )
+        for e in (parsed_cv.experience or [])
+        if isinstance(e, dict)
+    ]
+    projects = [
+        f"{p.get('name') or 'Project'}: {', '.join(p.get('technologies') or [])}".rstrip(": ")
+        for p in (parsed_cv.projects or [])
+        if isinstance(p, dict)
+    ]
+    education = [
+        " ".join(str(e.get(k)) for k in ("degree", "field", "institution") if e.get(k))
+        for e in (parsed_cv.education or [])
+        if isinstance(e, dict)
+    ]
+    summary = parsed_cv.summary or ""
+    return {
+        "total_experience_years": parsed_cv.total_experience_years,
+        "skills": parsed_cv.skills or [],
+        "tools": parsed_cv.tools or [],
+        "certifications": parsed_cv.certifications or [],
+        "experience": experience,
+        "projects": projects,
+        "education": education,
+        "summary": summary[:300],
+    }
+
+
+NO_LLM_MATCH_RESULT = {
+    "skills_score": 0,
+    "experience_score": 0,
+    "projects_score": 0,
+    "keywords_score": 0,
+    "matched_skills": [],
+    "missing_skills": [],
+    "strengths": [],
+    "gaps": ["LLM not configured - unable to perform AI matching"],
+    "explanation": "Groq API not configured. Set GROQ_API_KEY in .env to enable AI matching.",
+}
+
+
+def _load_match_inputs(
+    db: Session, cv_file_id: UUID, jd_id: UUID
+) -> tuple[dict, dict, dict]:
+    cv = db.query(CVFile).filter(CVFile.id == cv_file_id).first()
+    if not cv:
+        raise ValueError(f"CV file not found: {cv_file_id}")
+
+    parsed_cv = db.query(ParsedCV).filter(ParsedCV.cv_file_id == cv_file_id).first()
+    if not parsed_cv:
+        raise ValueError(f"CV not parsed yet: {cv_file_id}")
+
+    jd = db.query(JobDescription).filter(JobDescription.id == jd_id).first()
+    if not jd:
+        raise ValueError(f"Job description not found: {jd_id}")
+
+    return build_jd_payload(jd), build_cv_payload(parsed_cv), get_weights(jd)
+
+
+def match_prompt(jd_data: dict, cv_data: dict) -> str:
+    return json.dumps({"job_description": jd_data, "candidate_cv": cv_data})
 
-    weights = get_weights(jd)
+
+def content_hash(data: dict) -> str:
+    return hashlib.sha256(json.dumps(data, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def match_fingerprint(jd_data: dict, cv_data: dict, model: str | None = None) -> str:
+    """Fingerprint of everything a match result is derived from, weights excluded.
+
+    Weights only affect overall_score, which is recomputed without the LLM.
+    """
+    parts = [
+        content_hash(cv_data),
+        content_hash(jd_data),
+        model or settings.GROQ_MODEL,
+        MATCH_PROMPT_VERSION,
+    ]
+    return hashlib.sha256(":".join(parts).encode()).hexdigest()
+
+
+def match_row(
+    cv_file_id: UUID, jd_id: UUID, weights: dict, result: dict, fingerprint: str | None = None
+) -> dict:
+    """Column values for one match_results row built from an LLM result."""
     overall_score = (
         result.get("skills_score", 0) * weights.get("skills", 0.4)
         + result.get("experience_score", 0) * weights.get("experience", 0.3)
@@ -126,80 +277,456 @@ def match_cv_to_jd(db: Session, cv_file_id: UUID, jd_id: UUID) -> MatchResult:
         + result.get("keywords_score", 0) * weights.get("keywords", 0.1)
     )
     overall_score = round(overall_score, 2)
-    fit_status = compute_fit_status(overall_score)
+    return {
+        "id": uuid.uuid4(),
+        "cv_file_id": cv_file_id,
+        "jd_id": jd_id,
+        "overall_score": overall_score,
+        "skills_score": result.get("skills_score", 0),
+        "experience_score": result.get("experience_score", 0),
+        "projects_score": result.get("projects_score", 0),
+        "keywords_score": result.get("keywords_score", 0),
+        "fit_status": compute_fit_status(overall_score),
+        "matched_skills": result.get("matched_skills"),
+        "missing_skills": result.get("missing_skills"),
+        "strengths": result.get("strengths"),
+        "gaps": result.get("gaps"),
+        "explanation": result.get("explanation"),
+        "weights_used": weights,
+        "match_model": settings.GROQ_MODEL,
+        "input_fingerprint": fingerprint,
+    }
 
-    existing = (
-        db.query(MatchResult)
-        .filter(MatchResult.cv_file_id == cv_file_id, MatchResult.jd_id == jd_id)
-        .first()
+
+def _upsert_match_rows(rows: list[dict]):
+    stmt = pg_insert(MatchResult).values(rows)
+    keep = {"id", "cv_file_id", "jd_id"}
+    return stmt.on_conflict_do_update(
+        index_elements=[MatchResult.cv_file_id, MatchResult.jd_id],
+        set_={key: stmt.excluded[key] for key in rows[0] if key not in keep},
     )
 
-    if existing:
-        existing.overall_score = overall_score
-        existing.skills_score = result.get("skills_score", 0)
-        existing.experience_score = result.get("experience_score", 0)
-        existing.projects_score = result.get("projects_score", 0)
-        existing.keywords_score = result.get("keywords_score", 0)
-        existing.fit_status = fit_status
-        existing.matched_skills = result.get("matched_skills")
-        existing.missing_skills = result.get("missing_skills")
-        existing.strengths = result.get("strengths")
-        existing.gaps = result.get("gaps")
-        existing.explanation = result.get("explanation")
-        existing.weights_used = weights
-        existing.match_model = settings.GROQ_MODEL
-        match_result = existing
-    else:
-        match_result = MatchResult(
-            cv_file_id=cv_file_id,
-            jd_id=jd_id,
-            overall_score=overall_score,
-            skills_score=result.get("skills_score", 0),
-            experience_score=result.get("experience_score", 0),
-            projects_score=result.get("projects_score", 0),
-            keywords_score=result.get("keywords_score", 0),
-            fit_status=fit_status,
-            matched_skills=result.get("matched_skills"),
-            missing_skills=result.get("missing_skills"),
-            strengths=result.get("strengths"),
-            gaps=result.get("gaps"),
-            explanation=result.get("explanation"),
-            weights_used=weights,
-            match_model=settings.GROQ_MODEL,
-        )
-        db.add(match_result)
 
+def save_match_result(
+    db: Session,
+    cv_file_id: UUID,
+    jd_id: UUID,
+    weights: dict,
+    result: dict,
+    fingerprint: str | None = None,
+) -> MatchResult:
+    row = match_row(cv_file_id, jd_id, weights, result, fingerprint)
+    match_result = db.scalars(
+        _upsert_match_rows([row]).returning(MatchResult),
+        execution_options={"populate_existing": True},
+    ).one()
     db.commit()
-    db.refresh(match_result)
+    invalidate_leaderboard(jd_id)
     return match_result
 
 
-def get_leaderboard(db: Session, jd_id: UUID) -> list[dict]:
-    results = (
-        db.query(MatchResult, ParsedCV)
+def match_cv_to_jd(
+    db: Session, cv_file_id: UUID, jd_id: UUID, use_cache: bool = True
+) -> MatchResult:
+    jd_data, cv_data, weights = _load_match_inputs(db, cv_file_id, jd_id)
+
+    fingerprint = None
+    if not is_llm_available():
+        result = NO_LLM_MATCH_RESULT
+    else:
+        result = call_llm(
+            system_prompt=MATCH_SYSTEM_PROMPT,
+            user_prompt=match_prompt(jd_data, cv_data),
+            response_json=True,
+            use_cache=use_cache,
+        )
+        fingerprint = match_fingerprint(jd_data, cv_data)
+
+    return save_match_result(db, cv_file_id, jd_id, weights, result, fingerprint)
+
+
+@dataclass
+class MatchBatchPlan:
+    """Inputs for a batch of CVs against one JD, grouped into LLM calls.
+
+    Group entries are (cv_file_id, cv payload). The scoring and writing helpers
+    below only rely on ``system_prompt``, ``id_key``, ``jd_ids`` and the prompt/row methods,
+    so other plan shapes (e.g. one CV against many JDs) can reuse them.
+    """
+
+    system_prompt: ClassVar[str] = MATCH_BATCH_SYSTEM_PROMPT
+    id_key: ClassVar[str] = "cv_file_id"
+
+    jd_id: UUID
+    jd_data: dict
+    weights: dict
+    groups: list[list[tuple[str, dict]]] = field(default_factory=list)
+    errors: dict[str, str] = field(default_factory=dict)
+    fingerprints: dict[str, str] = field(default_factory=dict)
+    skipped: list[str] = field(default_factory=list)
+
+    def batch_prompt(self, group: list[tuple[str, dict]]) -> str:
+        return json.dumps({
+            "job_description": self.jd_data,
+            "candidates": [{"cv_file_id": cv_id, **payload} for cv_id, payload in group],
+        })
+
+    def single_prompt(self, cv_id: str, payload: dict) -> str:
+        return match_prompt(self.jd_data, payload)
+
+    def row(self, cv_id: str, result: dict) -> dict:
+        return match_row(
+            UUID(cv_id), self.jd_id, self.weights, result, self.fingerprints.get(cv_id)
+        )
+
+    @property
+    def jd_ids(self) -> list[UUID]:
+        return [self.jd_id]
+
+
+def plan_match_groups(
+    items: list[tuple[str, dict]],
+    shared_data: dict,
+    system_prompt: str = MATCH_BATCH_SYSTEM_PROMPT,
+) -> list[list[tuple[str, dict]]]:
+    """Pack items into groups whose prompt + expected reply fit the token budget.
+
+    ``shared_data`` is the payload sent once per call (the JD for CV batches).
+    """
+    fixed = estimate_tokens(system_prompt) + estimate_tokens(json.dumps(shared_data))
+    budget = max(settings.MATCH_BATCH_TOKEN_BUDGET - fixed, 0)
+
+    groups: list[list[tuple[str, dict]]] = []
+    current: list[tuple[str, dict]] = []
+    used = 0
+    for item_id, payload in items:
+        cost = estimate_tokens(json.dumps(payload)) + settings.MATCH_BATCH_COMPLETION_TOKENS_PER_CV
+        if current and (used + cost > budget or len(current) >= settings.MATCH_BATCH_MAX_SIZE):
+            groups.append(current)
+            current, used = [], 0
+        current.append((item_id, payload))
+        used += cost
+    if current:
+        groups.append(current)
+    return groups
+
+
+def prepare_match_batch(
+    db: Session, cv_file_ids: list[str], jd_id: UUID, force: bool = False
+) -> MatchBatchPlan:
+    """Load inputs and group CVs into LLM calls.
+
+    CVs whose stored match was computed from identical inputs are skipped unless
+    ``force`` is set.
+    """
+    jd = db.query(JobDescription).filter(JobDescription.id == jd_id).first()
+    if not jd:
+        raise ValueError(f"Job description not found: {jd_id}")
+
+    plan = MatchBatchPlan(jd_id=jd_id, jd_data=build_jd_payload(jd), weights=get_weights(jd))
+    parsed_by_id = {
+        str(p.cv_file_id): p
+        for p in db.query(ParsedCV).filter(
+            ParsedCV.cv_file_id.in_([UUID(cid) for cid in cv_file_ids])
+        )
+    }
+
+    llm_available = is_llm_available()
+    stored = {}
+    if llm_available and not force:
+        stored = {
+            str(cv_id): fingerprint
+            for cv_id, fingerprint in db.query(
+                MatchResult.cv_file_id, MatchResult.input_fingerprint
+            ).filter(
+                MatchResult.jd_id == jd_id,
+                MatchResult.cv_file_id.in_([UUID(cid) for cid in parsed_by_id]),
+            )
+        }
+
+    batched = settings.MATCH_BATCH_MODE and llm_available
+    candidates = []
+    for cv_id in cv_file_ids:
+        parsed_cv = parsed_by_id.get(cv_id)
+        if parsed_cv is None:
+            plan.errors[cv_id] = f"CV not parsed yet: {cv_id}"
+            continue
+        if llm_available:
+            # Placeholder results (no LLM) get no fingerprint so they are redone later
+            fingerprint = match_fingerprint(plan.jd_data, build_cv_payload(parsed_cv))
+            if stored.get(cv_id) == fingerprint:
+                plan.skipped.append(cv_id)
+                continue
+            plan.fingerprints[cv_id] = fingerprint
+        payload = compact_cv_payload(parsed_cv) if batched else build_cv_payload(parsed_cv)
+        candidates.append((cv_id, payload))
+
+    if batched:
+        plan.groups = plan_match_groups(candidates, plan.jd_data)
+    else:
+        plan.groups = [[candidate] for candidate in candidates]
+    return plan
+
+
+class MatchResultWriter:
+    """Buffers batch match results and upserts them in chunks, one round trip each."""
+
+    def __init__(self, db: Session, plan, chunk_size: int | None = None):
+        self.db = db
+        self.plan = plan
+        self.chunk_size = chunk_size or settings.MATCH_WRITE_CHUNK_SIZE
+        self._rows: dict[str, dict] = {}
+        self.written = 0
+
+    def add(self, results: dict[str, dict]):
+        for item_id, result in results.items():
+            # Keyed by item so a duplicate pair in one chunk can't hit ON CONFLICT twice
+            self._rows[item_id] = self.plan.row(item_id, result)
+        if len(self._rows) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        if not self._rows:
+            return
+        rows = list(self._rows.values())
+        self._rows = {}
+        for i in range(0, len(rows), self.chunk_size):
+            self.db.execute(_upsert_match_rows(rows[i : i + self.chunk_size]))
+        self.db.commit()
+        invalidate_leaderboard(*{row["jd_id"] for row in rows})
+        self.written += len(rows)
+
+
+def _is_valid_match_result(result) -> bool:
+    if not isinstance(result, dict):
+        return False
+    for key in SCORE_FIELDS:
+        value = result.get(key)
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return False
+        if not 0 <= value <= 100:
+            return False
+    return True
+
+
+def validate_batch_reply(
+    reply, group: list[tuple[str, dict]], id_key: str = "cv_file_id"
+) -> dict[str, dict]:
+    """Return the valid per-item results of a group reply, keyed by ``id_key``."""
+    expected = {item_id for item_id, _ in group}
+    items = reply.get("results") if isinstance(reply, dict) else None
+    if not isinstance(items, list):
+        return {}
+    valid = {}
+    for item in items:
+        if not _is_valid_match_result(item):
+            continue
+        item_id = str(item.get(id_key))
+        if item_id in expected and item_id not in valid:
+            valid[item_id] = item
+    return valid
+
+
+def _group_completion_tokens(group: list[tuple[str, dict]]) -> int:
+    return settings.MATCH_BATCH_COMPLETION_TOKENS_PER_CV * len(group)
+
+
+def score_match_group(
+    plan, group: list[tuple[str, dict]], use_cache: bool = True
+) -> tuple[dict[str, dict], dict[str, str]]:
+    """Score a group with one completion, falling back to per-item calls for bad entries."""
+    if not is_llm_available():
+        return {item_id: NO_LLM_MATCH_RESULT for item_id, _ in group}, {}
+
+    results: dict[str, dict] = {}
+    if len(group) > 1:
+        try:
+            reply = call_llm(
+                system_prompt=plan.system_prompt,
+                user_prompt=plan.batch_prompt(group),
+                response_json=True,
+                use_cache=use_cache,
+                completion_tokens=_group_completion_tokens(group),
+            )
+            results = validate_batch_reply(reply, group, plan.id_key)
+        except Exception as e:
+            logger.warning(f"Group match of {len(group)} items failed, falling back: {e}")
+
+    errors: dict[str, str] = {}
+    for item_id, payload in group:
+        if item_id in results:
+            continue
+        try:
+            result = call_llm(
+                system_prompt=MATCH_SYSTEM_PROMPT,
+                user_prompt=plan.single_prompt(item_id, payload),
+                response_json=True,
+                use_cache=use_cache,
+            )
+            if not isinstance(result, dict):
+                raise ValueError("LLM returned an invalid match result")
+            results[item_id] = result
+        except Exception as e:
+            logger.error(f"Failed to match {plan.id_key} {item_id}: {e}")
+            errors[item_id] = str(e)
+    return results, errors
+
+
+async def ascore_match_group(
+    plan, group: list[tuple[str, dict]], use_cache: bool = True
+) -> tuple[dict[str, dict], dict[str, str]]:
+    """Async variant of score_match_group."""
+    if not is_llm_available():
+        return {item_id: NO_LLM_MATCH_RESULT for item_id, _ in group}, {}
+
+    results: dict[str, dict] = {}
+    if len(group) > 1:
+        try:
+            reply = await acall_llm(
+                system_prompt=plan.system_prompt,
+                user_prompt=plan.batch_prompt(group),
+                response_json=True,
+                use_cache=use_cache,
+                completion_tokens=_group_completion_tokens(group),
+            )
+            results = validate_batch_reply(reply, group, plan.id_key)
+        except Exception as e:
+            logger.warning(f"Group match of {len(group)} items failed, falling back: {e}")
+
+    errors: dict[str, str] = {}
+    for item_id, payload in group:
+        if item_id in results:
+            continue
+        try:
+            result = await acall_llm(
+                system_prompt=MATCH_SYSTEM_PROMPT,
+                user_prompt=plan.single_prompt(item_id, payload),
+                response_json=True,
+                use_cache=use_cache,
+            )
+            if not isinstance(result, dict):
+                raise ValueError("LLM returned an invalid match result")
+            results[item_id] = result
+        except Exception as e:
+            logger.error(f"Failed to match {plan.id_key} {item_id}: {e}")
+            errors[item_id] = str(e)
+    return results, errors
+
+
+_LEADERBOARD_COLUMNS = (
+    MatchResult.id,
+    MatchResult.cv_file_id,
+    MatchResult.skills_score,
+    MatchResult.experience_score,
+    MatchResult.projects_score,
+    MatchResult.keywords_score,
+    MatchResult.matched_skills,
+    MatchResult.missing_skills,
+)
+_LEADERBOARD_DETAIL_COLUMNS = (MatchResult.strengths, MatchResult.gaps, MatchResult.explanation)
+
+
+def _leaderboard_query(db: Session, jd_id: UUID, score, detail: bool):
+    """Leaderboard rows as plain columns; never loads ParsedCV beyond the name."""
+    columns = _LEADERBOARD_COLUMNS + (_LEADERBOARD_DETAIL_COLUMNS if detail else ())
+    return (
+        db.query(*columns, ParsedCV.candidate_name, score.label("score"))
         .join(ParsedCV, MatchResult.cv_file_id == ParsedCV.cv_file_id)
         .filter(MatchResult.jd_id == jd_id)
-        .order_by(MatchResult.overall_score.desc())
-        .all()
     )
 
-    leaderboard = []
-    for rank, (match, parsed) in enumerate(results, 1):
-        leaderboard.append({
-            "rank": rank,
-            "match_id": str(match.id),
-            "cv_file_id": str(match.cv_file_id),
-            "candidate_name": parsed.candidate_name or "Unknown",
-            "overall_score": match.overall_score,
-            "skills_score": match.skills_score,
-            "experience_score": match.experience_score,
-            "projects_score": match.projects_score,
-            "keywords_score": match.keywords_score,
-            "fit_status": match.fit_status,
-            "matched_skills": match.matched_skills or [],
-            "missing_skills": match.missing_skills or [],
-            "strengths": match.strengths or [],
-            "gaps": match.gaps or [],
-            "explanation": match.explanation,
-        })
-    return leaderboard
+
+def _leaderboard_entry(rank: int, row, detail: bool) -> dict:
+    entry = {
+        "rank": rank,
+        "match_id": str(row.id),
+        "cv_file_id": str(row.cv_file_id),
+        "candidate_name": row.candidate_name or "Unknown",
+        "overall_score": row.score,
+        "skills_score": row.skills_score,
+        "experience_score": row.experience_score,
+        "projects_score": row.projects_score,
+        "keywords_score": row.keywords_score,
+        "fit_status": compute_fit_status(row.score),
+        "matched_skills": row.matched_skills or [],
+        "missing_skills": row.missing_skills or [],
+    }
+    if detail:
+        entry["strengths"] = row.strengths or []
+        entry["gaps"] = row.gaps or []
+        entry["explanation"] = row.explanation
+    return entry
+
+
+def get_leaderboard(db: Session, jd_id: UUID, weights: dict | None = None) -> list[dict]:
+    """Ranked matches for a JD, with full detail.
+
+    With ``weights`` the scores are recomputed on the fly (what-if preview) and
+    nothing is persisted.
+    """
+    score = overall_score_expr(weights) if weights else MatchResult.overall_score
+    rows = _leaderboard_query(db, jd_id, score, detail=True).order_by(
+        score.desc(), MatchResult.id
+    )
+    return [_leaderboard_entry(rank, row, detail=True) for rank, row in enumerate(rows, 1)]
+
+
+def encode_leaderboard_cursor(score: float, match_id: UUID | str, rank: int) -> str:
+    raw = json.dumps([score, str(match_id), rank]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_leaderboard_cursor(cursor: str) -> tuple[float, UUID, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        score, match_id, rank = json.loads(raw)
+        return float(score), UUID(match_id), int(rank)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid leaderboard cursor") from e
+
+
+def get_leaderboard_page(
+    db: Session,
+    jd_id: UUID,
+    limit: int = 50,
+    cursor: str | None = None,
+    fit_status: str | None = None,
+    min_score: float | None = None,
+    skills: list[str] | None = None,
+    detail: bool = False,
+) -> dict:
+    """One page of the leaderboard, keyset-paginated on (overall_score DESC, id).
+
+    Uses the (jd_id, overall_score DESC, id) index, so every page costs the same
+    regardless of depth. ``skills`` keeps only candidates that have all of them.
+    """
+    from backend.services.skill_index import cvs_with_all_skills
+
+    query = _leaderboard_query(db, jd_id, MatchResult.overall_score, detail)
+    if fit_status:
+        query = query.filter(MatchResult.fit_status == fit_status)
+    if min_score is not None:
+        query = query.filter(MatchResult.overall_score >= min_score)
+    if skills:
+        matching = cvs_with_all_skills(db, skills)
+        if matching is None:
+            return {"entries": [], "next_cursor": None}
+        query = query.filter(MatchResult.cv_file_id.in_(matching))
+
+    rank = 0
+    if cursor:
+        last_score, last_id, rank = decode_leaderboard_cursor(cursor)
+        query = query.filter(
+            or_(
+                MatchResult.overall_score < last_score,
+                and_(MatchResult.overall_score == last_score, MatchResult.id > last_id),
+            )
+        )
+
+    rows = query.order_by(MatchResult.overall_score.desc(), MatchResult.id).limit(limit + 1).all()
+    entries = [_leaderboard_entry(rank + i, row, detail) for i, row in enumerate(rows[:limit], 1)]
+    next_cursor = None
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        next_cursor = encode_leaderboard_cursor(last.score, last.id, rank + limit)
+    return {"entries": entries, "next_cursor": next_cursor}
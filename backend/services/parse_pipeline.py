@@ -0,0 +1,300 @@
+"""Staged CV parse pipeline: text extraction -> LLM -> DB writes.
+
+Text extraction (pdfplumber/python-docx) is CPU-bound and holds the GIL, so it
+runs in a process pool sized to the cores. Extracted texts go through a bounded
+queue to the LLM stage, and parse results through a second queue to a single
+writer that owns the session. A batch then takes about as long as its slowest
+stage rather than the sum of them. When the LLM stage falls behind, extraction
+blocks on the full queue instead of piling texts up in memory; the time spent
+blocked is reported, along with busy time per stage, in ``PipelineStats``.
+
+CVs whose file content already has a stored parse are copied in the prepare
+step and never enter the pipeline.
+"""
+
+import asyncio
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from backend.config import settings
+from backend.models.cv_file import CVFile
+from backend.services.cv_parser import (
+    aparse_cv_text,
+    fail_cv_processing,
+    find_reusable_parse,
+    parse_cv_text,
+    parse_store_key,
+    reuse_parsed_cv,
+    save_parsed_cv,
+    stored_cv_path,
+)
+from backend.services.file_parser import extract_text
+from backend.utils.cv_sections import PAGE_BREAK
+
+logger = logging.getLogger(__name__)
+
+_extract_pool: ProcessPoolExecutor | None = None
+_extract_pool_lock = threading.Lock()
+
+
+def extract_workers() -> int:
+    return settings.PARSE_EXTRACT_WORKERS or os.cpu_count() or 1
+
+
+def _get_extract_pool() -> ProcessPoolExecutor:
+    global _extract_pool
+    with _extract_pool_lock:
+        if _extract_pool is None:
+            _extract_pool = ProcessPoolExecutor(max_workers=extract_workers())
+        return _extract_pool
+
+
+def _timed_extract(source: str | bytes, filename: str) -> tuple[str, float]:
+    """Runs in a worker process; returns the text and the time spent extracting it."""
+    started = time.perf_counter()
+    text = extract_text(source, filename, page_separator=PAGE_BREAK)
+    return text, time.perf_counter() - started
+
+
+@dataclass
+class ParseJob:
+    cv_file_id: UUID
+    file_path: str
+    store_key: str | None
+    # Uploaded bytes, handed to extraction instead of reading file_path
+    content: bytes | None = None
+    raw_text: str | None = None
+    parsed: dict | None = None
+    error: Exception | None = None
+
+    @property
+    def source(self) -> str | bytes:
+        return self.content if self.content is not None else stored_cv_path(self.file_path)
+
+
+@dataclass
+class PipelineStats:
+    reused: int = 0
+    extract_seconds: float = 0.0
+    llm_seconds: float = 0.0
+    write_seconds: float = 0.0
+    # Extraction waiting on a full LLM queue (backpressure)
+    extract_blocked_seconds: float = 0.0
+    # LLM workers waiting on an empty queue (extraction is the bottleneck)
+    llm_idle_seconds: float = 0.0
+    max_llm_queue: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def add(self, **seconds: float):
+        with self._lock:
+            for key, value in seconds.items():
+                setattr(self, key, getattr(self, key) + value)
+
+    def note_queue_depth(self, depth: int):
+        with self._lock:
+            self.max_llm_queue = max(self.max_llm_queue, depth)
+
+    def as_dict(self) -> dict:
+        return {
+            key: round(value, 3) if isinstance(value, float) else value
+            for key, value in self.__dict__.items()
+            if not key.startswith("_")
+        }
+
+
+def prepare_parse_jobs(
+    db: Session,
+    cv_file_ids: list[str],
+    stats: PipelineStats,
+    on_done,
+    contents: dict[str, bytes] | None = None,
+) -> list[ParseJob]:
+    """Mark the CVs as processing and copy stored parses; return the CVs left to parse.
+
+    ``on_done(ok)`` is called for every CV finished here (reused or missing).
+    ``contents`` maps cv_file_id -> uploaded bytes for CVs that need no disk read.
+    """
+    contents = contents or {}
+    ids = [UUID(cv_id) for cv_id in cv_file_ids]
+    cvs = {cv.id: cv for cv in db.query(CVFile).filter(CVFile.id.in_(ids)).all()}
+    for cv in cvs.values():
+        cv.status = "processing"
+    db.commit()
+
+    jobs = []
+    for cv_id in ids:
+        cv = cvs.get(cv_id)
+        if cv is None:
+            logger.error(f"Failed to parse CV {cv_id}: CV file not found")
+            on_done(False)
+            continue
+        source = find_reusable_parse(db, cv)
+        if source is None:
+            content = contents.get(str(cv.id))
+            jobs.append(ParseJob(cv.id, cv.file_path, parse_store_key(cv), content))
+            continue
+        try:
+            reuse_parsed_cv(db, cv, source)
+            stats.reused += 1
+            on_done(True)
+        except Exception as e:
+            logger.error(f"Failed to parse CV {cv_id}: {e}")
+            fail_cv_processing(db, cv, e)
+            on_done(False)
+    return jobs
+
+
+def write_parse_job(db: Session, job: ParseJob, stats: PipelineStats) -> bool:
+    started = time.perf_counter()
+    cv = db.get(CVFile, job.cv_file_id)
+    try:
+        if job.error is not None:
+            raise job.error
+        save_parsed_cv(db, cv, job.raw_text, job.parsed, job.store_key)
+        return True
+    except Exception as e:
+        logger.error(f"Failed to parse CV {job.cv_file_id}: {e}")
+        fail_cv_processing(db, cv, e)
+        return False
+    finally:
+        stats.add(write_seconds=time.perf_counter() - started)
+
+
+def run_parse_pipeline(
+    db: Session,
+    cv_file_ids: list[str],
+    on_done,
+    llm_workers: int,
+    contents: dict[str, bytes] | None = None,
+):
+    """Thread-based pipeline; ``on_done(ok)`` is called once per CV."""
+    stats = PipelineStats()
+    jobs = prepare_parse_jobs(db, cv_file_ids, stats, on_done, contents)
+    pending = iter(jobs)
+    pending_lock = threading.Lock()
+    llm_queue: queue.Queue = queue.Queue(maxsize=settings.PARSE_PIPELINE_QUEUE_SIZE)
+    write_queue: queue.Queue = queue.Queue()
+    pool = _get_extract_pool()
+
+    def extract_stage():
+        while True:
+            with pending_lock:
+                job = next(pending, None)
+            if job is None:
+                return
+            try:
+                future = pool.submit(_timed_extract, job.source, job.file_path)
+                job.raw_text, seconds = future.result()
+                stats.add(extract_seconds=seconds)
+            except Exception as e:
+                job.error = e
+                write_queue.put(job)
+                continue
+            started = time.perf_counter()
+            llm_queue.put(job)
+            stats.add(extract_blocked_seconds=time.perf_counter() - started)
+            stats.note_queue_depth(llm_queue.qsize())
+
+    def llm_stage():
+        while True:
+            started = time.perf_counter()
+            job = llm_queue.get()
+            stats.add(llm_idle_seconds=time.perf_counter() - started)
+            if job is None:
+                return
+            started = time.perf_counter()
+            try:
+                job.parsed = parse_cv_text(job.raw_text)
+            except Exception as e:
+                job.error = e
+            stats.add(llm_seconds=time.perf_counter() - started)
+            write_queue.put(job)
+
+    extractors = [threading.Thread(target=extract_stage) for _ in range(extract_workers())]
+    llm_threads = [threading.Thread(target=llm_stage) for _ in range(llm_workers)]
+    for thread in extractors + llm_threads:
+        thread.start()
+
+    for _ in jobs:
+        on_done(write_parse_job(db, write_queue.get(), stats))
+    # Every job has been written, so the extractors are done and the LLM queue is empty
+    for thread in extractors:
+        thread.join()
+    for _ in llm_threads:
+        llm_queue.put(None)
+    for thread in llm_threads:
+        thread.join()
+    return stats
+
+
+async def arun_parse_pipeline(
+    db: Session,
+    cv_file_ids: list[str],
+    on_done,
+    llm_workers: int,
+    contents: dict[str, bytes] | None = None,
+):
+    """Async variant of run_parse_pipeline; the LLM stage runs as coroutines.
+
+    Database work runs in a worker thread (one call at a time, so the session is
+    never shared) to keep the event loop free for in-flight LLM calls.
+    """
+    stats = PipelineStats()
+    jobs = await asyncio.to_thread(prepare_parse_jobs, db, cv_file_ids, stats, on_done, contents)
+    # Release the pooled connection while extraction and LLM calls are in flight
+    await asyncio.to_thread(db.commit)
+    pending = iter(jobs)
+    llm_queue: asyncio.Queue = asyncio.Queue(maxsize=settings.PARSE_PIPELINE_QUEUE_SIZE)
+    write_queue: asyncio.Queue = asyncio.Queue()
+    loop = asyncio.get_running_loop()
+    pool = _get_extract_pool()
+
+    async def extract_stage():
+        for job in pending:
+            try:
+                job.raw_text, seconds = await loop.run_in_executor(
+                    pool, _timed_extract, job.source, job.file_path
+                )
+                stats.add(extract_seconds=seconds)
+            except Exception as e:
+                job.error = e
+                write_queue.put_nowait(job)
+                continue
+            started = time.perf_counter()
+            await llm_queue.put(job)
+            stats.add(extract_blocked_seconds=time.perf_counter() - started)
+            stats.note_queue_depth(llm_queue.qsize())
+
+    async def llm_stage():
+        while True:
+            started = time.perf_counter()
+            job = await llm_queue.get()
+            stats.add(llm_idle_seconds=time.perf_counter() - started)
+            started = time.perf_counter()
+            try:
+                job.parsed = await aparse_cv_text(job.raw_text)
+            except Exception as e:
+                job.error = e
+            stats.add(llm_seconds=time.perf_counter() - started)
+            write_queue.put_nowait(job)
+
+    extractors = [asyncio.create_task(extract_stage()) for _ in range(extract_workers())]
+    llm_tasks = [asyncio.create_task(llm_stage()) for _ in range(llm_workers)]
+    try:
+        for _ in jobs:
+            job = await write_queue.get()
+            on_done(await asyncio.to_thread(write_parse_job, db, job, stats))
+        await asyncio.gather(*extractors)
+    finally:
+        # LLM workers are idle on the empty queue once every job is written
+        for task in extractors + llm_tasks:
+            task.cancel()
+    return stats
@@ -0,0 +1,133 @@
+"""Local, deterministic approximation of the LLM match scores.
+
+Works only on the structured fields already stored on ParsedCV and
+JobDescription, so it needs no network and ranks thousands of candidates in
+milliseconds. Used to shortlist which candidates are worth an LLM call.
+"""
+
+from uuid import UUID
+
+from sqlalchemy.orm import Session, load_only
+
+from backend.models.job_description import JobDescription
+from backend.models.parsed_cv import ParsedCV
+from backend.services.matcher import get_weights
+from backend.utils.skills import canonical_skill
+
+
+def skill_set(values) -> set[str]:
+    return {canonical_skill(v) for v in (values or []) if isinstance(v, str) and v.strip()} - {""}
+
+
+def _coverage(wanted: set[str], have: set[str]) -> float | None:
+    if not wanted:
+        return None
+    return len(wanted & have) / len(wanted)
+
+
+def cv_skill_names(parsed_cv: ParsedCV) -> list:
+    """Raw skill names from a CV's skills, tools and project technologies."""
+    names = list(parsed_cv.skills or []) + list(parsed_cv.tools or [])
+    for project in parsed_cv.projects or []:
+        if isinstance(project, dict):
+            names += project.get("technologies") or []
+    return names
+
+
+def cv_skill_set(parsed_cv: ParsedCV) -> set[str]:
+    return skill_set(cv_skill_names(parsed_cv))
+
+
+def prescore(jd: JobDescription, parsed_cv: ParsedCV, weights: dict | None = None) -> dict:
+    """Approximate skills/experience/keyword sub-scores (0-100) and a weighted total."""
+    weights = weights or get_weights(jd)
+    have = cv_skill_set(parsed_cv)
+
+    required_names = {
+        canonical_skill(v): v for v in (jd.required_skills or []) if isinstance(v, str)
+    }
+    required = skill_set(jd.required_skills)
+    preferred = skill_set(jd.preferred_skills) - required
+    required_cov = _coverage(required, have)
+    preferred_cov = _coverage(preferred, have)
+    if required_cov is None and preferred_cov is None:
+        skills_score = 100.0
+    elif preferred_cov is None:
+        skills_score = required_cov * 100
+    elif required_cov is None:
+        skills_score = preferred_cov * 100
+    else:
+        skills_score = (0.8 * required_cov + 0.2 * preferred_cov) * 100
+
+    min_years = jd.min_experience_years
+    years = parsed_cv.total_experience_years
+    if not min_years:
+        experience_score = 100.0
+    elif years is None:
+        experience_score = 0.0
+    else:
+        experience_score = min(years / min_years, 1.0) * 100
+
+    keywords = skill_set(jd.keywords)
+    keyword_cov = _coverage(keywords, have)
+    keywords_score = 100.0 if keyword_cov is None else keyword_cov * 100
+
+    # Projects can't be judged locally; spread its weight over the other scores
+    w_skills = weights.get("skills", 0.4)
+    w_exp = weights.get("experience", 0.3)
+    w_kw = weights.get("keywords", 0.1)
+    total_weight = (w_skills + w_exp + w_kw) or 1.0
+    score = (
+        skills_score * w_skills + experience_score * w_exp + keywords_score * w_kw
+    ) / total_weight
+
+    return {
+        "prescore": round(score, 2),
+        "skills_score": round(skills_score, 2),
+        "experience_score": round(experience_score, 2),
+        "keywords_score": round(keywords_score, 2),
+        "matched_skills": sorted(required_names[s] for s in required & have),
+        "missing_skills": sorted(required_names[s] for s in required - have),
+    }
+
+
+def rank_candidates(db: Session, jd: JobDescription, cv_file_ids: list[str]) -> list[dict]:
+    """Prescore every given CV against the JD, best first."""
+    weights = get_weights(jd)
+    parsed_cvs = (
+        db.query(ParsedCV)
+        .options(
+            load_only(
+                ParsedCV.cv_file_id,
+                ParsedCV.candidate_name,
+                ParsedCV.total_experience_years,
+                ParsedCV.skills,
+                ParsedCV.tools,
+                ParsedCV.projects,
+            )
+        )
+        .filter(ParsedCV.cv_file_id.in_([UUID(cid) for cid in cv_file_ids]))
+    )
+    ranked = []
+    for parsed_cv in parsed_cvs:
+        entry = prescore(jd, parsed_cv, weights)
+        entry["cv_file_id"] = str(parsed_cv.cv_file_id)
+        entry["candidate_name"] = parsed_cv.candidate_name or "Unknown"
+        ranked.append(entry)
+    ranked.sort(key=lambda e: (-e["prescore"], e["cv_file_id"]))
+    return ranked
+
+
+def select_shortlist(
+    ranked: list[dict],
+    top_k: int | None = None,
+    min_score: float | None = None,
+    key: str = "cv_file_id",
+) -> list[str]:
+    """Pick the ids to escalate to LLM matching from a ranked prescore list."""
+    selected = ranked
+    if min_score is not None:
+        selected = [e for e in selected if e["prescore"] >= min_score]
+    if top_k is not None:
+        selected = selected[:top_k]
+    return [e[key] for e in selected]
@@ -0,0 +1,210 @@
+"""CV-centric matching: rank one CV against every active JD of its owner.
+
+JDs are pre-scored locally, the best ones are escalated, and the survivors are
+packed into as few LLM calls as possible, with the CV sent once per call.
+"""
+
+import json
+from dataclasses import dataclass, field
+from typing import ClassVar
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from backend.models.job_description import JobDescription
+from backend.models.match_result import MatchResult
+from backend.models.parsed_cv import ParsedCV
+from backend.services.matcher import (
+    build_cv_payload,
+    build_jd_payload,
+    get_weights,
+    match_fingerprint,
+    match_prompt,
+    match_row,
+    plan_match_groups,
+)
+from backend.services.prescorer import prescore
+from backend.utils.llm_client import is_llm_available
+
+MATCH_ROLES_SYSTEM_PROMPT = """You are an ATS (Applicant Tracking System) matching engine. Compare one candidate's CV against several Job Descriptions and evaluate the candidate's fit for each role independently.
+
+You will receive a JSON with two keys: "candidate_cv" and "job_descriptions". Each job description has a "jd_id".
+
+Return a JSON object with a single key "results": a list with exactly one entry per job description, in the same order:
+{
+  "results": [
+    {
+      "jd_id": "the job description's jd_id, copied exactly",
+      "skills_score": 75,
+      "experience_score": 60,
+      "projects_score": 50,
+      "keywords_score": 80,
+      "matched_skills": ["Python", "SQL"],
+      "missing_skills": ["Kubernetes"],
+      "strengths": ["Strong Python experience with 5+ years"],
+      "gaps": ["Missing required DevOps skills (Kubernetes)"],
+      "explanation": "One or two sentences summarising the fit."
+    }
+  ]
+}
+
+Scoring guidelines (each score is 0-100):
+- skills_score: % of the role's required skills the candidate has. Include partial matches for related skills.
+- experience_score: How well the candidate's years and type of experience match the role. 100 if meets/exceeds requirements.
+- projects_score: How relevant the candidate's projects are to the role's responsibilities.
+- keywords_score: Overlap of technical tools, technologies, and domain keywords.
+
+Score every role on its own; do not rank the roles against each other. Keep strengths and gaps to at most 3 short items each.
+"""
+
+
+@dataclass
+class RoleMatchPlan:
+    """Inputs for one CV against many JDs, grouped into LLM calls.
+
+    Group entries are (jd_id, JD payload); see MatchBatchPlan for the interface
+    the shared scoring and writing helpers expect.
+    """
+
+    system_prompt: ClassVar[str] = MATCH_ROLES_SYSTEM_PROMPT
+    id_key: ClassVar[str] = "jd_id"
+
+    cv_file_id: UUID
+    cv_data: dict
+    jd_weights: dict[str, dict] = field(default_factory=dict)
+    groups: list[list[tuple[str, dict]]] = field(default_factory=list)
+    errors: dict[str, str] = field(default_factory=dict)
+    fingerprints: dict[str, str] = field(default_factory=dict)
+    skipped: list[str] = field(default_factory=list)
+
+    def batch_prompt(self, group: list[tuple[str, dict]]) -> str:
+        return json.dumps({
+            "candidate_cv": self.cv_data,
+            "job_descriptions": [{"jd_id": jd_id, **payload} for jd_id, payload in group],
+        })
+
+    def single_prompt(self, jd_id: str, payload: dict) -> str:
+        return match_prompt(payload, self.cv_data)
+
+    def row(self, jd_id: str, result: dict) -> dict:
+        return match_row(
+            self.cv_file_id,
+            UUID(jd_id),
+            self.jd_weights[jd_id],
+            result,
+            self.fingerprints.get(jd_id),
+        )
+
+    @property
+    def jd_ids(self) -> list[UUID]:
+        return [UUID(jd_id) for jd_id in self.jd_weights]
+
+
+def _get_parsed_cv(db: Session, cv_file_id: UUID) -> ParsedCV:
+    parsed_cv = db.query(ParsedCV).filter(ParsedCV.cv_file_id == cv_file_id).first()
+    if not parsed_cv:
+        raise ValueError(f"CV not parsed yet: {cv_file_id}")
+    return parsed_cv
+
+
+def rank_roles(db: Session, cv_file_id: UUID, user_id: UUID) -> list[dict]:
+    """Prescore the CV against every active JD of the user, best first."""
+    parsed_cv = _get_parsed_cv(db, cv_file_id)
+    jds = (
+        db.query(JobDescription)
+        .filter(JobDescription.user_id == user_id, JobDescription.is_active.is_(True))
+        .all()
+    )
+    ranked = []
+    for jd in jds:
+        entry = prescore(jd, parsed_cv)
+        entry["jd_id"] = str(jd.id)
+        entry["title"] = jd.title
+        ranked.append(entry)
+    ranked.sort(key=lambda e: (-e["prescore"], e["jd_id"]))
+    return ranked
+
+
+def prepare_role_match(
+    db: Session, cv_file_id: UUID, jd_ids: list[str], force: bool = False
+) -> RoleMatchPlan:
+    """Load inputs and group JDs into LLM calls, skipping unchanged pairs unless forced."""
+    parsed_cv = _get_parsed_cv(db, cv_file_id)
+    plan = RoleMatchPlan(cv_file_id=cv_file_id, cv_data=build_cv_payload(parsed_cv))
+    jds_by_id = {
+        str(jd.id): jd
+        for jd in db.query(JobDescription).filter(
+            JobDescription.id.in_([UUID(jid) for jid in jd_ids])
+        )
+    }
+
+    llm_available = is_llm_available()
+    stored = {}
+    if llm_available and not force:
+        stored = {
+            str(jd_id): fingerprint
+            for jd_id, fingerprint in db.query(
+                MatchResult.jd_id, MatchResult.input_fingerprint
+            ).filter(
+                MatchResult.cv_file_id == cv_file_id,
+                MatchResult.jd_id.in_([UUID(jid) for jid in jds_by_id]),
+            )
+        }
+
+    items = []
+    for jd_id in jd_ids:
+        jd = jds_by_id.get(jd_id)
+        if jd is None:
+            plan.errors[jd_id] = f"Job description not found: {jd_id}"
+            continue
+        jd_data = build_jd_payload(jd)
+        if llm_available:
+            fingerprint = match_fingerprint(jd_data, plan.cv_data)
+            if stored.get(jd_id) == fingerprint:
+                plan.skipped.append(jd_id)
+                continue
+            plan.fingerprints[jd_id] = fingerprint
+        plan.jd_weights[jd_id] = get_weights(jd)
+        items.append((jd_id, jd_data))
+
+    if llm_available:
+        plan.groups = plan_match_groups(items, plan.cv_data, MATCH_ROLES_SYSTEM_PROMPT)
+    else:
+        plan.groups = [[item] for item in items]
+    return plan
+
+
+def get_best_roles(
+    db: Session, cv_file_id: UUID, user_id: UUID, limit: int | None = None
+) -> list[dict]:
+    """The user's active roles ranked by the CV's stored match score."""
+    query = (
+        db.query(MatchResult, JobDescription.title)
+        .join(JobDescription, MatchResult.jd_id == JobDescription.id)
+        .filter(
+            MatchResult.cv_file_id == cv_file_id,
+            JobDescription.user_id == user_id,
+            JobDescription.is_active.is_(True),
+        )
+        .order_by(MatchResult.overall_score.desc(), MatchResult.jd_id)
+    )
+    if limit:
+        query = query.limit(limit)
+
+    return [
+        {
+            "rank": rank,
+            "jd_id": str(match.jd_id),
+            "title": title,
+            "overall_score": match.overall_score,
+            "skills_score": match.skills_score,
+            "experience_score": match.experience_score,
+            "projects_score": match.projects_score,
+            "keywords_score": match.keywords_score,
+            "fit_status": match.fit_status,
+            "matched_skills": match.matched_skills or [],
+            "missing_skills": match.missing_skills or [],
+            "explanation": match.explanation,
+        }
+        for rank, (match, title) in enumerate(query, 1)
+    ]
@@ -0,0 +1,97 @@
+"""Interned skill ids and the skill -> CV inverted index.
+
+Every canonical skill (see ``backend.utils.skills``) gets a compact integer id in
+the ``skills`` table. ``cv_skills`` maps skill ids to the CVs that mention them
+and is rewritten for a CV whenever it is (re)parsed, so "candidates with X and
+Y" is an intersection over index rows instead of a scan of every JSONB blob.
+"""
+
+import threading
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from backend.models.job_description import JobDescription
+from backend.models.parsed_cv import ParsedCV
+from backend.models.skill import CVSkill, Skill
+from backend.services.prescorer import cv_skill_names
+from backend.utils.skills import canonical_skills
+
+MAX_SKILL_NAME = 255
+
+# Canonical name -> id for skills known to be committed; skills are never deleted
+_skill_ids: dict[str, int] = {}
+_skill_ids_lock = threading.Lock()
+
+
+def intern_skills(db: Session, names) -> dict[str, int]:
+    """Return canonical name -> skill id for the given raw names, creating missing skills.
+
+    Runs inside the caller's transaction; the caller commits.
+    """
+    wanted = {k: v for k, v in canonical_skills(names).items() if len(k) <= MAX_SKILL_NAME}
+    with _skill_ids_lock:
+        ids = {k: _skill_ids[k] for k in wanted if k in _skill_ids}
+    missing = sorted(k for k in wanted if k not in ids)
+    if not missing:
+        return ids
+
+    existing = dict(db.execute(select(Skill.name, Skill.id).where(Skill.name.in_(missing))).all())
+    with _skill_ids_lock:
+        _skill_ids.update(existing)
+    ids.update(existing)
+
+    new = [k for k in missing if k not in existing]
+    if new:
+        # Sorted inserts keep concurrent writers from deadlocking on the unique index
+        db.execute(
+            pg_insert(Skill)
+            .values([{"name": k, "display_name": wanted[k][:MAX_SKILL_NAME]} for k in new])
+            .on_conflict_do_nothing(index_elements=["name"])
+        )
+        ids.update(db.execute(select(Skill.name, Skill.id).where(Skill.name.in_(new))).all())
+    return ids
+
+
+def index_cv_skills(db: Session, parsed_cv: ParsedCV):
+    """Rewrite the inverted-index rows for one CV. The caller commits."""
+    skill_ids = intern_skills(db, cv_skill_names(parsed_cv))
+    db.execute(delete(CVSkill).where(CVSkill.cv_file_id == parsed_cv.cv_file_id))
+    if skill_ids:
+        db.execute(
+            pg_insert(CVSkill)
+            .values(
+                [
+                    {"skill_id": skill_id, "cv_file_id": parsed_cv.cv_file_id}
+                    for skill_id in sorted(skill_ids.values())
+                ]
+            )
+            .on_conflict_do_nothing()
+        )
+
+
+def index_jd_skills(db: Session, jd: JobDescription) -> dict[str, int]:
+    return intern_skills(
+        db, (jd.required_skills or []) + (jd.preferred_skills or []) + (jd.keywords or [])
+    )
+
+
+def cvs_with_all_skills(db: Session, skills: list[str]):
+    """Select of cv_file_ids whose CV mentions every one of ``skills``.
+
+    Returns None when nothing can match (a skill has never been seen).
+    """
+    keys = [k for k in canonical_skills(skills) if len(k) <= MAX_SKILL_NAME]
+    if not keys:
+        return None
+    skill_ids = db.execute(select(Skill.id).where(Skill.name.in_(keys))).scalars().all()
+    if len(skill_ids) < len(keys):
+        return None
+    return (
+        select(CVSkill.cv_file_id)
+        .where(CVSkill.skill_id.in_(skill_ids))
+        .group_by(CVSkill.cv_file_id)
+        .having(func.count() == len(skill_ids))
+    )
+
@@ -0,0 +1,211 @@
+"""Streaming multipart upload: hash and spool each file part as it arrives.
+
+The request body is fed chunk by chunk to python-multipart's push parser. Each
+file part goes to a temp file in the upload directory, and is hashed as it is
+written; ``UploadSpooler.store`` renames it to its content address
+(``<sha256><ext>``) once the caller has registered it. No part is ever held in
+memory, so peak memory is one network chunk no matter how many files are
+uploaded. Size limits are checked as bytes arrive: ``Content-Length`` up front,
+then per file and per request while streaming.
+"""
+
+import hashlib
+import os
+import tempfile
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from pathlib import Path
+
+from starlette.concurrency import run_in_threadpool
+
+try:
+    from python_multipart.multipart import MultipartParser, parse_options_header
+except ModuleNotFoundError:  # python-multipart < 0.0.13
+    from multipart.multipart import MultipartParser, parse_options_header
+
+
+class UploadTooLarge(ValueError):
+    pass
+
+
+@dataclass
+class SpooledUpload:
+    filename: str
+    file_hash: str
+    file_path: str
+    size: int
+    # Where the bytes are until ``UploadSpooler.store`` moves them to file_path
+    temp_path: str | None = None
+
+
+class UploadSpooler:
+    """Write file parts to ``upload_dir`` as they arrive: ``start``, ``write``..., ``finish``.
+
+    Finished parts stay in temp files until ``store()``, which callers run only
+    once the uploads are registered: another request may already have stored
+    and registered the same content address, so a failed request must never
+    touch it. Parts with a disallowed extension are counted in ``parts`` but
+    not stored.
+    """
+
+    def __init__(self, upload_dir: str, allowed_exts: set[str], max_file_bytes: int = 0):
+        self.upload_dir = upload_dir
+        self.allowed_exts = allowed_exts
+        self.max_file_bytes = max_file_bytes
+        self.uploads: list[SpooledUpload] = []
+        self.parts = 0
+        self._name = ""
+        self._size = 0
+        self._file = None
+        self._hash = None
+
+    @property
+    def in_part(self) -> bool:
+        return self._file is not None
+
+    def start(self, filename: str):
+        self.parts += 1
+        self._name = filename
+        self._size = 0
+        if Path(filename).suffix.lower() not in self.allowed_exts:
+            return
+        os.makedirs(self.upload_dir, exist_ok=True)
+        self._file = tempfile.NamedTemporaryFile(dir=self.upload_dir, suffix=".part", delete=False)
+        self._hash = hashlib.sha256()
+
+    def write(self, data: bytes):
+        self._size += len(data)
+        if self.max_file_bytes and self._size > self.max_file_bytes:
+            raise UploadTooLarge(f"{self._name} exceeds {self.max_file_bytes} bytes")
+        if self._file is not None:
+            self._hash.update(data)
+            self._file.write(data)
+
+    def finish(self):
+        if self._file is None:
+            return
+        self._file.close()
+        file_hash = self._hash.hexdigest()
+        path = os.path.join(self.upload_dir, f"{file_hash}{Path(self._name).suffix.lower()}")
+        self.uploads.append(
+            SpooledUpload(self._name, file_hash, path, self._size, temp_path=self._file.name)
+        )
+        self._file = None
+
+    def store(self):
+        """Move every finished part to its content address."""
+        for upload in self.uploads:
+            if upload.temp_path is not None:
+                # Same address, same bytes: replacing an existing copy is harmless
+                os.replace(upload.temp_path, upload.file_path)
+                upload.temp_path = None
+
+    def abort(self):
+        """Drop the part in progress."""
+        if self._file is not None:
+            self._file.close()
+            os.unlink(self._file.name)
+            self._file = None
+
+    def discard(self):
+        """Remove the part in progress and every finished part not yet stored."""
+        self.abort()
+        for upload in self.uploads:
+            if upload.temp_path is not None and os.path.exists(upload.temp_path):
+                os.unlink(upload.temp_path)
+        self.uploads = []
+
+
+def _multipart_parser(boundary: bytes, spooler: UploadSpooler) -> MultipartParser:
+    headers: dict[bytes, bytes] = {}
+    field = [b"", b""]
+    in_file = False
+
+    def on_part_begin():
+        headers.clear()
+
+    def on_header_field(data, start, end):
+        field[0] += data[start:end]
+
+    def on_header_value(data, start, end):
+        field[1] += data[start:end]
+
+    def on_header_end():
+        headers[field[0].lower()] = field[1]
+        field[0] = field[1] = b""
+
+    def on_headers_finished():
+        nonlocal in_file
+        _, options = parse_options_header(headers.get(b"content-disposition", b""))
+        filename = options.get(b"filename")
+        # Plain form fields carry no filename and are ignored
+        in_file = filename is not None
+        if in_file:
+            spooler.start(os.path.basename(filename.decode("utf-8", "replace")))
+
+    def on_part_data(data, start, end):
+        if in_file:
+            spooler.write(data[start:end])
+
+    def on_part_end():
+        nonlocal in_file
+        if in_file:
+            spooler.finish()
+        in_file = False
+
+    return MultipartParser(
+        boundary,
+        {
+            "on_part_begin": on_part_begin,
+            "on_header_field": on_header_field,
+            "on_header_value": on_header_value,
+            "on_header_end": on_header_end,
+            "on_headers_finished": on_headers_finished,
+            "on_part_data": on_part_data,
+            "on_part_end": on_part_end,
+        },
+    )
+
+
+async def spool_multipart(
+    stream: AsyncIterator[bytes],
+    content_type: str,
+    content_length: int | None,
+    upload_dir: str,
+    allowed_exts: set[str],
+    max_file_bytes: int = 0,
+    max_request_bytes: int = 0,
+) -> UploadSpooler:
+    """Stream a multipart body to ``upload_dir``; returns the spooler with its uploads.
+
+    The parts are left in temp files: call ``store()`` once they are registered,
+    or ``discard()``. Raises UploadTooLarge when a limit (0 = none) is exceeded
+    and ValueError on a malformed body; either way the temp files are removed.
+    """
+    if max_request_bytes and content_length and content_length > max_request_bytes:
+        raise UploadTooLarge(f"Upload exceeds {max_request_bytes} bytes")
+    ctype, options = parse_options_header(content_type or "")
+    boundary = options.get(b"boundary")
+    if ctype != b"multipart/form-data" or not boundary:
+        raise ValueError("Expected a multipart/form-data body")
+
+    spooler = UploadSpooler(upload_dir, allowed_exts, max_file_bytes)
+    parser = _multipart_parser(boundary, spooler)
+    received = 0
+    try:
+        async for chunk in stream:
+            received += len(chunk)
+            if max_request_bytes and received > max_request_bytes:
+                raise UploadTooLarge(f"Upload exceeds {max_request_bytes} bytes")
+            # Parsing runs the callbacks, which write to disk: keep it off the event loop
+            await run_in_threadpool(parser.write, chunk)
+        parser.finalize()
+        if spooler.in_part:
+            raise ValueError("body ended inside a file part")
+    except UploadTooLarge:
+        spooler.discard()
+        raise
+    except Exception as e:
+        spooler.discard()
+        raise ValueError(f"Malformed multipart body: {e}") from e
+    return spooler
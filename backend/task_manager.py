@@ -2,8 +2,14 @@
 
 Stores task progress in memory. Suitable for single-process deployments
 (Render free tier, small VPS). For production scale, swap back to Celery.
+
+Batches run either on thread pools or, when ``LLM_ASYNC_BATCHES`` is set, as
+coroutines on one shared event loop that keeps many LLM requests in flight
+under a semaphore. Parse batches go through the staged pipeline in
+``backend.services.parse_pipeline`` either way.
 """
 
+import asyncio
 import logging
 import threading
 import uuid
@@ -11,6 +17,9 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 
+from backend.config import settings
+from backend.utils.llm_cache import log_llm_cache_stats
+
 logger = logging.getLogger(__name__)
 
 MAX_PARALLEL = 5
@@ -22,12 +31,49 @@ class TaskProgress:
     total: int = 0
     status: str = "pending"
     message: str = ""
+    stats: dict = field(default_factory=dict)
     created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
 
 
 _tasks: dict[str, TaskProgress] = {}
 _lock = threading.Lock()
 _pool = ThreadPoolExecutor(max_workers=4)
+_loop: asyncio.AbstractEventLoop | None = None
+_loop_lock = threading.Lock()
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """Return the background event loop used for async batches, starting it once."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_loop.run_forever, name="task-manager-loop", daemon=True
+            ).start()
+        return _loop
+
+
+def _run_async(task_id: str, coro):
+    """Schedule ``coro`` on the background loop; a crash is logged and ends the task."""
+    future = asyncio.run_coroutine_threadsafe(coro, _get_loop())
+
+    def on_done(future):
+        if future.cancelled():
+            error = "cancelled"
+        elif future.exception() is not None:
+            error = future.exception()
+        else:
+            return
+        logger.error(f"Task {task_id} crashed: {error}")
+        with _lock:
+            t = _tasks.get(task_id)
+            total = t.total if t else 0
+        _set_stats(task_id, error=str(error))
+        _set_progress(task_id, total, total, "completed", f"Task failed: {error}")
+
+    future.add_done_callback(on_done)
+    return future
 
 
 def get_progress(task_id: str) -> dict | None:
@@ -40,6 +86,7 @@ def get_progress(task_id: str) -> dict | None:
             "total": t.total,
             "status": t.status,
             "message": t.message,
+            "stats": dict(t.stats),
         }
 
 
@@ -54,82 +101,387 @@ def _set_progress(task_id: str, current: int, total: int, status: str, message:
         t.message = message
 
 
-def _parse_one(cv_file_id: str) -> dict:
+def _set_stats(task_id: str, **stats):
+    with _lock:
+        if task_id in _tasks:
+            _tasks[task_id].stats.update(stats)
+
+
+def _run_parse_batch(
+    task_id: str, cv_file_ids: list[str], contents: dict[str, bytes] | None = None
+):
     from backend.database import SessionLocal
-    from backend.services.cv_parser import process_single_cv
+    from backend.services.parse_pipeline import run_parse_pipeline
+
+    total = len(cv_file_ids)
+    _set_progress(task_id, 0, total, "processing", f"Processing {total} CVs")
+    done_count = failed = 0
+
+    def on_done(ok: bool):
+        nonlocal done_count, failed
+        done_count += 1
+        failed += not ok
+        _set_progress(task_id, done_count, total, "processing", f"Processed {done_count}/{total}")
 
     db = SessionLocal()
     try:
-        parsed_cv = process_single_cv(db, cv_file_id)
-        return {"cv_file_id": cv_file_id, "status": "success", "name": parsed_cv.candidate_name}
+        stats = run_parse_pipeline(
+            db, cv_file_ids, on_done, llm_workers=MAX_PARALLEL, contents=contents
+        )
     except Exception as e:
-        logger.error(f"Failed to parse CV {cv_file_id}: {e}")
-        return {"cv_file_id": cv_file_id, "status": "error", "error": str(e)}
+        logger.error(f"Parse batch {task_id} failed: {e}")
+        _set_progress(task_id, total, total, "completed", f"Processing failed: {e}")
+        return
     finally:
         db.close()
 
+    _set_stats(task_id, failed=failed, llm_cache=log_llm_cache_stats(), **stats.as_dict())
+    _set_progress(task_id, total, total, "completed", "All CVs processed")
+
+
+# Error messages kept on a task; the count of failures is always complete
+MAX_TASK_ERRORS = 20
+
+
+def _failure_stats(errors: dict[str, str]) -> dict:
+    return {
+        "failed": len(errors),
+        "errors": [
+            {"id": item_id, "error": error}
+            for item_id, error in list(errors.items())[:MAX_TASK_ERRORS]
+        ],
+    }
+
+
+def _log_match_errors(errors: dict[str, str]):
+    for item_id, error in errors.items():
+        logger.error(f"Failed to match {item_id}: {error}")
+
+
+def _match_plan_message(
+    label: str, total: int, recomputed: int, skipped: int, errors: dict[str, str]
+) -> str:
+    counts = f"{recomputed} recomputed, {skipped} unchanged"
+    if not errors:
+        return f"All {label} matched ({counts})"
+    return f"Matched {total - len(errors)}/{total} {label} ({counts}, {len(errors)} failed)"
 
-def _match_one(cv_file_id: str, jd_id: str) -> dict:
-    from uuid import UUID
 
+def _run_match_plan(
+    task_id: str, total: int, label: str, prepare, use_cache: bool = True
+):
+    """Score a match plan's groups on a thread pool and write the results.
+
+    ``prepare(db)`` builds the plan (a MatchBatchPlan or RoleMatchPlan); ``total``
+    is the number of items requested and ``label`` names them in progress messages.
+    ``use_cache=False`` asks the LLM again instead of reusing cached replies.
+    """
     from backend.database import SessionLocal
-    from backend.services.matcher import match_cv_to_jd
+    from backend.services.leaderboard_cache import leaderboard_batch
+    from backend.services.matcher import MatchResultWriter, score_match_group
+
+    _set_progress(task_id, 0, total, "matching", f"Matching {total} {label}")
 
     db = SessionLocal()
     try:
-        result = match_cv_to_jd(db, UUID(cv_file_id), UUID(jd_id))
-        return {
-            "cv_file_id": cv_file_id,
-            "status": "success",
-            "score": result.overall_score,
-            "fit_status": result.fit_status,
-        }
+        plan = prepare(db)
+        errors = dict(plan.errors)
+        done_count = len(plan.errors) + len(plan.skipped)
+        recomputed = 0
+        _set_stats(task_id, skipped=len(plan.skipped), recomputed=0, **_failure_stats(errors))
+        writer = MatchResultWriter(db, plan)
+        with leaderboard_batch(plan.jd_ids), ThreadPoolExecutor(max_workers=MAX_PARALLEL) as pool:
+            futures = {
+                pool.submit(score_match_group, plan, group, use_cache): group
+                for group in plan.groups
+            }
+            for future in as_completed(futures):
+                results, group_errors = future.result()
+                writer.add(results)
+                _log_match_errors(group_errors)
+                errors.update(group_errors)
+                done_count += len(futures[future])
+                recomputed += len(results)
+                _set_stats(task_id, recomputed=recomputed, **_failure_stats(errors))
+                _set_progress(
+                    task_id, done_count, total, "matching", f"Matched {done_count}/{total}"
+                )
+            writer.flush()
     except Exception as e:
-        logger.error(f"Failed to match CV {cv_file_id}: {e}")
-        return {"cv_file_id": cv_file_id, "status": "error", "error": str(e)}
+        logger.error(f"Match batch {task_id} failed: {e}")
+        _set_progress(task_id, total, total, "completed", f"Matching failed: {e}")
+        return
     finally:
         db.close()
 
+    _set_stats(task_id, llm_cache=log_llm_cache_stats())
+    _set_progress(
+        task_id,
+        total,
+        total,
+        "completed",
+        _match_plan_message(label, total, recomputed, len(plan.skipped), errors),
+    )
+
+
+async def _run_parse_batch_async(
+    task_id: str, cv_file_ids: list[str], contents: dict[str, bytes] | None = None
+):
+    """Async variant of _run_parse_batch."""
+    from backend.database import SessionLocal
+    from backend.services.parse_pipeline import arun_parse_pipeline
 
-def _run_parse_batch(task_id: str, cv_file_ids: list[str]):
     total = len(cv_file_ids)
     _set_progress(task_id, 0, total, "processing", f"Processing {total} CVs")
+    done_count = failed = 0
 
-    done_count = 0
-    with ThreadPoolExecutor(max_workers=MAX_PARALLEL) as pool:
-        futures = {pool.submit(_parse_one, cv_id): cv_id for cv_id in cv_file_ids}
-        for future in as_completed(futures):
-            future.result()
-            done_count += 1
-            _set_progress(task_id, done_count, total, "processing", f"Processed {done_count}/{total}")
+    def on_done(ok: bool):
+        nonlocal done_count, failed
+        done_count += 1
+        failed += not ok
+        _set_progress(task_id, done_count, total, "processing", f"Processed {done_count}/{total}")
+
+    db = SessionLocal()
+    try:
+        stats = await arun_parse_pipeline(
+            db,
+            cv_file_ids,
+            on_done,
+            llm_workers=settings.LLM_ASYNC_CONCURRENCY,
+            contents=contents,
+        )
+    except Exception as e:
+        logger.error(f"Parse batch {task_id} failed: {e}")
+        _set_progress(task_id, total, total, "completed", f"Processing failed: {e}")
+        return
+    finally:
+        db.close()
 
+    _set_stats(task_id, failed=failed, llm_cache=log_llm_cache_stats(), **stats.as_dict())
     _set_progress(task_id, total, total, "completed", "All CVs processed")
 
 
-def _run_match_batch(task_id: str, cv_file_ids: list[str], jd_id: str):
-    total = len(cv_file_ids)
-    _set_progress(task_id, 0, total, "matching", f"Matching {total} CVs")
-
-    done_count = 0
-    with ThreadPoolExecutor(max_workers=MAX_PARALLEL) as pool:
-        futures = {pool.submit(_match_one, cv_id, jd_id): cv_id for cv_id in cv_file_ids}
-        for future in as_completed(futures):
-            future.result()
-            done_count += 1
+async def _run_match_plan_async(
+    task_id: str, total: int, label: str, prepare, use_cache: bool = True
+):
+    """Async variant of _run_match_plan."""
+    from backend.database import SessionLocal
+    from backend.services.leaderboard_cache import leaderboard_batch
+    from backend.services.matcher import MatchResultWriter, ascore_match_group
+
+    _set_progress(task_id, 0, total, "matching", f"Matching {total} {label}")
+
+    semaphore = asyncio.Semaphore(settings.LLM_ASYNC_CONCURRENCY)
+    # Session work runs in worker threads, one call at a time
+    db_lock = asyncio.Lock()
+    db = SessionLocal()
+    try:
+        plan = await asyncio.to_thread(prepare, db)
+        # Release the pooled connection while LLM calls are in flight
+        await asyncio.to_thread(db.commit)
+        errors = dict(plan.errors)
+        done_count = len(plan.errors) + len(plan.skipped)
+        recomputed = 0
+        _set_stats(task_id, skipped=len(plan.skipped), recomputed=0, **_failure_stats(errors))
+        writer = MatchResultWriter(db, plan)
+
+        async def run(group: list[tuple[str, dict]]):
+            nonlocal done_count, recomputed
+            async with semaphore:
+                results, group_errors = await ascore_match_group(plan, group, use_cache)
+            async with db_lock:
+                await asyncio.to_thread(writer.add, results)
+            _log_match_errors(group_errors)
+            errors.update(group_errors)
+            done_count += len(group)
+            recomputed += len(results)
+            _set_stats(task_id, recomputed=recomputed, **_failure_stats(errors))
             _set_progress(task_id, done_count, total, "matching", f"Matched {done_count}/{total}")
 
-    _set_progress(task_id, total, total, "completed", "All CVs matched")
+        with leaderboard_batch(plan.jd_ids):
+            await asyncio.gather(*(run(group) for group in plan.groups))
+            await asyncio.to_thread(writer.flush)
+    except Exception as e:
+        logger.error(f"Match batch {task_id} failed: {e}")
+        _set_progress(task_id, total, total, "completed", f"Matching failed: {e}")
+        return
+    finally:
+        db.close()
+
+    _set_stats(task_id, llm_cache=log_llm_cache_stats())
+    _set_progress(
+        task_id,
+        total,
+        total,
+        "completed",
+        _match_plan_message(label, total, recomputed, len(plan.skipped), errors),
+    )
 
 
-def submit_parse_batch(cv_file_ids: list[str]) -> str:
+def submit_parse_batch(cv_file_ids: list[str], contents: dict[str, bytes] | None = None) -> str:
+    """Parse the given CVs; ``contents`` (cv_file_id -> bytes) skips reading them from disk."""
     task_id = str(uuid.uuid4())
     _tasks[task_id] = TaskProgress(total=len(cv_file_ids))
-    _pool.submit(_run_parse_batch, task_id, cv_file_ids)
+    if settings.LLM_ASYNC_BATCHES:
+        _run_async(task_id, _run_parse_batch_async(task_id, cv_file_ids, contents))
+    else:
+        _pool.submit(_run_parse_batch, task_id, cv_file_ids, contents)
+    return task_id
+
+
+def _run_folder_scan(task_id: str, folder_id: str, user_id: str, auto_process: bool):
+    """Walk a folder, starting a parse batch for every committed batch of new/modified CVs."""
+    from uuid import UUID
+
+    from backend.database import SessionLocal
+    from backend.services.folder_service import get_folder, scan_folder
+
+    _set_progress(task_id, 0, 0, "scanning", "Scanning folder")
+    parse_task_ids: list[str] = []
+
+    def on_batch(cv_ids: list[str]):
+        if auto_process:
+            parse_task_ids.append(submit_parse_batch(cv_ids))
+            _set_stats(task_id, parse_task_ids=list(parse_task_ids))
+
+    def on_progress(stats):
+        _set_stats(task_id, **{k: v for k, v in stats.as_result().items() if k != "new_cv_ids"})
+        _set_progress(
+            task_id,
+            0,
+            0,
+            "scanning",
+            f"Scanned {stats.total_on_disk} files ({stats.hashed} hashed, "
+            f"{stats.new} new, {stats.modified} modified)",
+        )
+
+    db = SessionLocal()
+    try:
+        folder = get_folder(db, UUID(folder_id), UUID(user_id))
+        if not folder:
+            raise ValueError("Folder not found")
+        result = scan_folder(db, folder, on_batch=on_batch, on_progress=on_progress)
+    except Exception as e:
+        logger.error(f"Folder scan {task_id} failed: {e}")
+        _set_progress(task_id, 0, 0, "completed", f"Scan failed: {e}")
+        return
+    finally:
+        db.close()
+
+    total = result["total_on_disk"]
+    _set_stats(task_id, **{k: v for k, v in result.items() if k != "new_cv_ids"})
+    _set_progress(
+        task_id,
+        total,
+        total,
+        "completed",
+        f"Scanned {total} files ({result['new']} new, {result['modified']} modified)",
+    )
+
+
+def submit_folder_scan(folder_id: str, user_id: str, auto_process: bool = True) -> str:
+    """Scan a folder in the background; progress and stats are reported on the task."""
+    task_id = str(uuid.uuid4())
+    _tasks[task_id] = TaskProgress()
+    _pool.submit(_run_folder_scan, task_id, folder_id, user_id, auto_process)
+    return task_id
+
+
+def _run_archive_ingest(
+    task_id: str, folder_id: str, user_id: str, archive_path: str, auto_process: bool
+):
+    """Register an uploaded archive's CVs, starting a parse batch for every committed batch."""
+    from uuid import UUID
+
+    from backend.database import SessionLocal
+    from backend.services.archive_ingest import ingest_archive, remove_archive_spool
+    from backend.services.folder_service import get_folder
+
+    _set_progress(task_id, 0, 0, "extracting", "Reading archive")
+    parse_task_ids: list[str] = []
+
+    def on_batch(cv_ids: list[str]):
+        if auto_process:
+            parse_task_ids.append(submit_parse_batch(cv_ids))
+            _set_stats(task_id, parse_task_ids=list(parse_task_ids))
+
+    def on_progress(stats):
+        _set_stats(task_id, **{k: v for k, v in stats.as_result().items() if k != "new_cv_ids"})
+        _set_progress(
+            task_id,
+            0,
+            0,
+            "extracting",
+            f"Read {stats.members} files ({stats.new} new, {stats.skipped} duplicates)",
+        )
+
+    db = SessionLocal()
+    try:
+        folder = get_folder(db, UUID(folder_id), UUID(user_id))
+        if not folder:
+            raise ValueError("Folder not found")
+        result = ingest_archive(
+            db, folder, archive_path, on_batch=on_batch, on_progress=on_progress
+        )
+    except Exception as e:
+        logger.error(f"Archive ingest {task_id} failed: {e}")
+        _set_progress(task_id, 0, 0, "completed", f"Archive import failed: {e}")
+        return
+    finally:
+        db.close()
+        remove_archive_spool(archive_path)
+
+    total = result["members"]
+    _set_stats(task_id, **{k: v for k, v in result.items() if k != "new_cv_ids"})
+    _set_progress(
+        task_id,
+        total,
+        total,
+        "completed",
+        f"Imported {total} files ({result['new']} new, {result['skipped']} duplicates, "
+        f"{result['ignored'] + result['too_large']} ignored)",
+    )
+
+
+def submit_archive_ingest(
+    folder_id: str, user_id: str, archive_path: str, auto_process: bool = True
+) -> str:
+    """Register the CVs of an archive spooled to ``archive_path`` in the background."""
+    task_id = str(uuid.uuid4())
+    _tasks[task_id] = TaskProgress()
+    _pool.submit(_run_archive_ingest, task_id, folder_id, user_id, archive_path, auto_process)
     return task_id
 
 
-def submit_match_batch(cv_file_ids: list[str], jd_id: str) -> str:
+def _submit_match_plan(total: int, label: str, prepare, use_cache: bool = True) -> str:
     task_id = str(uuid.uuid4())
-    _tasks[task_id] = TaskProgress(total=len(cv_file_ids))
-    _pool.submit(_run_match_batch, task_id, cv_file_ids, jd_id)
+    _tasks[task_id] = TaskProgress(total=total)
+    if settings.LLM_ASYNC_BATCHES:
+        _run_async(task_id, _run_match_plan_async(task_id, total, label, prepare, use_cache))
+    else:
+        _pool.submit(_run_match_plan, task_id, total, label, prepare, use_cache)
     return task_id
+
+
+def submit_match_batch(cv_file_ids: list[str], jd_id: str, force: bool = False) -> str:
+    from uuid import UUID
+
+    from backend.services.matcher import prepare_match_batch
+
+    def prepare(db):
+        return prepare_match_batch(db, cv_file_ids, UUID(jd_id), force=force)
+
+    # Forcing a re-match must reach the LLM, not its cached reply to the same prompt
+    return _submit_match_plan(len(cv_file_ids), "CVs", prepare, use_cache=not force)
+
+
+def submit_role_match(cv_file_id: str, jd_ids: list[str], force: bool = False) -> str:
+    """Match one CV against the given JDs in as few LLM calls as possible."""
+    from uuid import UUID
+
+    from backend.services.role_matcher import prepare_role_match
+
+    def prepare(db):
+        return prepare_role_match(db, UUID(cv_file_id), jd_ids, force=force)
+
+    return _submit_match_plan(len(jd_ids), "roles", prepare, use_cache=not force)
@@ -0,0 +1,209 @@
+"""Section-aware compaction of extracted CV text for the parse prompt.
+
+Extracted text carries a lot that costs tokens without helping the parse:
+runs of whitespace, page numbers, headers/footers repeated at the top or bottom
+of every page (pages are separated by form feeds) and lines doubled by
+multi-column PDF layouts. When a CV does not fit the token budget,
+``compact_cv_text`` cleans those up, splits the CV into sections by their
+headings and packs the sections into the budget. Small sections always fit
+whole; when the budget is tight the large ones (usually experience) are trimmed
+at line boundaries, so late sections such as projects or certifications are
+never cut off entirely.
+"""
+
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+
+from backend.utils.rate_limiter import estimate_tokens
+
+# What CV parsing asks extract_text to put between PDF pages
+PAGE_BREAK = "\f"
+
+# Section name -> headings that open it, compared after folding
+SECTION_HEADINGS = {
+    "summary": (
+        "summary", "professional summary", "profile", "professional profile", "about me",
+        "objective", "career objective", "career summary",
+    ),
+    "skills": (
+        "skills", "technical skills", "key skills", "core skills", "core competencies",
+        "competencies", "technologies", "tech stack", "tools", "tools and technologies",
+        "skills and tools",
+    ),
+    "experience": (
+        "experience", "work experience", "professional experience", "employment",
+        "employment history", "work history", "career history", "relevant experience",
+    ),
+    "projects": ("projects", "personal projects", "key projects", "selected projects"),
+    "education": (
+        "education", "academic background", "academic qualifications", "qualifications",
+        "education and training",
+    ),
+    "certifications": (
+        "certifications", "certificates", "licenses", "licenses and certifications",
+        "certifications and licenses", "courses", "training",
+    ),
+    "other": (
+        "interests", "hobbies", "references", "languages", "awards", "achievements",
+        "publications", "volunteering", "volunteer experience", "activities",
+        "personal details", "personal information",
+    ),
+}
+
+# Lower-priority sections only get what is left after every other section fits
+_LOW_PRIORITY = {"other"}
+# Lines before the first heading: name and contact details, never trimmed past this
+_MAX_HEADER_LINES = 12
+# Lines at each end of a page that may be page numbers or headers/footers
+_EDGE_LINES = 2
+# Same ~4 characters per token as estimate_tokens
+_CHARS_PER_TOKEN = 4
+
+_HEADING_FOLD_RE = re.compile(r"[^a-z ]+")
+_SPACE_RE = re.compile(r"\s+")
+_PAGE_MARKER_RE = re.compile(r"^(?:page\s*)?\d+\s*(?:/|of)\s*\d+$|^page\s*\d+$", re.IGNORECASE)
+
+_HEADINGS = {
+    heading: section for section, headings in SECTION_HEADINGS.items() for heading in headings
+}
+
+
+@dataclass
+class CVSection:
+    name: str
+    lines: list[str] = field(default_factory=list)
+
+    @property
+    def size(self) -> int:
+        return sum(len(line) + 1 for line in self.lines)
+
+
+def _fold_heading(line: str) -> str:
+    return _SPACE_RE.sub(" ", _HEADING_FOLD_RE.sub(" ", line.lower().replace("&", " and "))).strip()
+
+
+def section_for_heading(line: str) -> str | None:
+    """Section name if the line is a heading we recognise, else None."""
+    if len(line) > 40:
+        return None
+    return _HEADINGS.get(_fold_heading(line))
+
+
+def _page_lines(page: str) -> list[str]:
+    lines = (_SPACE_RE.sub(" ", line).strip() for line in page.splitlines())
+    return [line for line in lines if line]
+
+
+def _is_furniture_candidate(line: str) -> bool:
+    return len(line) <= 80 and section_for_heading(line) is None
+
+
+def _page_furniture(pages: list[list[str]]) -> set[str]:
+    """Lines at the top (or the bottom) of at least half the pages, and two: headers/footers."""
+    tops, bottoms = Counter(), Counter()
+    for page in pages:
+        tops.update({line.lower() for line in page[:_EDGE_LINES] if _is_furniture_candidate(line)})
+        bottoms.update(
+            {line.lower() for line in page[-_EDGE_LINES:] if _is_furniture_candidate(line)}
+        )
+    return {
+        line
+        for counts in (tops, bottoms)
+        for line, n in counts.items()
+        if n >= 2 and 2 * n >= len(pages)
+    }
+
+
+def _strip_page_edges(page: list[str], furniture: set[str]) -> list[str]:
+    def is_edge_noise(line: str) -> bool:
+        return line.lower() in furniture or bool(_PAGE_MARKER_RE.match(line))
+
+    start, end = 0, len(page)
+    while start < min(_EDGE_LINES, end) and is_edge_noise(page[start]):
+        start += 1
+    while end > max(start, len(page) - _EDGE_LINES) and is_edge_noise(page[end - 1]):
+        end -= 1
+    return page[start:end]
+
+
+def clean_lines(text: str) -> list[str]:
+    """Collapse whitespace and drop blank lines, page edge furniture and doubled lines.
+
+    Only lines at the top or bottom of a page can be page numbers or
+    headers/footers, and only consecutive duplicates are collapsed, so content
+    that legitimately repeats (a job title at several employers) is kept.
+    """
+    pages = [_page_lines(page) for page in text.split(PAGE_BREAK)]
+    furniture = _page_furniture(pages) if len(pages) > 1 else set()
+    cleaned = []
+    for page in pages:
+        for line in _strip_page_edges(page, furniture):
+            if cleaned and cleaned[-1].lower() == line.lower():
+                continue
+            cleaned.append(line)
+    return cleaned
+
+
+def split_sections(lines: list[str]) -> list[CVSection]:
+    """Split cleaned lines into sections; text before the first heading is ``header``."""
+    sections = [CVSection("header")]
+    for line in lines:
+        name = section_for_heading(line)
+        if name is not None:
+            sections.append(CVSection(name, [line]))
+        else:
+            sections[-1].lines.append(line)
+    return [section for section in sections if section.lines]
+
+
+def _fair_shares(sections: list[CVSection], budget: int) -> dict[int, int]:
+    """Split ``budget`` so small sections fit whole and large ones share the rest equally."""
+    shares = {}
+    pending = sorted(sections, key=lambda s: s.size)
+    for i, section in enumerate(pending):
+        share = min(section.size, max(budget, 0) // (len(pending) - i))
+        shares[id(section)] = share
+        budget -= share
+    return shares
+
+
+def _trim(section: CVSection, max_chars: int) -> list[str]:
+    kept, used = [], 0
+    for line in section.lines:
+        if used + len(line) + 1 > max_chars and kept:
+            break
+        kept.append(line)
+        used += len(line) + 1
+    return kept
+
+
+def compact_cv_text(text: str, max_tokens: int) -> str:
+    """Clean ``text`` and pack its sections, in document order, into ``max_tokens``.
+
+    Text that already fits is returned untouched.
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    sections = split_sections(clean_lines(text))
+    compacted = "\n".join(line for section in sections for line in section.lines)
+    if estimate_tokens(compacted) <= max_tokens:
+        return compacted
+
+    budget = max_tokens * _CHARS_PER_TOKEN
+    header = next((s for s in sections if s.name == "header"), None)
+    if header is not None:
+        header.lines = header.lines[:_MAX_HEADER_LINES]
+        budget -= header.size
+    core = [s for s in sections if s.name != "header" and s.name not in _LOW_PRIORITY]
+    shares = _fair_shares(core, budget)
+    budget -= sum(shares.values())
+    shares.update(_fair_shares([s for s in sections if s.name in _LOW_PRIORITY], budget))
+
+    packed = []
+    for section in sections:
+        if section is header:
+            packed.extend(section.lines)
+        elif shares.get(id(section), 0) > 0:
+            packed.extend(_trim(section, shares[id(section)]))
+    return "\n".join(packed)
@@ -0,0 +1,157 @@
+"""Persistent, content-addressed cache for LLM responses.
+
+Entries are keyed by a SHA-256 of (model, prompts, temperature, response format)
+and stored in a SQLite file in DATA_DIR (or at LLM_CACHE_PATH), so replaying a
+batch after a crash or re-matching unchanged inputs is served from disk instead
+of the API.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    response TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL
+)
+"""
+
+
+def make_cache_key(
+    model: str,
+    system_prompt: str,
+    user_prompt: str,
+    temperature: float,
+    response_json: bool,
+) -> str:
+    payload = json.dumps(
+        [model, system_prompt, user_prompt, temperature, response_json],
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    def __init__(self, path: str, max_entries: int = 50000, ttl_seconds: int = 0):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._writes_since_evict = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(_SCHEMA)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_llm_cache_last_access ON llm_cache (last_access)"
+        )
+
+    def get(self, key: str) -> dict | str | None:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            response, created_at = row
+            if self.ttl_seconds and now - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE llm_cache SET last_access = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        return json.loads(response)
+
+    def set(self, key: str, model: str, value: dict | str):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, model, response, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, model, json.dumps(value, ensure_ascii=False), now, now),
+            )
+            self._writes_since_evict += 1
+            # Eviction scans the index, so only do it every so often
+            if self._writes_since_evict >= max(1, self.max_entries // 100):
+                self._evict(now)
+                self._writes_since_evict = 0
+
+    def _evict(self, now: float):
+        if self.ttl_seconds:
+            self._conn.execute(
+                "DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl_seconds,)
+            )
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM llm_cache WHERE key IN "
+                "(SELECT key FROM llm_cache ORDER BY last_access ASC LIMIT ?)",
+                (overflow,),
+            )
+
+    def stats(self) -> dict:
+        with self._lock:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()
+        total = self.hits + self.misses
+        return {
+            "entries": count,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+_cache: LLMCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMCache | None:
+    """Return the process-wide cache, or None when caching is disabled."""
+    global _cache
+    if not settings.LLM_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                path = settings.LLM_CACHE_PATH or os.path.join(
+                    settings.DATA_DIR, "llm_cache.sqlite3"
+                )
+                try:
+                    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+                    _cache = LLMCache(
+                        path,
+                        max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+                        ttl_seconds=settings.LLM_CACHE_TTL_SECONDS,
+                    )
+                except (OSError, sqlite3.Error) as e:
+                    logger.warning(f"LLM cache unavailable at {path}: {e}")
+                    return None
+    return _cache
+
+
+def log_llm_cache_stats() -> dict:
+    """Log the process-wide cache's counters; returns them ({} before it is first used)."""
+    if _cache is None:
+        return {}
+    stats = _cache.stats()
+    logger.info(f"LLM cache at {_cache.path}: {stats}")
+    return stats
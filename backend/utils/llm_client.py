@@ -1,18 +1,20 @@
+import asyncio
 import json
 import time
 import logging
-import threading
 
-from groq import Groq
+import httpx
+from groq import AsyncGroq, Groq, RateLimitError
 
 from backend.config import settings
+from backend.utils.llm_cache import LLMCache, get_llm_cache, make_cache_key
+from backend.utils.rate_limiter import RateLimiter, estimate_tokens, get_rate_limiter
 
 logger = logging.getLogger(__name__)
 
 _client: Groq | None = None
-_rate_lock = threading.Lock()
-_last_call_time = 0.0
-_MIN_INTERVAL = 0.3  # minimum seconds between API calls (across threads)
+_async_client: AsyncGroq | None = None
+_async_client_loop: asyncio.AbstractEventLoop | None = None
 
 
 def is_llm_available() -> bool:
@@ -23,60 +25,182 @@ def is_llm_available() -> bool:
 def _get_client() -> Groq:
     global _client
     if _client is None:
-        _client = Groq(api_key=settings.GROQ_API_KEY)
+        # Retries are handled in call_llm so the rate limiter sees every attempt
+        _client = Groq(api_key=settings.GROQ_API_KEY, max_retries=0)
     return _client
 
 
-def _throttle():
-    """Simple rate limiter to avoid hitting Groq rate limits."""
-    global _last_call_time
-    with _rate_lock:
-        now = time.monotonic()
-        elapsed = now - _last_call_time
-        if elapsed < _MIN_INTERVAL:
-            time.sleep(_MIN_INTERVAL - elapsed)
-        _last_call_time = time.monotonic()
+def _get_async_client() -> AsyncGroq:
+    """Return an AsyncGroq client whose connection pool is shared by the running loop."""
+    global _async_client, _async_client_loop
+    loop = asyncio.get_running_loop()
+    if _async_client is None or _async_client_loop is not loop:
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.LLM_MAX_CONNECTIONS,
+            ),
+            timeout=httpx.Timeout(60.0, connect=10.0),
+        )
+        _async_client = AsyncGroq(
+            api_key=settings.GROQ_API_KEY, max_retries=0, http_client=http_client
+        )
+        _async_client_loop = loop
+    return _async_client
 
 
-def call_llm(
+def _is_rate_limit_error(e: Exception) -> bool:
+    if isinstance(e, RateLimitError):
+        return True
+    err_str = str(e).lower()
+    return "rate_limit" in err_str or "429" in err_str or "too many" in err_str
+
+
+def _prepare_request(
     system_prompt: str,
     user_prompt: str,
-    response_json: bool = True,
-    model: str | None = None,
-    max_retries: int = 5,
-) -> dict | str:
-    client = _get_client()
-    model = model or settings.GROQ_MODEL
-
+    response_json: bool,
+    model: str,
+    completion_tokens: int | None = None,
+) -> tuple[dict, int]:
     kwargs = {
         "model": model,
         "messages": [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": user_prompt},
         ],
-        "temperature": 0.1,
+        "temperature": settings.LLM_TEMPERATURE,
     }
     if response_json:
         kwargs["response_format"] = {"type": "json_object"}
+    estimated_tokens = (
+        estimate_tokens(system_prompt)
+        + estimate_tokens(user_prompt)
+        + (completion_tokens or settings.LLM_COMPLETION_TOKEN_ESTIMATE)
+    )
+    return kwargs, estimated_tokens
+
+
+def _cache_key_for(
+    system_prompt: str, user_prompt: str, response_json: bool, model: str
+) -> tuple[LLMCache | None, str | None]:
+    cache = get_llm_cache()
+    if cache is None:
+        return None, None
+    key = make_cache_key(
+        model, system_prompt, user_prompt, settings.LLM_TEMPERATURE, response_json
+    )
+    return cache, key
+
+
+def _read_response(response, limiter: RateLimiter, estimated_tokens: int, response_json: bool):
+    usage = getattr(response, "usage", None)
+    limiter.reconcile(estimated_tokens, getattr(usage, "total_tokens", None))
+    content = response.choices[0].message.content
+    return json.loads(content) if response_json else content
+
+
+def _on_rate_limit(e: Exception, limiter: RateLimiter, model: str, attempt: int):
+    headers = getattr(getattr(e, "response", None), "headers", None) or {}
+    retry_after = limiter.update_from_headers(headers)
+    if retry_after is None:
+        # No server hint: back off locally so other callers wait too
+        limiter.block_for(min(2 ** attempt * 2, 30))
+    logger.warning(f"Rate limited on {model} (attempt {attempt + 1})")
+
+
+def call_llm(
+    system_prompt: str,
+    user_prompt: str,
+    response_json: bool = True,
+    model: str | None = None,
+    max_retries: int = 5,
+    use_cache: bool = True,
+    completion_tokens: int | None = None,
+) -> dict | str:
+    """Send a chat completion, serving identical prompts from the response cache.
+
+    Pass ``use_cache=False`` to bypass the cache lookup (the fresh response is
+    still written back so later calls see it). ``completion_tokens`` overrides the
+    default completion size used when reserving rate-limit budget.
+    """
+    model = model or settings.GROQ_MODEL
+    cache, cache_key = _cache_key_for(system_prompt, user_prompt, response_json, model)
+    if cache is not None and use_cache:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    client = _get_client()
+    kwargs, estimated_tokens = _prepare_request(
+        system_prompt, user_prompt, response_json, model, completion_tokens
+    )
+    limiter = get_rate_limiter(model)
 
     for attempt in range(max_retries):
-        _throttle()
+        limiter.acquire(estimated_tokens)
         try:
-            response = client.chat.completions.create(**kwargs)
-            content = response.choices[0].message.content
-            if response_json:
-                return json.loads(content)
-            return content
+            raw = client.chat.completions.with_raw_response.create(**kwargs)
+            limiter.update_from_headers(raw.headers)
+            result = _read_response(raw.parse(), limiter, estimated_tokens, response_json)
+            if cache is not None:
+                cache.set(cache_key, model, result)
+            return result
         except Exception as e:
-            err_str = str(e).lower()
-            is_rate_limit = "rate_limit" in err_str or "429" in err_str or "too many" in err_str
-            if is_rate_limit:
-                wait = min(2 ** attempt * 2, 30)
-                logger.warning(f"Rate limited, waiting {wait}s (attempt {attempt + 1})")
-                time.sleep(wait)
+            if _is_rate_limit_error(e):
+                _on_rate_limit(e, limiter, model, attempt)
+                if attempt == max_retries - 1:
+                    raise
             else:
                 logger.warning(f"LLM call attempt {attempt + 1} failed: {e}")
                 if attempt < max_retries - 1:
                     time.sleep(2 ** attempt)
                 else:
                     raise
+
+
+async def acall_llm(
+    system_prompt: str,
+    user_prompt: str,
+    response_json: bool = True,
+    model: str | None = None,
+    max_retries: int = 5,
+    use_cache: bool = True,
+    completion_tokens: int | None = None,
+) -> dict | str:
+    """Async variant of call_llm sharing its cache, rate limiter and retry policy."""
+    model = model or settings.GROQ_MODEL
+    cache, cache_key = _cache_key_for(system_prompt, user_prompt, response_json, model)
+    # The SQLite cache blocks: keep it off the event loop shared by every call
+    if cache is not None and use_cache:
+        cached = await asyncio.to_thread(cache.get, cache_key)
+        if cached is not None:
+            return cached
+
+    client = _get_async_client()
+    kwargs, estimated_tokens = _prepare_request(
+        system_prompt, user_prompt, response_json, model, completion_tokens
+    )
+    limiter = get_rate_limiter(model)
+
+    for attempt in range(max_retries):
+        await limiter.acquire_async(estimated_tokens)
+        try:
+            raw = await client.chat.completions.with_raw_response.create(**kwargs)
+            limiter.update_from_headers(raw.headers)
+            response = await raw.parse()
+            result = _read_response(response, limiter, estimated_tokens, response_json)
+            if cache is not None:
+                await asyncio.to_thread(cache.set, cache_key, model, result)
+            return result
+        except Exception as e:
+            if _is_rate_limit_error(e):
+                _on_rate_limit(e, limiter, model, attempt)
+                if attempt == max_retries - 1:
+                    raise
+            else:
+                logger.warning(f"LLM call attempt {attempt + 1} failed: {e}")
+                if attempt < max_retries - 1:
+                    await asyncio.sleep(2 ** attempt)
+                else:
+                    raise
@@ -0,0 +1,161 @@
+"""Per-model token-bucket rate limiting for LLM calls.
+
+Each model gets a requests/minute and a tokens/minute bucket. Callers reserve
+one request plus an estimate of their prompt tokens and only sleep when the
+budget is exhausted, so concurrent workers proceed in parallel up to the
+provider quota. Rate-limit headers returned by the API (Retry-After and the
+x-ratelimit-* family) tighten the local view when the server disagrees.
+"""
+
+import asyncio
+import re
+import threading
+import time
+from typing import Callable, Mapping
+
+from backend.config import settings
+
+_DURATION_RE = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token for English prose and JSON)."""
+    return len(text) // 4 + 1
+
+
+def parse_reset_duration(value: str | None) -> float | None:
+    """Parse reset values such as ``"7.66s"``, ``"2m59.56s"``, ``"120ms"`` or ``"3"``."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    parts = _DURATION_RE.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+class TokenBucket:
+    def __init__(self, capacity: float, refill_per_second: float, now: float):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.level = capacity
+        self.updated = now
+
+    def refill(self, now: float):
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.level = min(self.capacity, self.level + elapsed * self.refill_per_second)
+            self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        if self.refill_per_second <= 0:
+            return float("inf")
+        return (amount - self.level) / self.refill_per_second
+
+    def consume(self, amount: float):
+        self.level -= min(amount, self.capacity)
+
+
+class RateLimiter:
+    def __init__(
+        self,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._clock = clock
+        self._lock = threading.Lock()
+        now = clock()
+        self.requests = TokenBucket(requests_per_minute, requests_per_minute / 60.0, now)
+        self.tokens = TokenBucket(tokens_per_minute, tokens_per_minute / 60.0, now)
+        self._blocked_until = 0.0
+
+    def try_acquire(self, tokens: int) -> float:
+        """Reserve budget for one call. Returns 0 on success, else seconds to wait."""
+        with self._lock:
+            now = self._clock()
+            self.requests.refill(now)
+            self.tokens.refill(now)
+            wait = max(
+                self._blocked_until - now,
+                self.requests.wait_time(1),
+                self.tokens.wait_time(tokens),
+            )
+            if wait > 0:
+                return wait
+            self.requests.consume(1)
+            self.tokens.consume(tokens)
+            return 0.0
+
+    def acquire(self, tokens: int):
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: int):
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+    def reconcile(self, estimated_tokens: int, actual_tokens: int | None):
+        """Charge (or refund) the difference between the estimate and real usage."""
+        if actual_tokens is None:
+            return
+        with self._lock:
+            self.tokens.level -= actual_tokens - estimated_tokens
+
+    def block_for(self, seconds: float):
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, self._clock() + seconds)
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> float | None:
+        """Apply server rate-limit headers. Returns the Retry-After delay if present."""
+        retry_after = parse_reset_duration(headers.get("retry-after"))
+        with self._lock:
+            now = self._clock()
+            for bucket, kind in ((self.requests, "requests"), (self.tokens, "tokens")):
+                remaining = headers.get(f"x-ratelimit-remaining-{kind}")
+                if remaining is None:
+                    continue
+                try:
+                    remaining = float(remaining)
+                except ValueError:
+                    continue
+                bucket.refill(now)
+                bucket.level = min(bucket.level, remaining)
+                if remaining <= 0:
+                    reset = parse_reset_duration(headers.get(f"x-ratelimit-reset-{kind}"))
+                    if reset:
+                        self._blocked_until = max(self._blocked_until, now + reset)
+            if retry_after is not None:
+                self._blocked_until = max(self._blocked_until, now + retry_after)
+        return retry_after
+
+
+_limiters: dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(model: str) -> RateLimiter:
+    with _limiters_lock:
+        limiter = _limiters.get(model)
+        if limiter is None:
+            limits = settings.LLM_MODEL_RATE_LIMITS.get(model, {})
+            limiter = RateLimiter(
+                requests_per_minute=limits.get("rpm", settings.LLM_REQUESTS_PER_MINUTE),
+                tokens_per_minute=limits.get("tpm", settings.LLM_TOKENS_PER_MINUTE),
+            )
+            _limiters[model] = limiter
+        return limiter
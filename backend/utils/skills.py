@@ -0,0 +1,184 @@
+"""Skill name canonicalization.
+
+Skills arrive as free-form strings from CV and JD parsing ("JS", "javascript",
+"Java Script"). ``fold_skill`` lowercases and folds punctuation/whitespace;
+``canonical_skill`` then maps known aliases onto one canonical key, so the same
+skill always lands on the same key (and the same interned ``Skill`` id).
+"""
+
+import re
+
+_SKILL_PUNCT_RE = re.compile(r"[^\w+#. ]+")
+_SPACE_RE = re.compile(r"\s+")
+
+# Folded alias -> folded canonical name
+SKILL_ALIASES = {
+    "js": "javascript",
+    "java script": "javascript",
+    "ecmascript": "javascript",
+    "es6": "javascript",
+    "ts": "typescript",
+    "py": "python",
+    "python3": "python",
+    "python 3": "python",
+    "golang": "go",
+    "k8s": "kubernetes",
+    "postgres": "postgresql",
+    "postgre sql": "postgresql",
+    "psql": "postgresql",
+    "mongo": "mongodb",
+    "mssql": "sql server",
+    "ms sql": "sql server",
+    "microsoft sql server": "sql server",
+    "node": "node.js",
+    "nodejs": "node.js",
+    "node js": "node.js",
+    "react.js": "react",
+    "reactjs": "react",
+    "react js": "react",
+    "vue.js": "vue",
+    "vuejs": "vue",
+    "angularjs": "angular",
+    "angular.js": "angular",
+    "next.js": "nextjs",
+    "next js": "nextjs",
+    "express.js": "express",
+    "expressjs": "express",
+    "c sharp": "c#",
+    "csharp": "c#",
+    "cpp": "c++",
+    "dotnet": ".net",
+    ".net core": ".net",
+    "net core": ".net",
+    "amazon web services": "aws",
+    "google cloud": "gcp",
+    "google cloud platform": "gcp",
+    "microsoft azure": "azure",
+    "ml": "machine learning",
+    "dl": "deep learning",
+    "ai": "artificial intelligence",
+    "nlp": "natural language processing",
+    "tf": "tensorflow",
+    "sklearn": "scikit learn",
+    "cicd": "ci cd",
+    "gh actions": "github actions",
+    "rest api": "rest",
+    "restful": "rest",
+    "restful api": "rest",
+    "restful apis": "rest",
+    "rest apis": "rest",
+    "html5": "html",
+    "css3": "css",
+    "tailwindcss": "tailwind",
+    "tailwind css": "tailwind",
+}
+
+
+def fold_skill(name: str) -> str:
+    """Lowercase and collapse punctuation/whitespace, keeping + # . (C++, C#, Node.js)."""
+    name = _SKILL_PUNCT_RE.sub(" ", str(name).lower())
+    return _SPACE_RE.sub(" ", name).strip(" .")
+
+
+def canonical_skill(name: str) -> str:
+    folded = fold_skill(name)
+    return SKILL_ALIASES.get(folded, folded)
+
+
+def canonical_skills(values) -> dict[str, str]:
+    """Map canonical key -> first original spelling for a list of skill names."""
+    result = {}
+    for value in values or []:
+        if not isinstance(value, str) or not value.strip():
+            continue
+        key = canonical_skill(value)
+        if key:
+            result.setdefault(key, value.strip())
+    return result
+
+
+# Display names of skills and tools that the local extractor finds in free text.
+# Terms are matched on canonical keys, so every alias above matches too.
+KNOWN_SKILLS = (
+    "Python", "Java", "JavaScript", "TypeScript", "C++", "C#", "Ruby", "PHP", "Rust",
+    "Kotlin", "Swift", "Scala", "Perl", "Haskell", "Elixir", "Dart", "MATLAB", "Golang",
+    "SQL", "NoSQL", "HTML", "CSS", "Sass", "GraphQL", "REST", "gRPC", "Bash",
+    "React", "Angular", "Vue", "Svelte", "NextJS", "Node.js", "Express", "Django", "Flask",
+    "FastAPI", "Spring Boot", "Ruby on Rails", "Laravel", "Tailwind", "jQuery",
+    "Redux", "React Native", "Flutter",
+    "Machine Learning", "Deep Learning", "Natural Language Processing",
+    "Artificial Intelligence", "Computer Vision", "Data Analysis", "Data Science",
+    "Data Engineering", "Statistics", "TensorFlow", "PyTorch", "Keras", "Scikit-learn",
+    "Pandas", "NumPy", "Spark", "Hadoop", "Airflow", "Kafka", "dbt",
+    "Microservices", "System Design", "Distributed Systems", "DevOps", "CI/CD",
+    "Agile", "Scrum", "TDD", "Unit Testing", "OOP", "Data Structures", "Algorithms",
+)
+KNOWN_TOOLS = (
+    "Docker", "Kubernetes", "Terraform", "Ansible", "Jenkins", "GitHub Actions", "GitLab",
+    "Git", "GitHub", "Bitbucket", "Jira", "Confluence", "AWS", "Azure", "GCP", "Heroku",
+    "PostgreSQL", "MySQL", "SQLite", "MongoDB", "Redis", "Elasticsearch", "Cassandra",
+    "DynamoDB", "SQL Server", "Oracle", "Snowflake", "BigQuery", "Redshift", "RabbitMQ",
+    "Nginx", "Linux", "Prometheus", "Grafana", "Datadog", "Splunk", "Tableau", "Power BI",
+    "Excel", "Figma", "Postman", "Selenium", "Cypress", "Jest", "Pytest", "Webpack",
+    "Vite", "Celery", "Streamlit", "Jupyter", "Databricks", "Salesforce", "SAP",
+)
+
+# Canonical keys that are common English words or too short to trust in prose
+_AMBIGUOUS_TERMS = frozenset({
+    "go", "c", "r", "ai", "ml", "dl", "tf", "ts", "py", "js", "node", "net", "express",
+    "rest", "swift", "spark", "excel", "oracle", "sap", "agile", "scrum", "statistics",
+    "algorithms", "dart", "perl",
+})
+
+# fold_skill tokens: words keeping + # and inner dots (C++, C#, Node.js)
+_TOKEN_RE = re.compile(r"[\w+#]+(?:\.[\w+#]+)*")
+
+
+def _build_term_index() -> tuple[dict[str, tuple[str, str, str]], dict[str, int]]:
+    """Folded phrase -> (canonical key, kind, display name), plus the longest
+    phrase width in words for every first word."""
+    terms: dict[str, tuple[str, str]] = {}
+    for kind, names in (("skill", KNOWN_SKILLS), ("tool", KNOWN_TOOLS)):
+        for name in names:
+            terms[canonical_skill(name)] = (kind, name)
+    for alias, canonical in SKILL_ALIASES.items():
+        if canonical in terms:
+            terms.setdefault(alias, terms[canonical])
+    # Ambiguous single words stay matchable as part of longer phrases only
+    phrases = {
+        phrase: (canonical_skill(phrase), kind, display)
+        for phrase, (kind, display) in terms.items()
+        if phrase not in _AMBIGUOUS_TERMS
+    }
+    starts: dict[str, int] = {}
+    for phrase in phrases:
+        words = phrase.split()
+        starts[words[0]] = max(starts.get(words[0], 0), len(words))
+    return phrases, starts
+
+
+_TERM_INDEX, _TERM_STARTS = _build_term_index()
+
+
+def find_known_skills(text: str) -> dict[str, list[str]]:
+    """Dictionary-match known skills and tools in free text, in order of first mention.
+
+    Works on the same folded tokens as ``fold_skill``. Only tokens that start a
+    known phrase are expanded, longest phrase first, so the scan is linear in
+    the text length. Returns {"skills": [...], "tools": [...]} as display names.
+    """
+    tokens = _TOKEN_RE.findall(text.lower())
+    found = {"skill": {}, "tool": {}}
+    i, n = 0, len(tokens)
+    while i < n:
+        width = _TERM_STARTS.get(tokens[i])
+        if width:
+            for w in range(min(width, n - i), 0, -1):
+                hit = _TERM_INDEX.get(" ".join(tokens[i : i + w]))
+                if hit:
+                    canonical, kind, display = hit
+                    found[kind].setdefault(canonical, display)
+                    i += w - 1
+                    break
+        i += 1
+    return {"skills": list(found["skill"].values()), "tools": list(found["tool"].values())}
@@ -110,6 +110,16 @@ def upload_cvs(folder_id: str, files: list[tuple[str, bytes]]) -> dict:
     return _handle_response(resp)
 
 
+def upload_archive(folder_id: str, filename: str, content: bytes) -> dict:
+    resp = httpx.post(
+        f"{BASE_URL}/folders/{folder_id}/upload-archive",
+        files=[("file", (filename, content))],
+        headers=_headers(),
+        timeout=300,
+    )
+    return _handle_response(resp)
+
+
 def list_folders() -> list:
     resp = httpx.get(f"{BASE_URL}/folders/", headers=_headers())
     return _handle_response(resp)
@@ -131,12 +141,16 @@ def delete_folder(folder_id: str):
 
 
 # CVs
-def list_cvs(folder_id: str | None = None, status: str | None = None) -> list:
+def list_cvs(
+    folder_id: str | None = None, status: str | None = None, skills: list[str] | None = None
+) -> list:
     params = {}
     if folder_id:
         params["folder_id"] = folder_id
     if status:
         params["status"] = status
+    if skills:
+        params["skills"] = skills
     resp = httpx.get(f"{BASE_URL}/cvs/", params=params, headers=_headers())
     return _handle_response(resp)
 
@@ -152,19 +166,71 @@ def get_progress(task_id: str) -> dict:
 
 
 # Matching
-def trigger_matching(jd_id: str, cv_file_ids: list[str] | None = None) -> dict:
-    body = {"jd_id": jd_id}
+def trigger_matching(
+    jd_id: str,
+    cv_file_ids: list[str] | None = None,
+    mode: str = "full",
+    top_k: int | None = None,
+    force: bool = False,
+) -> dict:
+    body = {"jd_id": jd_id, "mode": mode, "force": force}
     if cv_file_ids:
         body["cv_file_ids"] = cv_file_ids
+    if top_k:
+        body["top_k"] = top_k
     resp = httpx.post(f"{BASE_URL}/matching/", json=body, headers=_headers())
     return _handle_response(resp)
 
 
+def trigger_role_matching(cv_file_id: str, top_k: int | None = None, force: bool = False) -> dict:
+    body = {"cv_file_id": cv_file_id, "force": force}
+    if top_k:
+        body["top_k"] = top_k
+    resp = httpx.post(f"{BASE_URL}/matching/roles", json=body, headers=_headers())
+    return _handle_response(resp)
+
+
+def get_best_roles(cv_file_id: str) -> list:
+    resp = httpx.get(f"{BASE_URL}/matching/roles/{cv_file_id}", headers=_headers())
+    return _handle_response(resp)
+
+
 def get_leaderboard(jd_id: str) -> list:
     resp = httpx.get(f"{BASE_URL}/matching/leaderboard/{jd_id}", headers=_headers())
     return _handle_response(resp)
 
 
+def get_leaderboard_page(
+    jd_id: str,
+    limit: int = 50,
+    cursor: str | None = None,
+    fit_status: str | None = None,
+    min_score: float | None = None,
+    skills: list[str] | None = None,
+    detail: bool = False,
+) -> dict:
+    params = {"limit": limit, "detail": detail}
+    if cursor:
+        params["cursor"] = cursor
+    if fit_status:
+        params["fit_status"] = fit_status
+    if min_score:
+        params["min_score"] = min_score
+    if skills:
+        params["skills"] = skills
+    resp = httpx.get(
+        f"{BASE_URL}/matching/leaderboard/{jd_id}/page", params=params, headers=_headers()
+    )
+    return _handle_response(resp)
+
+
+def preview_leaderboard(jd_id: str, weights: dict) -> list:
+    resp = httpx.post(
+        f"{BASE_URL}/matching/leaderboard/{jd_id}/what-if", json=weights, headers=_headers()
+    )
+    return _handle_response(resp)
+
+
 # Export
 def export_leaderboard(jd_id: str, fmt: str = "csv") -> bytes:
     resp = httpx.post(
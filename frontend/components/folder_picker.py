@@ -2,6 +2,9 @@ import streamlit as st
 
 from frontend import api_client
 
+ARCHIVE_TYPES = ["zip", "tar", "tgz", "gz"]
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tgz", ".tar.gz")
+
 
 def render_folder_picker():
     st.subheader("Create CV Collection")
@@ -38,8 +41,8 @@ def render_folder_picker():
         )
 
         uploaded_files = st.file_uploader(
-            "Upload CV files (PDF or DOCX)",
-            type=["pdf", "docx"],
+            "Upload CV files (PDF or DOCX) or ZIP/TAR archives of them",
+            type=["pdf", "docx", *ARCHIVE_TYPES],
             accept_multiple_files=True,
             key="cv_uploader",
         )
@@ -47,17 +50,30 @@ def render_folder_picker():
         if uploaded_files and selected_label:
             if st.button("Upload & Process", use_container_width=True, type="primary"):
                 folder_id = folder_options[selected_label]
-                file_data = [(f.name, f.getvalue()) for f in uploaded_files]
+                archives = [f for f in uploaded_files if f.name.lower().endswith(ARCHIVE_SUFFIXES)]
+                file_data = [
+                    (f.name, f.getvalue())
+                    for f in uploaded_files
+                    if not f.name.lower().endswith(ARCHIVE_SUFFIXES)
+                ]
 
-                with st.spinner(f"Uploading {len(file_data)} file(s)..."):
+                with st.spinner(f"Uploading {len(uploaded_files)} file(s)..."):
                     try:
-                        result = api_client.upload_cvs(folder_id, file_data)
-                        st.success(
-                            f"Uploaded: {result['new']} new, "
-                            f"{result['skipped']} duplicates skipped"
-                        )
-                        if result.get("task_id"):
-                            st.info("Processing started in background...")
+                        if file_data:
+                            result = api_client.upload_cvs(folder_id, file_data)
+                            st.success(
+                                f"Uploaded: {result['new']} new, "
+                                f"{result['skipped']} duplicates skipped"
+                            )
+                            if result.get("task_id"):
+                                st.info("Processing started in background...")
+                                st.session_state[f"task_{folder_id}"] = result["task_id"]
+                        for archive in archives:
+                            # Archives are unpacked and processed in the background
+                            result = api_client.upload_archive(
+                                folder_id, archive.name, archive.getvalue()
+                            )
+                            st.info(f"Importing {archive.name} in background...")
                             st.session_state[f"task_{folder_id}"] = result["task_id"]
                         st.rerun()
                     except Exception as e:
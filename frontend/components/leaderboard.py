@@ -8,8 +8,32 @@ def fit_color(status: str) -> str:
     return {"green": "🟢", "yellow": "🟡", "red": "🔴"}.get(status, "⚪")
 
 
+PAGE_SIZE = 50
+
+
 def render_leaderboard(jd_id: str):
-    entries = api_client.get_leaderboard(jd_id)
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        fit = st.selectbox("Fit", ["All", "green", "yellow", "red"], key=f"lb_fit_{jd_id}")
+    with col2:
+        min_score = st.slider("Min score", 0, 100, 0, key=f"lb_min_{jd_id}")
+    with col3:
+        skill_text = st.text_input("Must-have skills (comma separated)", key=f"lb_skills_{jd_id}")
+    skills = [s.strip() for s in skill_text.split(",") if s.strip()]
+
+    # Cursor stack per JD and filter combination; index 0 is the first page
+    filters_key = f"lb_cursors_{jd_id}_{fit}_{min_score}_{skill_text}"
+    cursors = st.session_state.setdefault(filters_key, [None])
+    page = api_client.get_leaderboard_page(
+        jd_id,
+        limit=PAGE_SIZE,
+        cursor=cursors[-1],
+        fit_status=None if fit == "All" else fit,
+        min_score=min_score or None,
+        skills=skills,
+        detail=True,
+    )
+    entries = page["entries"]
     if not entries:
         st.info("No match results yet. Run matching first.")
         return
@@ -44,6 +68,16 @@ def render_leaderboard(jd_id: str):
         selection_mode="single-row",
     )
 
+    prev_col, next_col = st.columns(2)
+    with prev_col:
+        if len(cursors) > 1 and st.button("← Previous", key=f"lb_prev_{jd_id}"):
+            cursors.pop()
+            st.rerun()
+    with next_col:
+        if page.get("next_cursor") and st.button("Next →", key=f"lb_next_{jd_id}"):
+            cursors.append(page["next_cursor"])
+            st.rerun()
+
     if selected and selected.selection and selected.selection.rows:
         row_idx = selected.selection.rows[0]
         entry = rows[row_idx]
@@ -33,10 +33,30 @@ def render():
             st.markdown(f"**Min Experience:** {jd['min_experience_years']} years")
 
     col1, col2 = st.columns([1, 4])
+    with col2:
+        shortlist = st.checkbox(
+            "Shortlist first",
+            help="Score everyone locally and only send the top candidates to the AI matcher",
+        )
+        top_k = st.number_input("Top candidates", min_value=1, value=50, disabled=not shortlist)
+        force = st.checkbox(
+            "Re-match unchanged CVs",
+            help="By default CVs already matched against this JD with the same inputs are skipped",
+        )
     with col1:
         if st.button("🚀 Run Matching", use_container_width=True):
             try:
-                result = api_client.trigger_matching(jd_id)
+                if shortlist:
+                    result = api_client.trigger_matching(
+                        jd_id, mode="shortlist", top_k=int(top_k), force=force
+                    )
+                else:
+                    result = api_client.trigger_matching(jd_id, force=force)
+                if result.get("prescores"):
+                    st.info(f"Pre-scored {len(result['prescores'])} CVs locally")
+                if not result["task_id"]:
+                    st.warning("No candidates passed the shortlist")
+                    return
                 st.success(f"Matching started for {result['total_cvs']} CVs")
                 render_progress(result["task_id"], "Matching")
                 st.rerun()
@@ -1,8 +1,12 @@
+import json
+from types import SimpleNamespace
+
 import pytest
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from backend.database import Base
+from backend.utils import llm_client
 
 
 @pytest.fixture(scope="session")
@@ -23,3 +27,36 @@ def db(engine):
     yield session
     session.rollback()
     session.close()
+
+
+class StubAsyncGroq:
+    """Stands in for groq.AsyncGroq: replies with ``reply`` and records every request."""
+
+    reply: dict = {}
+    requests: list[dict] = []
+
+    def __init__(self, **kwargs):
+        self.chat = SimpleNamespace(
+            completions=SimpleNamespace(with_raw_response=SimpleNamespace(create=self._create))
+        )
+
+    async def _create(self, **kwargs):
+        StubAsyncGroq.requests.append(kwargs)
+        response = SimpleNamespace(
+            usage=SimpleNamespace(total_tokens=50),
+            choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps(self.reply)))],
+        )
+
+        async def parse():
+            return response
+
+        return SimpleNamespace(headers={}, parse=parse)
+
+
+@pytest.fixture
+def stub_groq(monkeypatch):
+    monkeypatch.setattr(llm_client, "AsyncGroq", StubAsyncGroq)
+    monkeypatch.setattr(llm_client, "_async_client", None)
+    monkeypatch.setattr(StubAsyncGroq, "requests", [])
+    monkeypatch.setattr(StubAsyncGroq, "reply", {})
+    return StubAsyncGroq
@@ -0,0 +1,64 @@
+"""Small builders for the rows most service tests need."""
+
+import uuid
+
+from backend.models.cv_file import CVFile
+from backend.models.job_description import JobDescription
+from backend.models.match_result import MatchResult
+from backend.models.monitored_folder import MonitoredFolder
+from backend.models.parsed_cv import ParsedCV
+from backend.models.user import User
+from backend.services.matcher import match_row
+
+
+def make_user(db) -> User:
+    user = User(email=f"{uuid.uuid4()}@example.com", hashed_password="x", full_name="Test")
+    db.add(user)
+    db.flush()
+    return user
+
+
+def make_folder(db, user: User) -> MonitoredFolder:
+    folder = MonitoredFolder(user_id=user.id, folder_path=f"cloud://{uuid.uuid4()}", label="CVs")
+    db.add(folder)
+    db.flush()
+    return folder
+
+
+def make_parsed_cv(db, folder: MonitoredFolder, name: str = "Jane Roe", **fields) -> CVFile:
+    cv = CVFile(
+        folder_id=folder.id,
+        file_name=f"{name}.pdf",
+        file_path=f"/cvs/{uuid.uuid4()}.pdf",
+        file_hash=uuid.uuid4().hex * 2,
+        status="processed",
+    )
+    db.add(cv)
+    db.flush()
+    fields.setdefault("skills", ["Python"])
+    fields.setdefault("total_experience_years", 5)
+    db.add(ParsedCV(cv_file_id=cv.id, candidate_name=name, **fields))
+    db.flush()
+    return cv
+
+
+def make_jd(db, user: User, title: str = "Backend Engineer", **fields) -> JobDescription:
+    fields.setdefault("required_skills", ["Python"])
+    jd = JobDescription(user_id=user.id, title=title, raw_text=title, **fields)
+    db.add(jd)
+    db.flush()
+    return jd
+
+
+def make_match(db, cv: CVFile, jd: JobDescription, weights: dict, **scores):
+    result = {
+        "skills_score": 50,
+        "experience_score": 50,
+        "projects_score": 50,
+        "keywords_score": 50,
+        **scores,
+    }
+    match = MatchResult(**match_row(cv.id, jd.id, weights, result))
+    db.add(match)
+    db.flush()
+    return match
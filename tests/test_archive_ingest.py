@@ -0,0 +1,105 @@
+import io
+import os
+import tarfile
+import uuid
+import zipfile
+
+import pytest
+
+from backend.config import settings
+from backend.models.cv_file import CVFile
+from backend.models.monitored_folder import MonitoredFolder
+from backend.models.user import User
+from backend.services import archive_ingest
+from backend.services.archive_ingest import ArchiveIngest, ArchiveLimitExceeded
+
+
+@pytest.fixture
+def folder(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(archive_ingest, "UPLOAD_DIR", str(tmp_path / "uploads"))
+    user = User(email=f"{uuid.uuid4()}@example.com", hashed_password="x", full_name="Test")
+    db.add(user)
+    db.flush()
+    folder = MonitoredFolder(user_id=user.id, folder_path="cloud://Archive", label="Archive")
+    db.add(folder)
+    db.flush()
+    return folder
+
+
+def _zip(path, members, compression=zipfile.ZIP_DEFLATED):
+    with zipfile.ZipFile(path, "w", compression) as archive:
+        for name, content in members:
+            archive.writestr(name, content)
+    return str(path)
+
+
+def test_zip_members_are_registered_in_batches(db, folder, tmp_path):
+    path = _zip(
+        tmp_path / "cvs.zip",
+        [(f"2024/cv-{i}.pdf", f"cv {i}".encode()) for i in range(5)]
+        + [("dup.pdf", b"cv 0"), ("readme.txt", b"ignored"), ("nested/", b"")],
+    )
+    batches = []
+    stats = ArchiveIngest(db, folder, path, on_batch=batches.append, batch_size=2).run()
+
+    assert (stats.members, stats.new, stats.skipped, stats.ignored) == (7, 5, 1, 1)
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    cv = db.get(CVFile, uuid.UUID(batches[0][0]))
+    assert cv.file_name == "cv-0.pdf"
+    assert open(cv.file_path, "rb").read() == b"cv 0"
+    assert len(os.listdir(tmp_path / "uploads")) == 5
+
+
+def test_tar_gz_members_are_streamed(db, folder, tmp_path):
+    path = tmp_path / "cvs.tar.gz"
+    with tarfile.open(path, "w:gz") as archive:
+        for name, content in [("a/cv.docx", b"docx"), ("b/cv.pdf", b"pdf")]:
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            archive.addfile(info, io.BytesIO(content))
+
+    result = archive_ingest.ingest_archive(db, folder, str(path))
+    assert (result["members"], result["new"]) == (2, 2)
+    assert path.exists()  # only spool directories of uploads are removed
+
+
+def test_zip_bomb_limits(db, folder, tmp_path, monkeypatch):
+    bomb = _zip(tmp_path / "bomb.zip", [("cv.pdf", b"\0" * 1_000_000)])
+    with pytest.raises(ArchiveLimitExceeded):
+        ArchiveIngest(db, folder, bomb).run()
+
+    monkeypatch.setattr(settings, "ARCHIVE_MAX_MEMBERS", 3)
+    many = _zip(tmp_path / "many.zip", [(f"{i}.pdf", bytes([i])) for i in range(4)])
+    with pytest.raises(ArchiveLimitExceeded):
+        ArchiveIngest(db, folder, many).run()
+
+    monkeypatch.setattr(settings, "UPLOAD_MAX_FILE_BYTES", 3)
+    mixed = _zip(tmp_path / "mixed.zip", [("big.pdf", b"too big"), ("ok.pdf", b"ok")])
+    stats = ArchiveIngest(db, folder, mixed).run()
+    assert (stats.new, stats.too_large) == (1, 1)
+
+
+def test_skipped_tar_members_count_towards_the_total(db, folder, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "ARCHIVE_MAX_TOTAL_BYTES", 1_000_000)
+    path = tmp_path / "bomb.tar.gz"
+    with tarfile.open(path, "w:gz") as archive:
+        for name, size in [("cv.pdf", 10), ("a.txt", 600_000), ("b.txt", 600_000)]:
+            info = tarfile.TarInfo(name)
+            info.size = size
+            archive.addfile(info, io.BytesIO(b"\0" * size))
+
+    with pytest.raises(ArchiveLimitExceeded, match="expands"):
+        ArchiveIngest(db, folder, str(path)).run()
+
+
+def test_ratio_limit_only_applies_to_extracted_members(db, folder, tmp_path):
+    path = _zip(tmp_path / "cvs.zip", [("log.txt", b"\0" * 1_000_000), ("cv.pdf", b"cv")])
+    stats = ArchiveIngest(db, folder, path).run()
+    assert (stats.new, stats.ignored) == (1, 1)
+
+
+def test_non_archive_is_rejected(db, folder, tmp_path):
+    path = tmp_path / "cv.zip"
+    path.write_bytes(b"not an archive")
+    with pytest.raises(ValueError):
+        ArchiveIngest(db, folder, str(path)).run()
@@ -0,0 +1,112 @@
+import uuid
+
+from backend.models.job_description import JobDescription
+from backend.models.parsed_cv import ParsedCV
+from backend.services import candidate_matrix
+from backend.services.candidate_matrix import (
+    CandidateMatrix,
+    get_candidate_matrix,
+    on_cv_parsed,
+    on_cvs_deleted,
+)
+from backend.services.prescorer import prescore
+from tests.factories import make_folder, make_parsed_cv, make_user
+
+WEIGHTS = {"skills": 0.4, "experience": 0.3, "projects": 0.2, "keywords": 0.1}
+
+
+def _jd():
+    return JobDescription(
+        title="Platform Engineer",
+        required_skills=["Kubernetes", "Terraform", "Go"],
+        preferred_skills=["AWS"],
+        keywords=["CI/CD", "Kubernetes"],
+        min_experience_years=5,
+        scoring_weights=WEIGHTS,
+    )
+
+
+def _cv(skills, years, tools=None):
+    return ParsedCV(
+        cv_file_id=uuid.uuid4(),
+        candidate_name="Candidate",
+        skills=skills,
+        tools=tools or [],
+        total_experience_years=years,
+    )
+
+
+def test_matrix_scores_match_prescorer():
+    jd = _jd()
+    cvs = [
+        _cv(["Kubernetes", "Terraform", "Go"], 7, tools=["AWS", "CI/CD"]),
+        _cv(["Go"], 2),
+        _cv(["Excel"], None),
+        _cv(["kubernetes", "AWS"], 5),
+    ]
+    matrix = CandidateMatrix()
+    for cv in cvs:
+        matrix.upsert_parsed(cv)
+
+    ranked = matrix.score(jd)
+    assert [r["rank"] for r in ranked] == [1, 2, 3, 4]
+    by_id = {r["cv_file_id"]: r for r in ranked}
+    for cv in cvs:
+        expected = prescore(jd, cv, WEIGHTS)
+        got = by_id[str(cv.cv_file_id)]
+        assert got["score"] == expected["prescore"]
+        assert got["skills_score"] == expected["skills_score"]
+        assert got["experience_score"] == expected["experience_score"]
+    assert ranked[0]["cv_file_id"] == str(cvs[0].cv_file_id)
+    assert ranked[0]["coverage"] == 1.0
+    assert by_id[str(cvs[1].cv_file_id)]["experience_gap"] == 3.0
+
+
+def test_matrix_incremental_update_and_delete():
+    jd = _jd()
+    matrix = CandidateMatrix()
+    cv = _cv(["Excel"], 1)
+    other = _cv(["Go"], 1)
+    matrix.upsert_parsed(cv)
+    matrix.upsert_parsed(other)
+    assert matrix.score(jd)[0]["cv_file_id"] == str(other.cv_file_id)
+
+    cv.skills = ["Kubernetes", "Terraform", "Go"]
+    cv.total_experience_years = 8
+    matrix.upsert_parsed(cv)
+    ranked = matrix.score(jd, limit=1)
+    assert len(ranked) == 1
+    assert ranked[0]["cv_file_id"] == str(cv.cv_file_id)
+
+    matrix.remove([str(cv.cv_file_id)])
+    ranked = matrix.score(jd)
+    assert [r["cv_file_id"] for r in ranked] == [str(other.cv_file_id)]
+    assert len(matrix) == 1
+
+
+def test_changes_during_the_initial_load_are_replayed(db, monkeypatch):
+    monkeypatch.setattr(candidate_matrix, "_matrices", {})
+    monkeypatch.setattr(candidate_matrix, "_loading", {})
+    user = make_user(db)
+    folder = make_folder(db, user)
+    kept = make_parsed_cv(db, folder, "Kept")
+    deleted = make_parsed_cv(db, folder, "Deleted")
+    load_matrix = candidate_matrix._load_matrix
+    late_ids = []
+
+    def load_while_cvs_change(db, user_id, matrix):
+        load_matrix(db, user_id, matrix)
+        # Parsed and deleted after the query read its rows
+        late = make_parsed_cv(db, folder, "Late", skills=["Go"])
+        late_parsed = db.query(ParsedCV).filter(ParsedCV.cv_file_id == late.id).one()
+        on_cv_parsed(db, late, late_parsed)
+        on_cvs_deleted(user.id, [str(deleted.id)])
+        assert len(matrix) == 2
+        late_ids.append(str(late.id))
+
+    monkeypatch.setattr(candidate_matrix, "_load_matrix", load_while_cvs_change)
+    matrix = get_candidate_matrix(db, user.id)
+
+    assert set(matrix.row_index) == {str(kept.id), late_ids[0]}
+    assert get_candidate_matrix(db, user.id) is matrix
+    assert candidate_matrix._loading == {}
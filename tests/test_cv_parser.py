@@ -0,0 +1,88 @@
+import uuid
+
+import pytest
+
+from backend.models.cv_file import CVFile
+from backend.models.monitored_folder import MonitoredFolder
+from backend.models.user import User
+from backend.services.cv_parser import (
+    extract_local_fields,
+    merge_parsed_fields,
+    parse_key,
+    process_single_cv,
+    save_parsed_cv,
+)
+from tests.factories import make_folder, make_user
+
+
+def test_parse_key_depends_on_content_and_model():
+    base = parse_key("a" * 64, model="model-a")
+    assert base == parse_key("a" * 64, model="model-a")
+    assert base != parse_key("b" * 64, model="model-a")
+    assert base != parse_key("a" * 64, model="model-b")
+    assert len(base) == 64
+
+
+def test_extract_local_fields_finds_contact_details_and_skills():
+    text = (
+        "Jane Roe\n"
+        "jane.roe+cv@mail.co.uk | +44 (20) 7946-0958\n"
+        "Acme Corp 2019 - 2022: Python3, k8s and Postgres on Amazon Web Services.\n"
+        "I like to go hiking."
+    )
+    local = extract_local_fields(text)
+    assert local["email"] == "jane.roe+cv@mail.co.uk"
+    assert local["phone"] == "+44 (20) 7946-0958"
+    assert local["skills"] == ["Python"]
+    assert local["tools"] == ["Kubernetes", "PostgreSQL", "AWS"]
+
+
+def test_extract_local_fields_ignores_year_ranges():
+    assert extract_local_fields("Engineer, 2015 - 2019")["phone"] is None
+
+
+def test_merge_parsed_fields_dedupes_llm_skills():
+    local = {"email": "a@b.io", "phone": None, "skills": ["Python"], "tools": ["Docker"]}
+    parsed = {"candidate_name": "A", "email": "wrong", "skills": ["python", "Rust"], "tools": None}
+    merged = merge_parsed_fields(local, parsed)
+    assert merged["candidate_name"] == "A"
+    assert merged["email"] == "a@b.io"
+    assert merged["skills"] == ["Python", "Rust"]
+    assert merged["tools"] == ["Docker"]
+
+
+def test_saving_an_existing_parse_keeps_its_key(db):
+    user = User(email=f"{uuid.uuid4()}@example.com", hashed_password="x", full_name="Test")
+    db.add(user)
+    db.flush()
+    folder = MonitoredFolder(user_id=user.id, folder_path=f"cloud://{uuid.uuid4()}", label="CVs")
+    db.add(folder)
+    db.flush()
+    cv = CVFile(folder_id=folder.id, file_name="cv.pdf", file_path="/cv.pdf", file_hash="c" * 64)
+    db.add(cv)
+    db.flush()
+
+    key = parse_key(cv.file_hash)
+    save_parsed_cv(db, cv, "text", {"candidate_name": "A", "summary": "first"}, key)
+    parsed = save_parsed_cv(
+        db, cv, "page 1\fpage 2", {"candidate_name": "A", "summary": "second"}, key
+    )
+    assert parsed.summary == "second"
+    assert parsed.parse_key == key
+    assert parsed.raw_text == "page 1\npage 2"
+
+
+def test_reparsing_an_unretained_upload_fails_clearly(db):
+    cv = CVFile(
+        folder_id=make_folder(db, make_user(db)).id,
+        file_name="cv.pdf",
+        file_path="upload://" + "d" * 64 + ".pdf",
+        file_hash="d" * 64,
+    )
+    db.add(cv)
+    db.flush()
+
+    with pytest.raises(ValueError, match="Original upload not retained"):
+        process_single_cv(db, str(cv.id), use_cache=False)
+    assert cv.status == "error"
+    assert cv.error_message.startswith("Original upload not retained")
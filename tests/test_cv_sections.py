@@ -0,0 +1,47 @@
+from backend.utils.cv_sections import clean_lines, compact_cv_text, split_sections
+
+
+def test_clean_lines_drops_page_furniture_and_doubled_lines():
+    text = (
+        "Jane   Roe\n\nExperience\n- Built   things\n- Built things\nACME CV  \nPage 1 of 3\f"
+        "Education\nBSc\nACME CV\n2/3\f"
+        "Projects\nCV Tracker\nACME CV\nPage 3 of 3"
+    )
+    assert clean_lines(text) == [
+        "Jane Roe", "Experience", "- Built things", "Education", "BSc", "Projects", "CV Tracker"
+    ]
+
+
+def test_clean_lines_keeps_repeated_job_titles():
+    text = (
+        "Jane Roe\nExperience\nSoftware Engineer\nAcme, 2020-2023\n"
+        "Software Engineer\nGlobex, 2017-2020\fSoftware Engineer\nInitech, 2015-2017\n"
+        "Page 2"
+    )
+    assert clean_lines(text).count("Software Engineer") == 3
+    assert "Page 2" not in clean_lines(text)
+
+
+def test_split_sections_recognises_heading_variants():
+    lines = ["Jane Roe", "PROFESSIONAL EXPERIENCE:", "Dev at X", "Skills & Tools", "Python"]
+    sections = split_sections(lines)
+    assert [s.name for s in sections] == ["header", "experience", "skills"]
+
+
+def test_compact_keeps_late_sections_and_drops_low_priority_ones():
+    experience = [f"- Delivered project number {i} with a long description" for i in range(400)]
+    text = "\n".join(
+        ["Jane Roe", "jane@x.io", "Experience", *experience, "Projects", "CV Tracker",
+         "Certifications", "AWS Certified", "Hobbies", "Chess"]
+    )
+    compacted = compact_cv_text(text, max_tokens=500)
+    assert len(compacted) <= 500 * 4
+    assert compacted.startswith("Jane Roe\njane@x.io\nExperience\n- Delivered project number 0")
+    assert "Projects\nCV Tracker" in compacted
+    assert "Certifications\nAWS Certified" in compacted
+    assert "Hobbies" not in compacted
+
+
+def test_compact_leaves_text_under_budget_untouched():
+    text = "Jane  Roe\n\n\nSkills\nPython\nSkills\nPython\n"
+    assert compact_cv_text(text, max_tokens=100) == text
@@ -0,0 +1,149 @@
+import io
+
+import pytest
+from docx import Document
+from docx.shared import Inches
+from reportlab.pdfgen import canvas
+
+from backend.services import file_parser
+from backend.services.file_parser import (
+    extract_text,
+    extract_text_from_docx,
+    extract_text_from_pdf,
+    iter_docx_lines,
+    pdf_text_quality_ok,
+)
+
+LINE = "Senior Python engineer who built data pipelines on AWS and Kubernetes"
+
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    path = tmp_path / "cv.pdf"
+    c = canvas.Canvas(str(path))
+    for page in range(3):
+        for i in range(5):
+            c.drawString(50, 800 - 20 * i, f"{LINE} {page}.{i}")
+        c.showPage()
+    c.save()
+    return str(path)
+
+
+def test_pdf_text_quality_heuristic():
+    assert pdf_text_quality_ok([LINE * 3, LINE * 2])
+    assert not pdf_text_quality_ok([])
+    assert not pdf_text_quality_ok(["Jane Roe", ""])
+    assert not pdf_text_quality_ok([LINE.replace(" ", "") * 3])
+    assert not pdf_text_quality_ok([LINE * 3 + "�" * 30])
+
+
+@pytest.mark.parametrize("engine", ["pypdf2", "pdfplumber"])
+def test_engines_extract_every_page(pdf_path, engine):
+    text = extract_text_from_pdf(pdf_path, engines=[engine])
+    assert f"{LINE} 0.0" in text
+    assert f"{LINE} 2.4" in text
+
+
+def test_falls_back_when_fast_engine_output_is_poor(pdf_path, monkeypatch):
+    calls = []
+
+    def poor(file_path, start, stop):
+        calls.append("poor")
+        return ["x"] * (stop - start)
+
+    def broken(file_path, start, stop):
+        raise RuntimeError("boom")
+
+    monkeypatch.setitem(file_parser.PDF_ENGINES, "poor", poor)
+    monkeypatch.setitem(file_parser.PDF_ENGINES, "broken", broken)
+    text = extract_text_from_pdf(pdf_path, engines=["poor", "broken", "pypdf2"])
+    assert calls == ["poor"]
+    assert LINE in text
+    # With no better engine left, the poor output is still returned
+    assert extract_text_from_pdf(pdf_path, engines=["poor", "broken"]) == "x\nx\nx"
+    assert extract_text_from_pdf(pdf_path, ["poor"], page_separator="\f") == "x\fx\fx"
+
+
+def test_damaged_pdf_falls_back_to_pdfplumber(pdf_path):
+    content = open(pdf_path, "rb").read()
+    truncated = content[: content.rindex(b"%%EOF")]
+    prefixed = b"junk before the header\n" + content
+    for damaged in (truncated, prefixed):
+        text = extract_text(damaged, "cv.pdf")
+        assert f"{LINE} 0.0" in text and f"{LINE} 2.4" in text
+
+
+def test_page_cap_and_parallel_chunks(pdf_path, monkeypatch):
+    monkeypatch.setattr(file_parser.settings, "PDF_MAX_PAGES", 2)
+    assert f"{LINE} 2.0" not in extract_text_from_pdf(pdf_path, engines=["pypdf2"])
+
+    monkeypatch.setattr(file_parser.settings, "PDF_MAX_PAGES", 0)
+    monkeypatch.setattr(file_parser.settings, "PDF_PAGE_WORKERS", 2)
+    monkeypatch.setattr(file_parser.settings, "PDF_PARALLEL_MIN_PAGES", 2)
+    text = extract_text_from_pdf(pdf_path, engines=["pypdf2"])
+    assert text.index(f"{LINE} 0.0") < text.index(f"{LINE} 2.4")
+
+
+@pytest.fixture
+def docx_path(tmp_path):
+    doc = Document()
+    doc.add_paragraph("Jane Roe")
+    doc.add_paragraph("Experience")
+    table = doc.add_table(rows=2, cols=2)
+    table.cell(0, 0).text = "Company"
+    table.cell(0, 1).text = "Acme"
+    table.cell(1, 0).text = "Role"
+    table.cell(1, 1).text = "Engineer"
+    doc.add_paragraph("")
+    doc.add_paragraph("Skills: Python\tSQL")
+    path = tmp_path / "cv.docx"
+    doc.save(str(path))
+    return str(path)
+
+
+def test_streaming_docx_keeps_document_order(docx_path):
+    assert list(iter_docx_lines(docx_path)) == [
+        "Jane Roe",
+        "Experience",
+        "Company | Acme",
+        "Role | Engineer",
+        "Skills: Python\tSQL",
+    ]
+
+
+def test_streaming_docx_ignores_tab_stop_definitions(tmp_path):
+    doc = Document()
+    para = doc.add_paragraph("Python Developer\t2019 - 2023")
+    para.paragraph_format.tab_stops.add_tab_stop(Inches(3))
+    para.paragraph_format.tab_stops.add_tab_stop(Inches(5))
+    doc.add_paragraph("Acme Corp")
+    path = tmp_path / "tabs.docx"
+    doc.save(str(path))
+    assert list(iter_docx_lines(str(path))) == ["Python Developer\t2019 - 2023", "Acme Corp"]
+
+
+def test_docx_engines_agree_on_content(docx_path):
+    streamed = extract_text_from_docx(docx_path, engines=["stream"])
+    legacy = extract_text_from_docx(docx_path, engines=["python-docx"])
+    assert sorted(streamed.splitlines()) == sorted(legacy.splitlines())
+
+
+def test_docx_falls_back_to_next_engine(docx_path, monkeypatch):
+    def broken(file_path):
+        raise KeyError("word/document.xml")
+
+    monkeypatch.setitem(file_parser.DOCX_ENGINES, "broken", broken)
+    assert "Jane Roe" in extract_text_from_docx(docx_path, engines=["broken", "python-docx"])
+
+
+def test_extract_text_from_in_memory_content(pdf_path, docx_path):
+    pdf_bytes = open(pdf_path, "rb").read()
+    docx_bytes = open(docx_path, "rb").read()
+    expected_pdf = extract_text(pdf_path)
+    assert extract_text(pdf_bytes, "cv.pdf") == expected_pdf
+    assert extract_text(memoryview(pdf_bytes), "cv.PDF") == expected_pdf
+    stream = io.BytesIO(docx_bytes)
+    stream.read()
+    assert extract_text(stream, "cv.docx") == extract_text(docx_path)
+    with pytest.raises(ValueError, match="Unsupported file type"):
+        extract_text(pdf_bytes)
@@ -0,0 +1,112 @@
+import os
+import uuid
+
+import pytest
+
+from backend.config import settings
+from backend.models.cv_file import CVFile
+from backend.models.monitored_folder import MonitoredFolder
+from backend.models.user import User
+from backend.services.folder_scanner import FolderScanner
+from backend.services.folder_service import add_spooled_files, add_uploaded_files, scan_folder
+from backend.services.upload_stream import SpooledUpload
+
+
+@pytest.fixture
+def folder(db, tmp_path):
+    user = User(email=f"{uuid.uuid4()}@example.com", hashed_password="x", full_name="Test")
+    db.add(user)
+    db.flush()
+    folder = MonitoredFolder(user_id=user.id, folder_path=str(tmp_path), label="CVs")
+    db.add(folder)
+    db.flush()
+    (tmp_path / "a.pdf").write_bytes(b"cv a")
+    (tmp_path / "b.docx").write_bytes(b"cv b")
+    (tmp_path / "notes.txt").write_bytes(b"ignored")
+    return folder
+
+
+def test_rescan_skips_unchanged_files_by_stat(db, folder, tmp_path):
+    first = scan_folder(db, folder)
+    assert (first["new"], first["hashed"], first["stat_skipped"]) == (2, 2, 0)
+
+    second = scan_folder(db, folder)
+    assert (second["new"], second["hashed"], second["stat_skipped"]) == (0, 0, 2)
+    assert second["skipped"] == 2
+
+    # Touched but identical: hashed once, then skipped by stat again
+    stat = os.stat(tmp_path / "a.pdf")
+    os.utime(tmp_path / "a.pdf", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    third = scan_folder(db, folder)
+    assert (third["hashed"], third["modified"], third["skipped"]) == (1, 0, 2)
+    assert scan_folder(db, folder)["stat_skipped"] == 2
+
+    (tmp_path / "b.docx").write_bytes(b"cv b, revised")
+    fourth = scan_folder(db, folder)
+    assert (fourth["hashed"], fourth["modified"]) == (1, 1)
+
+
+def test_scan_recurses_and_streams_batches(db, folder, tmp_path):
+    nested = tmp_path / "2024" / "march"
+    nested.mkdir(parents=True)
+    for i in range(5):
+        (nested / f"cv-{i}.pdf").write_bytes(f"nested cv {i}".encode())
+
+    batches = []
+    progress = []
+    result = FolderScanner(
+        db, folder, on_batch=batches.append, on_progress=progress.append, batch_size=2, workers=2
+    ).run()
+
+    assert (result.total_on_disk, result.new) == (7, 7)
+    assert [len(batch) for batch in batches] == [2, 2, 2, 1]
+    assert sorted(cv_id for batch in batches for cv_id in batch) == sorted(result.new_cv_ids)
+    assert progress
+    paths = {row.file_path for row in db.query(CVFile).filter(CVFile.folder_id == folder.id)}
+    assert str(nested / "cv-4.pdf") in paths
+
+
+def test_scan_skips_files_removed_mid_scan(db, folder, tmp_path, monkeypatch):
+    from backend.services import folder_scanner
+
+    hash_file = folder_scanner.compute_file_hash
+
+    def hash_after_removal(path):
+        if path.endswith("a.pdf"):
+            os.remove(path)
+        return hash_file(path)
+
+    monkeypatch.setattr(folder_scanner, "compute_file_hash", hash_after_removal)
+    result = FolderScanner(db, folder, batch_size=1).run()
+
+    assert (result.total_on_disk, result.new, result.errors) == (2, 1, 1)
+    paths = {row.file_path for row in db.query(CVFile).filter(CVFile.folder_id == folder.id)}
+    assert paths == {str(tmp_path / "b.docx")}
+
+
+def test_upload_dedupes_within_request_and_against_folder(db, folder, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_KEEP_FILES", False)
+    first = add_uploaded_files(
+        db, folder, [("a.pdf", b"one"), ("copy.pdf", b"one"), ("b.docx", b"two"), ("c.txt", b"x")]
+    )
+    assert (first["new"], first["skipped"]) == (2, 1)
+
+    contents = {}
+    second = add_uploaded_files(db, folder, [("b2.docx", b"two"), ("d.pdf", b"three")], contents)
+    assert (second["new"], second["skipped"]) == (1, 1)
+    assert contents == {second["new_cv_ids"][0]: b"three"}
+    cv = db.get(CVFile, uuid.UUID(second["new_cv_ids"][0]))
+    assert (cv.file_name, cv.file_size_bytes, cv.status) == ("d.pdf", 5, "new")
+
+
+def test_spooled_uploads_share_upload_dedup(db, folder):
+    def spooled(name, file_hash):
+        return SpooledUpload(name, file_hash, f"/uploads/{file_hash}.pdf", 10)
+
+    first = add_spooled_files(db, folder, [spooled("a.pdf", "h1"), spooled("a2.pdf", "h1")], 3)
+    assert (first["total_uploaded"], first["new"], first["skipped"]) == (3, 1, 1)
+
+    second = add_spooled_files(db, folder, [spooled("a.pdf", "h1"), spooled("b.pdf", "h2")], 2)
+    assert (second["new"], second["skipped"]) == (1, 1)
+    cv = db.get(CVFile, uuid.UUID(second["new_cv_ids"][0]))
+    assert (cv.file_path, cv.file_size_bytes) == ("/uploads/h2.pdf", 10)
@@ -35,3 +35,13 @@ def test_different_content_different_hash():
     finally:
         os.unlink(path1)
         os.unlink(path2)
+
+
+def test_mmap_path_matches_chunked_hash(tmp_path, monkeypatch):
+    from backend.utils import hashing
+
+    path = tmp_path / "large.bin"
+    path.write_bytes(os.urandom(3 * hashing.CHUNK_SIZE + 17))
+    chunked = compute_file_hash(str(path))
+    monkeypatch.setattr(hashing, "MMAP_THRESHOLD", 1)
+    assert compute_file_hash(str(path)) == chunked
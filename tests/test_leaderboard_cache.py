@@ -0,0 +1,52 @@
+import uuid
+
+import pytest
+
+from backend.services import leaderboard_cache, matcher
+from backend.services.leaderboard_cache import (
+    get_cached_leaderboard,
+    invalidate_leaderboard,
+    leaderboard_batch,
+    leaderboard_etag,
+)
+
+
+@pytest.fixture
+def builds(monkeypatch):
+    calls = []
+
+    def fake_get_leaderboard(db, jd_id):
+        calls.append(jd_id)
+        return [{"rank": 1, "build": len(calls)}]
+
+    monkeypatch.setattr(matcher, "get_leaderboard", fake_get_leaderboard)
+    return calls
+
+
+def test_snapshot_is_reused_until_invalidated(builds):
+    jd_id = uuid.uuid4()
+    assert leaderboard_etag(jd_id) is None
+    entries, etag = get_cached_leaderboard(None, jd_id)
+    assert get_cached_leaderboard(None, jd_id) == (entries, etag)
+    assert leaderboard_etag(jd_id) == etag
+    assert len(builds) == 1
+
+    invalidate_leaderboard(jd_id)
+    assert leaderboard_etag(jd_id) is None
+    new_entries, new_etag = get_cached_leaderboard(None, jd_id)
+    assert new_etag != etag
+    assert new_entries[0]["build"] == 2
+
+
+def test_running_batch_serves_last_snapshot(builds, monkeypatch):
+    jd_id = uuid.uuid4()
+    _, etag = get_cached_leaderboard(None, jd_id)
+    with leaderboard_batch([jd_id]):
+        invalidate_leaderboard(jd_id)
+        assert get_cached_leaderboard(None, jd_id)[1] == etag
+
+        monkeypatch.setattr(leaderboard_cache.settings, "LEADERBOARD_BATCH_REFRESH_SECONDS", 0)
+        assert get_cached_leaderboard(None, jd_id)[1] != etag
+    assert len(builds) == 2
+    # The end of the batch always publishes its final writes
+    assert leaderboard_etag(jd_id) is None
@@ -0,0 +1,59 @@
+import time
+
+from backend.config import settings
+from backend.utils import llm_cache
+from backend.utils.llm_cache import LLMCache, get_llm_cache, log_llm_cache_stats, make_cache_key
+
+
+def test_cache_key_depends_on_all_inputs():
+    base = make_cache_key("model-a", "system", "user", 0.1, True)
+    assert base == make_cache_key("model-a", "system", "user", 0.1, True)
+    assert base != make_cache_key("model-b", "system", "user", 0.1, True)
+    assert base != make_cache_key("model-a", "system", "other", 0.1, True)
+    assert base != make_cache_key("model-a", "system", "user", 0.2, True)
+    assert base != make_cache_key("model-a", "system", "user", 0.1, False)
+
+
+def test_cache_hit_and_miss_counters(tmp_path):
+    cache = LLMCache(str(tmp_path / "cache.sqlite3"))
+    assert cache.get("k1") is None
+    cache.set("k1", "model-a", {"skills_score": 80})
+    assert cache.get("k1") == {"skills_score": 80}
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["entries"] == 1
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = LLMCache(str(tmp_path / "cache.sqlite3"), max_entries=2)
+    cache.set("a", "m", "A")
+    time.sleep(0.01)
+    cache.set("b", "m", "B")
+    time.sleep(0.01)
+    cache.get("a")
+    time.sleep(0.01)
+    cache.set("c", "m", "C")
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+    assert cache.get("c") == "C"
+
+
+def test_cache_expires_entries(tmp_path):
+    cache = LLMCache(str(tmp_path / "cache.sqlite3"), ttl_seconds=1)
+    cache.set("k", "m", "value")
+    cache._conn.execute("UPDATE llm_cache SET created_at = created_at - 10")
+    assert cache.get("k") is None
+
+
+def test_default_cache_lives_in_the_data_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(llm_cache, "_cache", None)
+    monkeypatch.setattr(settings, "LLM_CACHE_ENABLED", True)
+    monkeypatch.setattr(settings, "LLM_CACHE_PATH", "")
+    monkeypatch.setattr(settings, "DATA_DIR", str(tmp_path / "data"))
+    assert log_llm_cache_stats() == {}
+
+    cache = get_llm_cache()
+    assert cache.path == str(tmp_path / "data" / "llm_cache.sqlite3")
+    cache.get("missing")
+    assert log_llm_cache_stats()["misses"] == 1
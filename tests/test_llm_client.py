@@ -0,0 +1,34 @@
+import asyncio
+import threading
+
+from backend.utils import llm_client
+from backend.utils.llm_cache import LLMCache
+
+
+def test_acall_llm_caches_off_the_event_loop(stub_groq, monkeypatch, tmp_path):
+    cache = LLMCache(str(tmp_path / "cache.sqlite3"))
+    threads = []
+    for name in ("get", "set"):
+        method = getattr(cache, name)
+
+        def record(*args, method=method):
+            threads.append(threading.current_thread())
+            return method(*args)
+
+        monkeypatch.setattr(cache, name, record)
+    monkeypatch.setattr(llm_client, "get_llm_cache", lambda: cache)
+    stub_groq.reply = {"ok": True}
+
+    async def call_twice():
+        loop_thread = threading.current_thread()
+        first = await llm_client.acall_llm("system", "user", model="model-a")
+        second = await llm_client.acall_llm("system", "user", model="model-a")
+        return first, second, loop_thread
+
+    first, second, loop_thread = asyncio.run(call_twice())
+    assert first == second == {"ok": True}
+    assert len(stub_groq.requests) == 1
+    assert stub_groq.requests[0]["model"] == "model-a"
+    # get (miss), set, get (hit): none of them on the loop thread
+    assert len(threads) == 3
+    assert loop_thread not in threads
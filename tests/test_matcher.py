@@ -0,0 +1,219 @@
+import uuid
+
+import pytest
+
+from backend.config import settings
+from backend.models.match_result import MatchResult
+from backend.services import matcher
+from backend.services.leaderboard_cache import get_cached_leaderboard, leaderboard_etag
+from backend.services.matcher import (
+    MatchResultWriter,
+    decode_leaderboard_cursor,
+    encode_leaderboard_cursor,
+    get_leaderboard,
+    match_fingerprint,
+    match_row,
+    plan_match_groups,
+    rescore_matches,
+    validate_batch_reply,
+)
+from backend.services.role_matcher import RoleMatchPlan
+from tests.factories import make_folder, make_jd, make_match, make_parsed_cv, make_user
+
+SUB_SCORES = [
+    {"skills_score": 90, "experience_score": 80, "projects_score": 70, "keywords_score": 60},
+    {"skills_score": 33, "experience_score": 67, "projects_score": 15, "keywords_score": 99},
+    {"skills_score": 45, "experience_score": 45, "projects_score": 45, "keywords_score": 45},
+    {"skills_score": 10, "experience_score": 20, "projects_score": 85, "keywords_score": 5},
+]
+WEIGHT_SETS = [
+    {"skills": 0.4, "experience": 0.3, "projects": 0.2, "keywords": 0.1},
+    {"skills": 0.7, "experience": 0.1, "projects": 0.1, "keywords": 0.1},
+    {"skills": 0.25, "experience": 0.25, "projects": 0.25, "keywords": 0.25},
+    {"skills": 0.33, "experience": 0.33, "projects": 0.17, "keywords": 0.17},
+]
+
+
+def _score(cv_id, **overrides):
+    result = {
+        "cv_file_id": cv_id,
+        "skills_score": 70,
+        "experience_score": 60,
+        "projects_score": 50,
+        "keywords_score": 40,
+    }
+    result.update(overrides)
+    return result
+
+
+def test_validate_batch_reply_keeps_only_valid_expected_entries():
+    group = [("a", {}), ("b", {}), ("c", {})]
+    reply = {
+        "results": [
+            _score("a"),
+            _score("b", skills_score=150),
+            _score("zzz"),
+            _score("a", skills_score=10),
+        ]
+    }
+    valid = validate_batch_reply(reply, group)
+    assert set(valid) == {"a"}
+    assert valid["a"]["skills_score"] == 70
+
+
+def test_validate_batch_reply_rejects_malformed_reply():
+    assert validate_batch_reply({"candidates": []}, [("a", {})]) == {}
+    assert validate_batch_reply(["not", "a", "dict"], [("a", {})]) == {}
+
+
+def test_plan_match_groups_respects_size_cap():
+    candidates = [(str(i), {"skills": ["Python"]}) for i in range(25)]
+    groups = plan_match_groups(candidates, {"title": "Dev"})
+    assert [len(g) for g in groups] == [10, 10, 5]
+    assert [cv_id for g in groups for cv_id, _ in g] == [str(i) for i in range(25)]
+
+
+def test_plan_match_groups_respects_token_budget(monkeypatch):
+    monkeypatch.setattr(settings, "MATCH_BATCH_TOKEN_BUDGET", 2500)
+    big = {"summary": "x" * 4000}
+    groups = plan_match_groups([("a", big), ("b", big), ("c", big)], {"title": "Dev"})
+    assert all(len(g) == 1 for g in groups)
+
+
+def test_match_fingerprint_tracks_inputs_not_key_order():
+    jd = {"title": "Dev", "required_skills": ["Python"]}
+    cv = {"name": "A", "skills": ["Python", "SQL"]}
+    base = match_fingerprint(jd, cv, model="m1")
+    assert match_fingerprint(dict(reversed(jd.items())), cv, model="m1") == base
+    assert match_fingerprint(jd, {**cv, "skills": ["Python"]}, model="m1") != base
+    assert match_fingerprint({**jd, "title": "Lead"}, cv, model="m1") != base
+    assert match_fingerprint(jd, cv, model="m2") != base
+
+
+def test_leaderboard_cursor_round_trip():
+    match_id = uuid.uuid4()
+    cursor = encode_leaderboard_cursor(71.35, match_id, 50)
+    assert decode_leaderboard_cursor(cursor) == (71.35, match_id, 50)
+    with pytest.raises(ValueError):
+        decode_leaderboard_cursor("not-a-cursor")
+
+
+@pytest.fixture
+def scored_jd(db):
+    user = make_user(db)
+    folder = make_folder(db, user)
+    jd = make_jd(db, user)
+    for i, scores in enumerate(SUB_SCORES):
+        make_match(db, make_parsed_cv(db, folder, f"Candidate {i}"), jd, WEIGHT_SETS[0], **scores)
+    return jd
+
+
+def _stored(db, jd):
+    db.expire_all()
+    return {
+        m.cv_file_id: (m.overall_score, m.fit_status)
+        for m in db.query(MatchResult).filter(MatchResult.jd_id == jd.id)
+    }
+
+
+@pytest.mark.parametrize("weights", WEIGHT_SETS)
+def test_rescore_matches_agrees_with_match_row(db, scored_jd, weights):
+    matches = db.query(MatchResult).filter(MatchResult.jd_id == scored_jd.id).all()
+    expected = {}
+    for m in matches:
+        scores = {key: getattr(m, key) for key in SUB_SCORES[0]}
+        row = match_row(m.cv_file_id, scored_jd.id, weights, scores)
+        expected[m.cv_file_id] = (row["overall_score"], row["fit_status"])
+
+    assert rescore_matches(db, scored_jd.id, weights) == len(SUB_SCORES)
+    assert _stored(db, scored_jd) == expected
+
+
+def test_what_if_leaderboard_leaves_stored_scores_alone(db, scored_jd):
+    before = _stored(db, scored_jd)
+    weights = {"skills": 0.0, "experience": 0.0, "projects": 1.0, "keywords": 0.0}
+
+    board = get_leaderboard(db, scored_jd.id, weights=weights)
+    assert [entry["projects_score"] for entry in board] == [85, 70, 45, 15]
+    assert [entry["overall_score"] for entry in board] == [85, 70, 45, 15]
+    assert _stored(db, scored_jd) == before
+    assert [entry["overall_score"] for entry in get_leaderboard(db, scored_jd.id)] == sorted(
+        (score for score, _ in before.values()), reverse=True
+    )
+
+
+@pytest.fixture
+def role_plan(db):
+    user = make_user(db)
+    cv = make_parsed_cv(db, make_folder(db, user))
+    jds = [make_jd(db, user, f"Role {i}") for i in range(5)]
+    db.commit()
+    return RoleMatchPlan(
+        cv_file_id=cv.id,
+        cv_data={},
+        jd_weights={str(jd.id): WEIGHT_SETS[0] for jd in jds},
+    )
+
+
+def _stored_for_cv(db, cv_file_id):
+    db.expire_all()
+    return {
+        str(m.jd_id): m
+        for m in db.query(MatchResult).filter(MatchResult.cv_file_id == cv_file_id)
+    }
+
+
+def test_writer_splits_large_writes_into_chunks(db, role_plan, monkeypatch):
+    chunks = []
+    upsert = matcher._upsert_match_rows
+    monkeypatch.setattr(
+        matcher, "_upsert_match_rows", lambda rows: chunks.append(len(rows)) or upsert(rows)
+    )
+    writer = MatchResultWriter(db, role_plan, chunk_size=2)
+    writer.add({jd_id: SUB_SCORES[0] for jd_id in role_plan.jd_weights})
+
+    assert chunks == [2, 2, 1]
+    assert writer.written == 5
+    assert set(_stored_for_cv(db, role_plan.cv_file_id)) == set(role_plan.jd_weights)
+
+
+def test_writer_keeps_the_last_result_for_a_repeated_pair(db, role_plan):
+    jd_id = next(iter(role_plan.jd_weights))
+    writer = MatchResultWriter(db, role_plan, chunk_size=10)
+    writer.add({jd_id: SUB_SCORES[0]})
+    writer.add({jd_id: SUB_SCORES[1]})
+    writer.flush()
+
+    assert writer.written == 1
+    stored = _stored_for_cv(db, role_plan.cv_file_id)
+    assert list(stored) == [jd_id]
+    assert stored[jd_id].skills_score == SUB_SCORES[1]["skills_score"]
+
+
+def test_writer_updates_existing_rows_in_place(db, role_plan):
+    jd_id = next(iter(role_plan.jd_weights))
+    writer = MatchResultWriter(db, role_plan)
+    writer.add({jd_id: SUB_SCORES[0]})
+    writer.flush()
+    first = _stored_for_cv(db, role_plan.cv_file_id)[jd_id]
+    first_id, first_score = first.id, first.overall_score
+
+    writer.add({jd_id: {**SUB_SCORES[3], "explanation": "Rescored"}})
+    writer.flush()
+    stored = _stored_for_cv(db, role_plan.cv_file_id)
+    assert len(stored) == 1
+    assert stored[jd_id].id == first_id
+    assert stored[jd_id].overall_score != first_score
+    assert stored[jd_id].explanation == "Rescored"
+
+
+def test_writer_flush_invalidates_cached_leaderboards(db, role_plan):
+    jd_id = next(iter(role_plan.jd_weights))
+    get_cached_leaderboard(db, uuid.UUID(jd_id))
+    assert leaderboard_etag(uuid.UUID(jd_id)) is not None
+
+    writer = MatchResultWriter(db, role_plan)
+    writer.add({jd_id: SUB_SCORES[0]})
+    assert leaderboard_etag(uuid.UUID(jd_id)) is not None
+    writer.flush()
+    assert leaderboard_etag(uuid.UUID(jd_id)) is None
@@ -0,0 +1,71 @@
+import asyncio
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from backend.services import parse_pipeline
+from backend.services.parse_pipeline import ParseJob
+
+
+@pytest.fixture
+def fake_stages(monkeypatch):
+    jobs = [ParseJob(uuid.uuid4(), f"cv-{i}.pdf", None) for i in range(20)]
+    jobs[5].content = b"uploaded bytes"
+    written = []
+
+    def fake_extract(source, filename, page_separator="\n"):
+        if filename == "cv-3.pdf":
+            raise ValueError("corrupt file")
+        return f"text of {source}"
+
+    def fake_write(db, job, stats):
+        written.append(job)
+        return job.error is None
+
+    monkeypatch.setattr(parse_pipeline, "extract_text", fake_extract)
+    monkeypatch.setattr(parse_pipeline, "_get_extract_pool", lambda: ThreadPoolExecutor(2))
+    monkeypatch.setattr(parse_pipeline, "prepare_parse_jobs", lambda *args: jobs)
+    monkeypatch.setattr(parse_pipeline, "write_parse_job", fake_write)
+    monkeypatch.setattr(parse_pipeline.settings, "PARSE_EXTRACT_WORKERS", 2)
+    monkeypatch.setattr(parse_pipeline.settings, "PARSE_PIPELINE_QUEUE_SIZE", 2)
+    monkeypatch.setattr(parse_pipeline, "parse_cv_text", lambda text: {"summary": text})
+
+    async def fake_aparse(text):
+        await asyncio.sleep(0)
+        return {"summary": text}
+
+    monkeypatch.setattr(parse_pipeline, "aparse_cv_text", fake_aparse)
+    return jobs, written
+
+
+def _check(jobs, written, results, stats):
+    assert sorted(j.file_path for j in written) == sorted(j.file_path for j in jobs)
+    assert results.count(False) == 1
+    failed = next(j for j in written if j.file_path == "cv-3.pdf")
+    assert isinstance(failed.error, ValueError)
+    ok = next(j for j in written if j.file_path == "cv-0.pdf")
+    assert ok.parsed == {"summary": "text of cv-0.pdf"}
+    assert jobs[5].parsed == {"summary": "text of b'uploaded bytes'"}
+    assert stats.max_llm_queue <= 2
+
+
+def test_threaded_pipeline_writes_every_job(fake_stages):
+    jobs, written = fake_stages
+    results = []
+    stats = parse_pipeline.run_parse_pipeline(None, [], results.append, llm_workers=3)
+    _check(jobs, written, results, stats)
+
+
+def test_async_pipeline_writes_every_job(fake_stages):
+    jobs, written = fake_stages
+    results = []
+    stats = asyncio.run(
+        parse_pipeline.arun_parse_pipeline(_FakeSession(), [], results.append, llm_workers=3)
+    )
+    _check(jobs, written, results, stats)
+
+
+class _FakeSession:
+    def commit(self):
+        pass
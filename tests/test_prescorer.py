@@ -0,0 +1,57 @@
+from backend.models.job_description import JobDescription
+from backend.models.parsed_cv import ParsedCV
+from backend.services.prescorer import prescore, select_shortlist
+
+WEIGHTS = {"skills": 0.4, "experience": 0.3, "projects": 0.2, "keywords": 0.1}
+
+
+def _jd(**kwargs):
+    defaults = {
+        "title": "Backend Engineer",
+        "required_skills": ["Python", "PostgreSQL", "Docker", "Kubernetes"],
+        "preferred_skills": ["Terraform"],
+        "keywords": ["REST", "CI/CD"],
+        "min_experience_years": 4,
+    }
+    defaults.update(kwargs)
+    return JobDescription(**defaults)
+
+
+def test_prescore_strong_and_weak_candidates():
+    jd = _jd()
+    strong = ParsedCV(
+        skills=["python", "PostgreSQL", "Docker", "Kubernetes", "REST"],
+        tools=["Terraform"],
+        projects=[{"name": "API", "technologies": ["CI/CD"]}],
+        total_experience_years=6,
+    )
+    weak = ParsedCV(skills=["Photoshop"], tools=[], total_experience_years=1)
+
+    strong_score = prescore(jd, strong, WEIGHTS)
+    weak_score = prescore(jd, weak, WEIGHTS)
+
+    assert strong_score["prescore"] == 100.0
+    assert strong_score["missing_skills"] == []
+    assert prescore(jd, ParsedCV(skills=["Python3", "Postgres", "k8s", "Docker"]), WEIGHTS)[
+        "skills_score"
+    ] == 80.0
+    assert weak_score["skills_score"] == 0.0
+    assert weak_score["experience_score"] == 25.0
+    assert weak_score["prescore"] < 20
+
+
+def test_prescore_without_requirements_is_neutral():
+    jd = _jd(required_skills=None, preferred_skills=None, keywords=None, min_experience_years=None)
+    result = prescore(jd, ParsedCV(skills=["Go"]), WEIGHTS)
+    assert result["prescore"] == 100.0
+
+
+def test_select_shortlist():
+    ranked = [
+        {"cv_file_id": "a", "prescore": 90},
+        {"cv_file_id": "b", "prescore": 70},
+        {"cv_file_id": "c", "prescore": 40},
+    ]
+    assert select_shortlist(ranked, top_k=2) == ["a", "b"]
+    assert select_shortlist(ranked, min_score=50) == ["a", "b"]
+    assert select_shortlist(ranked, top_k=1, min_score=50) == ["a"]
@@ -0,0 +1,53 @@
+from backend.utils.rate_limiter import RateLimiter, parse_reset_duration
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_parse_reset_duration():
+    assert parse_reset_duration("7.66s") == 7.66
+    assert abs(parse_reset_duration("2m59.56s") - 179.56) < 1e-9
+    assert parse_reset_duration("120ms") == 0.12
+    assert parse_reset_duration("3") == 3.0
+    assert parse_reset_duration(None) is None
+    assert parse_reset_duration("soon") is None
+
+
+def test_limiter_allows_bursts_until_budget_exhausted():
+    clock = FakeClock()
+    limiter = RateLimiter(requests_per_minute=3, tokens_per_minute=6000, clock=clock)
+    assert limiter.try_acquire(100) == 0
+    assert limiter.try_acquire(100) == 0
+    assert limiter.try_acquire(100) == 0
+    wait = limiter.try_acquire(100)
+    assert 19 < wait <= 20  # one request refills every 20s at 3 RPM
+
+    clock.now += wait
+    assert limiter.try_acquire(100) == 0
+
+
+def test_limiter_tracks_token_budget():
+    clock = FakeClock()
+    limiter = RateLimiter(requests_per_minute=100, tokens_per_minute=600, clock=clock)
+    assert limiter.try_acquire(500) == 0
+    assert limiter.try_acquire(500) > 0
+    limiter.reconcile(estimated_tokens=500, actual_tokens=100)
+    assert limiter.try_acquire(500) == 0
+
+
+def test_limiter_honors_retry_after_and_reset_headers():
+    clock = FakeClock()
+    limiter = RateLimiter(requests_per_minute=100, tokens_per_minute=10000, clock=clock)
+    assert limiter.update_from_headers({"retry-after": "5"}) == 5.0
+    assert limiter.try_acquire(10) == 5.0
+
+    clock.now += 5
+    limiter.update_from_headers(
+        {"x-ratelimit-remaining-tokens": "0", "x-ratelimit-reset-tokens": "1m0s"}
+    )
+    assert limiter.try_acquire(10) == 60.0
@@ -0,0 +1,109 @@
+import json
+import uuid
+
+import pytest
+
+from backend.services import role_matcher
+from backend.services.matcher import build_jd_payload, match_fingerprint
+from backend.services.role_matcher import (
+    RoleMatchPlan,
+    get_best_roles,
+    prepare_role_match,
+    rank_roles,
+)
+from tests.factories import make_folder, make_jd, make_match, make_parsed_cv, make_user
+
+WEIGHTS = {"skills": 0.4, "experience": 0.3, "projects": 0.2, "keywords": 0.1}
+
+
+@pytest.fixture
+def roles(db, monkeypatch):
+    monkeypatch.setattr(role_matcher, "is_llm_available", lambda: True)
+    user = make_user(db)
+    cv = make_parsed_cv(db, make_folder(db, user), skills=["Python", "Django"])
+    jds = [
+        make_jd(db, user, "Python Dev", required_skills=["Python", "Django"]),
+        make_jd(db, user, "Go Dev", required_skills=["Go"]),
+        make_jd(db, user, "Data Engineer", required_skills=["Python", "Spark"]),
+    ]
+    return user, cv, jds
+
+
+def test_prepare_role_match_skips_unchanged_pairs_unless_forced(db, roles):
+    _, cv, (python_jd, go_jd, _) = roles
+    match = make_match(db, cv, python_jd, WEIGHTS)
+    plan = prepare_role_match(db, cv.id, [str(python_jd.id)])
+    match.input_fingerprint = plan.fingerprints[str(python_jd.id)]
+    db.flush()
+
+    missing = str(uuid.uuid4())
+    jd_ids = [str(python_jd.id), str(go_jd.id), missing]
+    plan = prepare_role_match(db, cv.id, jd_ids)
+    assert plan.skipped == [str(python_jd.id)]
+    assert list(plan.errors) == [missing]
+    assert [jd_id for group in plan.groups for jd_id, _ in group] == [str(go_jd.id)]
+    assert plan.fingerprints[str(go_jd.id)] == match_fingerprint(
+        build_jd_payload(go_jd), plan.cv_data
+    )
+
+    forced = prepare_role_match(db, cv.id, jd_ids, force=True)
+    assert forced.skipped == []
+    assert [jd_id for group in forced.groups for jd_id, _ in group] == jd_ids[:2]
+
+
+def test_role_match_plan_prompt_and_rows(roles):
+    _, cv, (python_jd, go_jd, _) = roles
+    plan = RoleMatchPlan(
+        cv_file_id=cv.id,
+        cv_data={"candidate_name": "Jane Roe"},
+        jd_weights={str(python_jd.id): WEIGHTS, str(go_jd.id): {**WEIGHTS, "skills": 1.0}},
+        fingerprints={str(python_jd.id): "f" * 64},
+    )
+    group = [(str(python_jd.id), {"title": "Python Dev"}), (str(go_jd.id), {"title": "Go Dev"})]
+    prompt = json.loads(plan.batch_prompt(group))
+    assert prompt["candidate_cv"] == {"candidate_name": "Jane Roe"}
+    assert prompt["job_descriptions"] == [
+        {"jd_id": str(python_jd.id), "title": "Python Dev"},
+        {"jd_id": str(go_jd.id), "title": "Go Dev"},
+    ]
+
+    scores = {"skills_score": 80, "experience_score": 50, "projects_score": 0, "keywords_score": 0}
+    row = plan.row(str(python_jd.id), scores)
+    assert (row["cv_file_id"], row["jd_id"]) == (cv.id, python_jd.id)
+    assert (row["overall_score"], row["fit_status"], row["input_fingerprint"]) == (
+        47.0, "yellow", "f" * 64
+    )
+    other = plan.row(str(go_jd.id), scores)
+    assert (other["overall_score"], other["input_fingerprint"]) == (95.0, None)
+    assert plan.jd_ids == [python_jd.id, go_jd.id]
+
+
+def test_rank_roles_orders_by_prescore(db, roles):
+    user, cv, (_, go_jd, _) = roles
+    ranked = rank_roles(db, cv.id, user.id)
+    assert [entry["title"] for entry in ranked] == ["Python Dev", "Data Engineer", "Go Dev"]
+    assert ranked[0]["prescore"] >= ranked[1]["prescore"] >= ranked[2]["prescore"]
+
+    go_jd.is_active = False
+    db.flush()
+    assert [entry["title"] for entry in rank_roles(db, cv.id, user.id)] == [
+        "Python Dev", "Data Engineer"
+    ]
+
+
+def test_get_best_roles_orders_by_stored_score_with_limit(db, roles):
+    user, cv, (python_jd, go_jd, data_jd) = roles
+    make_match(db, cv, python_jd, WEIGHTS, skills_score=90)
+    make_match(db, cv, go_jd, WEIGHTS, skills_score=10)
+    make_match(db, cv, data_jd, WEIGHTS, skills_score=60)
+    other_user_jd = make_jd(db, make_user(db), "Not mine")
+    make_match(db, cv, other_user_jd, WEIGHTS, skills_score=100)
+
+    best = get_best_roles(db, cv.id, user.id)
+    assert [(r["rank"], r["title"]) for r in best] == [
+        (1, "Python Dev"), (2, "Data Engineer"), (3, "Go Dev")
+    ]
+    assert best[0]["overall_score"] == 66.0
+    assert [r["title"] for r in get_best_roles(db, cv.id, user.id, limit=2)] == [
+        "Python Dev", "Data Engineer"
+    ]
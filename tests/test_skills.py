@@ -0,0 +1,33 @@
+from backend.utils.skills import canonical_skill, canonical_skills, find_known_skills, fold_skill
+
+
+def test_fold_skill():
+    assert fold_skill("  Python ") == "python"
+    assert fold_skill("C++") == "c++"
+    assert fold_skill("Node.js") == "node.js"
+    assert fold_skill("CI/CD") == "ci cd"
+
+
+def test_canonical_skill_aliases():
+    assert canonical_skill("JS") == canonical_skill("JavaScript") == "javascript"
+    assert canonical_skill("K8s") == "kubernetes"
+    assert canonical_skill("NodeJS") == canonical_skill("Node.js") == "node.js"
+    assert canonical_skill("Postgres") == "postgresql"
+    assert canonical_skill("Rust") == "rust"
+
+
+def test_canonical_skills_keeps_first_spelling():
+    assert canonical_skills(["React.js", "ReactJS", "Go", "", None, "golang"]) == {
+        "react": "React.js",
+        "go": "Go",
+    }
+
+
+def test_find_known_skills_matches_longest_phrase_and_aliases():
+    found = find_known_skills("React Native and ReactJS; CI/CD via GitHub Actions; golang, C++")
+    assert found["skills"] == ["React Native", "React", "CI/CD", "Golang", "C++"]
+    assert found["tools"] == ["GitHub Actions"]
+
+
+def test_find_known_skills_skips_ambiguous_words():
+    assert find_known_skills("Ready to go, will rest and node") == {"skills": [], "tools": []}
@@ -0,0 +1,189 @@
+import asyncio
+import io
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from types import SimpleNamespace
+
+import pytest
+from docx import Document
+from sqlalchemy.orm import sessionmaker
+
+from backend import database, task_manager
+from backend.config import settings
+from backend.models.cv_file import CVFile
+from backend.models.monitored_folder import MonitoredFolder
+from backend.models.parsed_cv import ParsedCV
+from backend.models.user import User
+from backend.services import leaderboard_cache, matcher, parse_pipeline
+from backend.services.archive_ingest import new_archive_spool_dir
+
+
+class _FakeSession:
+    def commit(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class _FakeWriter:
+    def __init__(self, db, plan):
+        self.rows = []
+
+    def add(self, results):
+        self.rows.extend(results)
+
+    def flush(self):
+        pass
+
+
+@pytest.fixture
+def fake_match_plan(monkeypatch):
+    plan = SimpleNamespace(
+        jd_ids=["jd"],
+        errors={"cv-0": "CV not parsed yet: cv-0"},
+        skipped=["cv-1"],
+        groups=[[("cv-2", {}), ("cv-3", {})], [("cv-4", {})]],
+        use_cache=[],
+    )
+
+    def score(plan, group, use_cache=True):
+        plan.use_cache.append(use_cache)
+        results = [item_id for item_id, _ in group if item_id != "cv-3"]
+        return results, {"cv-3": "LLM returned garbage"} if len(group) == 2 else {}
+
+    async def ascore(plan, group, use_cache=True):
+        return score(plan, group, use_cache)
+
+    monkeypatch.setattr(database, "SessionLocal", _FakeSession)
+    monkeypatch.setattr(matcher, "MatchResultWriter", _FakeWriter)
+    monkeypatch.setattr(matcher, "score_match_group", score)
+    monkeypatch.setattr(matcher, "ascore_match_group", ascore)
+    monkeypatch.setattr(leaderboard_cache, "leaderboard_batch", lambda jd_ids: nullcontext())
+    return plan
+
+
+def _check_failures(task_id):
+    progress = task_manager.get_progress(task_id)
+    assert progress["status"] == "completed"
+    assert progress["message"] == "Matched 3/5 CVs (2 recomputed, 1 unchanged, 2 failed)"
+    assert progress["stats"]["failed"] == 2
+    assert {e["id"] for e in progress["stats"]["errors"]} == {"cv-0", "cv-3"}
+
+
+def test_match_plan_reports_failures(fake_match_plan):
+    task_id = "match-sync"
+    task_manager._tasks[task_id] = task_manager.TaskProgress()
+    task_manager._run_match_plan(task_id, 5, "CVs", lambda db: fake_match_plan)
+    _check_failures(task_id)
+
+
+def test_async_match_plan_reports_failures(fake_match_plan):
+    task_id = "match-async"
+    task_manager._tasks[task_id] = task_manager.TaskProgress()
+    asyncio.run(task_manager._run_match_plan_async(task_id, 5, "CVs", lambda db: fake_match_plan))
+    _check_failures(task_id)
+
+
+def test_forced_match_bypasses_the_llm_cache(fake_match_plan, monkeypatch):
+    monkeypatch.setattr(settings, "LLM_ASYNC_BATCHES", False)
+    monkeypatch.setattr(task_manager, "_pool", SimpleNamespace(submit=lambda fn, *a: fn(*a)))
+    monkeypatch.setattr(matcher, "prepare_match_batch", lambda *a, **kw: fake_match_plan)
+    task_manager.submit_match_batch(["cv-2"], str(uuid.uuid4()))
+    assert set(fake_match_plan.use_cache) == {True}
+
+    fake_match_plan.use_cache.clear()
+    task_manager.submit_match_batch(["cv-2"], str(uuid.uuid4()), force=True)
+    assert set(fake_match_plan.use_cache) == {False}
+
+
+def _docx_bytes(*paragraphs: str) -> bytes:
+    doc = Document()
+    for text in paragraphs:
+        doc.add_paragraph(text)
+    buf = io.BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
+
+def test_async_parse_batch_with_stubbed_groq(engine, stub_groq, monkeypatch):
+    session_factory = sessionmaker(bind=engine)
+    monkeypatch.setattr(database, "SessionLocal", session_factory)
+    monkeypatch.setattr(parse_pipeline, "_get_extract_pool", lambda: ThreadPoolExecutor(1))
+    monkeypatch.setattr(settings, "GROQ_API_KEY", "test-key")
+    monkeypatch.setattr(settings, "LLM_CACHE_ENABLED", False)
+    stub_groq.reply = {"candidate_name": "Jane Roe", "summary": "Backend engineer"}
+
+    db = session_factory()
+    user = User(email=f"{uuid.uuid4()}@example.com", hashed_password="x", full_name="Test")
+    db.add(user)
+    db.flush()
+    folder = MonitoredFolder(user_id=user.id, folder_path=f"cloud://{uuid.uuid4()}", label="CVs")
+    db.add(folder)
+    db.flush()
+    cv = CVFile(
+        folder_id=folder.id,
+        file_name="jane.docx",
+        file_path="upload://jane.docx",
+        file_hash=uuid.uuid4().hex * 2,
+        status="new",
+    )
+    db.add(cv)
+    db.commit()
+    cv_id = str(cv.id)
+
+    task_id = "parse-async"
+    task_manager._tasks[task_id] = task_manager.TaskProgress(total=1)
+    contents = {cv_id: _docx_bytes("Jane Roe", "Experience", "Python at Acme")}
+    asyncio.run(task_manager._run_parse_batch_async(task_id, [cv_id], contents))
+
+    progress = task_manager.get_progress(task_id)
+    assert (progress["status"], progress["current"], progress["stats"]["failed"]) == (
+        "completed", 1, 0
+    )
+    assert len(stub_groq.requests) == 1
+    db.expire_all()
+    parsed = db.query(ParsedCV).filter(ParsedCV.cv_file_id == cv.id).one()
+    assert parsed.candidate_name == "Jane Roe"
+    assert db.get(CVFile, cv.id).status == "processed"
+    db.close()
+
+
+def test_crashed_async_task_is_marked_failed():
+    async def crash():
+        raise RuntimeError("loop exploded")
+
+    task_id = "crash"
+    task_manager._tasks[task_id] = task_manager.TaskProgress(total=3)
+    future = task_manager._run_async(task_id, crash())
+    with pytest.raises(RuntimeError):
+        future.result(timeout=5)
+    for _ in range(100):
+        if task_manager.get_progress(task_id)["status"] == "completed":
+            break
+        time.sleep(0.01)
+    progress = task_manager.get_progress(task_id)
+    assert progress["status"] == "completed"
+    assert progress["message"] == "Task failed: loop exploded"
+    assert progress["stats"]["error"] == "loop exploded"
+
+
+def test_archive_spool_is_removed_when_folder_is_gone(engine, monkeypatch):
+    monkeypatch.setattr(database, "SessionLocal", sessionmaker(bind=engine))
+    spool_dir = new_archive_spool_dir()
+    archive_path = os.path.join(spool_dir, "cvs.zip")
+    open(archive_path, "wb").close()
+
+    task_id = str(uuid.uuid4())
+    task_manager._tasks[task_id] = task_manager.TaskProgress()
+    task_manager._run_archive_ingest(
+        task_id, str(uuid.uuid4()), str(uuid.uuid4()), archive_path, auto_process=False
+    )
+
+    assert task_manager.get_progress(task_id)["message"] == (
+        "Archive import failed: Folder not found"
+    )
+    assert not os.path.exists(spool_dir)
@@ -0,0 +1,87 @@
+import asyncio
+import hashlib
+import os
+
+import httpx
+import pytest
+
+from backend.services.upload_stream import UploadTooLarge, spool_multipart
+
+ALLOWED = {".pdf", ".docx"}
+
+
+def _body(files):
+    request = httpx.Request(
+        "POST", "http://test/upload", files=[("files", f) for f in files], data={"note": "x"}
+    )
+    return request.read(), request.headers["content-type"]
+
+
+async def _chunks(body: bytes, size: int = 7):
+    for i in range(0, len(body), size):
+        yield body[i : i + size]
+
+
+def _spool(tmp_path, files, **limits):
+    body, content_type = _body(files)
+    return asyncio.run(
+        spool_multipart(_chunks(body), content_type, len(body), str(tmp_path), ALLOWED, **limits)
+    )
+
+
+def test_parts_are_hashed_and_stored_by_content(tmp_path):
+    content = b"%PDF-1.4 " + bytes(range(256)) * 40
+    spooler = _spool(
+        tmp_path,
+        [("cv.pdf", content), ("../evil.docx", b"docx bytes"), ("notes.txt", b"ignored")],
+    )
+
+    assert spooler.parts == 3
+    pdf, docx = spooler.uploads
+    digest = hashlib.sha256(content).hexdigest()
+    assert (pdf.filename, pdf.file_hash, pdf.size) == ("cv.pdf", digest, len(content))
+    assert pdf.file_path == os.path.join(str(tmp_path), f"{digest}.pdf")
+    assert not os.path.exists(pdf.file_path)
+
+    spooler.store()
+    assert open(pdf.file_path, "rb").read() == content
+    assert docx.filename == "evil.docx"
+    assert sorted(os.listdir(tmp_path)) == sorted(
+        os.path.basename(u.file_path) for u in spooler.uploads
+    )
+
+
+def test_identical_parts_share_one_file(tmp_path):
+    spooler = _spool(tmp_path, [("a.pdf", b"same"), ("b.pdf", b"same")])
+    first, second = spooler.uploads
+    assert first.file_path == second.file_path
+    spooler.store()
+    assert os.listdir(tmp_path) == [os.path.basename(first.file_path)]
+
+
+def test_discard_never_removes_a_stored_file(tmp_path):
+    # Another request stored and registered the same content first
+    other = _spool(tmp_path, [("a.pdf", b"same")])
+    other.store()
+    spooler = _spool(tmp_path, [("b.pdf", b"same"), ("c.pdf", b"new")])
+    spooler.discard()
+    assert os.listdir(tmp_path) == [os.path.basename(other.uploads[0].file_path)]
+    assert open(other.uploads[0].file_path, "rb").read() == b"same"
+
+
+def test_size_limits_reject_and_clean_up(tmp_path):
+    with pytest.raises(UploadTooLarge):
+        _spool(tmp_path, [("a.pdf", b"small"), ("b.pdf", b"x" * 100)], max_file_bytes=50)
+    assert os.listdir(tmp_path) == []
+
+    with pytest.raises(UploadTooLarge):
+        _spool(tmp_path, [("a.pdf", b"small")], max_request_bytes=10)
+
+
+def test_truncated_body_is_rejected(tmp_path):
+    body, content_type = _body([("a.pdf", b"content that gets cut off")])
+    with pytest.raises(ValueError):
+        asyncio.run(
+            spool_multipart(_chunks(body[:-60]), content_type, None, str(tmp_path), ALLOWED)
+        )
+    assert os.listdir(tmp_path) == []